@@ -0,0 +1,28 @@
+"""Add image widths to recipes
+
+Revision ID: 5f1a9c3e7b20
+Revises: 79e4af494c04
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5f1a9c3e7b20"
+down_revision: str | None = "79e4af494c04"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("recipes", sa.Column("image_widths", postgresql.ARRAY(sa.Integer()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("recipes", "image_widths")
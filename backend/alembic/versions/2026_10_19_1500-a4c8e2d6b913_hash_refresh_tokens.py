@@ -0,0 +1,39 @@
+"""Store refresh tokens by their SHA-256 digest
+
+Revision ID: a4c8e2d6b913
+Revises: 5f1a9c3e7b20
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c8e2d6b913"
+down_revision: str | None = "5f1a9c3e7b20"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("refresh_tokens", sa.Column("token_hash", sa.LargeBinary(length=32), nullable=True))
+    # issued tokens stay valid, they are looked up by the digest of the token sent by the client
+    op.execute("UPDATE refresh_tokens SET token_hash = sha256(convert_to(token, 'UTF8'))")
+    op.alter_column("refresh_tokens", "token_hash", nullable=False)
+    op.create_index(op.f("ix_refresh_tokens_token_hash"), "refresh_tokens", ["token_hash"], unique=True)
+    op.drop_index(op.f("ix_refresh_tokens_token"), table_name="refresh_tokens")
+    op.drop_column("refresh_tokens", "token")
+
+
+def downgrade() -> None:
+    op.add_column("refresh_tokens", sa.Column("token", sa.String(length=255), nullable=True))
+    # tokens can not be restored from their digests, so all sessions end and users have to log in again
+    op.execute("UPDATE refresh_tokens SET token = encode(token_hash, 'hex'), is_active = false")
+    op.alter_column("refresh_tokens", "token", nullable=False)
+    op.create_index(op.f("ix_refresh_tokens_token"), "refresh_tokens", ["token"], unique=True)
+    op.drop_index(op.f("ix_refresh_tokens_token_hash"), table_name="refresh_tokens")
+    op.drop_column("refresh_tokens", "token_hash")
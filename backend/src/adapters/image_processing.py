@@ -0,0 +1,43 @@
+import logging
+
+from faststream.nats import JStream, NatsBroker
+
+from src.adapters.interfaces.image_processing import ImageProcessingAdapterProtocol
+from src.schemas.image_processing import RecipeImageProcessingMessage
+
+logger = logging.getLogger(__name__)
+
+RECIPE_IMAGES_SUBJECT = "image_processing.recipes"
+
+image_processing_stream = JStream(
+    name="image_processing_stream",
+    subjects=["image_processing.*"],
+)
+
+
+class ImageProcessingAdapter(ImageProcessingAdapterProtocol):
+    """Adapter for image processing queue interaction via NATS."""
+
+    def __init__(self, broker: NatsBroker) -> None:
+        self.broker = broker
+
+    async def publish_recipe_image(self, message: RecipeImageProcessingMessage) -> None:
+        """Put uploaded recipe image into the processing queue.
+
+        Args:
+            message: Recipe and path of its uploaded image
+
+        Raises:
+            Exception: When message publishing fails
+
+        """
+        try:
+            await self.broker.publish(
+                message=message.model_dump(mode="json"),
+                subject=RECIPE_IMAGES_SUBJECT,
+                stream=image_processing_stream.name,
+            )
+        except Exception:
+            msg = f"Error publishing image processing task for recipe {message.recipe_id}"
+            logger.exception(msg)
+            raise
@@ -1,4 +1,11 @@
+from .image_processing import ImageProcessingAdapterProtocol
 from .recommendations import RecommendationsAdapterProtocol
 from .redis import RedisAdapterProtocol
+from .search_indexing import SearchIndexingAdapterProtocol
 
-__all__ = ["RecommendationsAdapterProtocol", "RedisAdapterProtocol"]
+__all__ = [
+    "ImageProcessingAdapterProtocol",
+    "RecommendationsAdapterProtocol",
+    "RedisAdapterProtocol",
+    "SearchIndexingAdapterProtocol",
+]
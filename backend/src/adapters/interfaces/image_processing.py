@@ -0,0 +1,11 @@
+from typing import Protocol
+
+from src.schemas.image_processing import RecipeImageProcessingMessage
+
+
+class ImageProcessingAdapterProtocol(Protocol):
+    """Protocol for image processing queue adapter via NATS communication."""
+
+    async def publish_recipe_image(self, message: RecipeImageProcessingMessage) -> None:
+        """Put uploaded recipe image into the processing queue."""
+        ...
@@ -0,0 +1,11 @@
+from typing import Protocol
+
+from src.schemas.search_indexing import RecipeIndexingMessage
+
+
+class SearchIndexingAdapterProtocol(Protocol):
+    """Protocol for search indexing queue adapter via NATS communication."""
+
+    async def publish_recipe_operation(self, message: RecipeIndexingMessage) -> None:
+        """Put recipe index write into the indexing queue."""
+        ...
@@ -1,10 +1,30 @@
+import logging
 from datetime import UTC, datetime
 from fnmatch import fnmatch
 from typing import Any, ClassVar
 
-from elasticsearch.dsl import AsyncDocument, Date, Keyword, M, Text, async_connections, mapped_field
-
-from src.adapters.search.recipes_search import russian_index_analyzer, russian_search_analyzer
+from elasticsearch.dsl import (
+    AsyncDocument,
+    Completion,
+    Date,
+    Integer,
+    Keyword,
+    M,
+    SearchAsYouType,
+    Text,
+    async_connections,
+    mapped_field,
+)
+
+from src.adapters.search.recipes_search import (
+    lowercase_normalizer,
+    russian_index_analyzer,
+    russian_ingredient_analyzer,
+    russian_search_analyzer,
+    russian_suggest_analyzer,
+)
+
+logger = logging.getLogger(__name__)
 
 RECIPE_ALIAS = "recipes"
 PATTERN = RECIPE_ALIAS + "-*"
@@ -12,18 +32,44 @@ PRIORITY = 100
 
 
 class RecipeIndex(AsyncDocument):
-    title: M[str] = mapped_field(Text(analyzer=russian_index_analyzer, search_analyzer=russian_search_analyzer))
+    id: M[int]
+    slug: M[str] = mapped_field(Keyword())
+    # title.suggest is used for autocomplete
+    title: M[str] = mapped_field(
+        Text(
+            analyzer=russian_index_analyzer,
+            search_analyzer=russian_search_analyzer,
+            fields={"suggest": SearchAsYouType(analyzer=russian_suggest_analyzer)},
+        )
+    )
     short_description: M[str] = mapped_field(
         Text(analyzer=russian_index_analyzer, search_analyzer=russian_search_analyzer)
     )
     difficulty: M[str] = mapped_field(Keyword())
     cook_time_minutes: M[int]
     is_published: M[bool]
+    # ingredients.canonical and tags.exact are used in filters, tags.raw keeps the original tag for facet counts
     ingredients: M[list[str]] = mapped_field(
-        Text(analyzer=russian_index_analyzer, search_analyzer=russian_search_analyzer)
+        Text(
+            analyzer=russian_index_analyzer,
+            search_analyzer=russian_search_analyzer,
+            fields={"canonical": Text(analyzer=russian_ingredient_analyzer)},
+        )
     )
-    tags: M[list[str]] = mapped_field(Text(analyzer=russian_index_analyzer, search_analyzer=russian_search_analyzer))
+    tags: M[list[str]] = mapped_field(
+        Text(
+            analyzer=russian_index_analyzer,
+            search_analyzer=russian_search_analyzer,
+            fields={"raw": Keyword(), "exact": Keyword(normalizer=lowercase_normalizer)},
+        )
+    )
+    # tags of published recipes only, completion suggester ignores query filters
+    tags_suggest: M[list[str]] = mapped_field(Completion(analyzer=russian_suggest_analyzer))
     created_at: M[datetime] = mapped_field(Date())
+    # fields below are only read back from _source to build search results without hitting Postgres
+    image_path: M[str | None] = mapped_field(Keyword(index=False, doc_values=False))
+    image_widths: M[list[int] | None] = mapped_field(Integer(index=False, doc_values=False))
+    impressions_count: M[int]
 
     @classmethod
     def _matches(cls, hit: dict[str, Any]) -> bool:
@@ -51,6 +97,83 @@ async def search_indexes_setup() -> None:
 
     if not await RecipeIndex._index.exists():  # noqa: SLF001
         await migrate(move_data=False)
+        return
+
+    missing_fields = await get_missing_mapping_fields()
+    if missing_fields:
+        logger.warning(
+            "Index %s has no fields %s, rebuild it with `python -m src.reindex`",
+            RECIPE_ALIAS,
+            ", ".join(missing_fields),
+        )
+
+
+def _mapping_field_names(properties: dict[str, Any], prefix: str = "") -> set[str]:
+    names = set()
+    for name, field in properties.items():
+        names.add(prefix + name)
+        names |= _mapping_field_names(field.get("fields", {}), f"{prefix}{name}.")
+        names |= _mapping_field_names(field.get("properties", {}), f"{prefix}{name}.")
+    return names
+
+
+async def get_missing_mapping_fields() -> list[str]:
+    """Return fields and sub-fields of RecipeIndex which the index behind RECIPE_ALIAS was created without."""
+    es = async_connections.get_connection()
+    mappings = await es.indices.get_mapping(index=RECIPE_ALIAS)
+    expected = _mapping_field_names(RecipeIndex._doc_type.mapping.to_dict().get("properties", {}))  # noqa: SLF001
+
+    missing: set[str] = set()
+    for index in mappings.values():
+        missing |= expected - _mapping_field_names(index["mappings"].get("properties", {}))
+    return sorted(missing)
+
+
+# Settings for the time of a full rebuild, replicas and refreshes only slow down the initial bulk load
+BULK_LOAD_SETTINGS = {"refresh_interval": "-1", "number_of_replicas": 0}
+
+
+async def create_next_index(*, bulk_load: bool = False) -> str:
+    """
+    Create a new timestamped index matching the RecipeIndex template.
+
+    With ``bulk_load=True`` the index is created with refreshes disabled and without replicas,
+    call ``finish_bulk_load`` once the data is loaded.
+    """
+    next_index = PATTERN.replace("*", datetime.now(tz=UTC).strftime("%Y%m%d%H%M%S%f"))
+
+    es = async_connections.get_connection()
+    await es.indices.create(index=next_index, settings=BULK_LOAD_SETTINGS if bulk_load else None)
+    return next_index
+
+
+async def finish_bulk_load(index: str) -> None:
+    """Restore the settings changed by ``create_next_index(bulk_load=True)`` and make the data searchable."""
+    es = async_connections.get_connection()
+    await es.indices.put_settings(
+        index=index,
+        settings={
+            "refresh_interval": None,
+            "number_of_replicas": RecipeIndex.Index.settings["number_of_replicas"],
+        },
+    )
+    await es.indices.refresh(index=index)
+
+
+async def switch_alias(index: str, *, delete_old: bool = False) -> None:
+    """Atomically point RECIPE_ALIAS to the given index, optionally removing previous indexes."""
+    es = async_connections.get_connection()
+    old_indexes = [name for name in await es.indices.get_alias(index=PATTERN) if name != index] if delete_old else []
+
+    await es.indices.update_aliases(
+        actions=[
+            {"remove": {"alias": RECIPE_ALIAS, "index": PATTERN}},
+            {"add": {"alias": RECIPE_ALIAS, "index": index}},
+        ]
+    )
+
+    if old_indexes:
+        await es.indices.delete(index=",".join(old_indexes))
 
 
 async def migrate(*, move_data: bool = True, update_alias: bool = True) -> None:
@@ -66,12 +189,10 @@ async def migrate(*, move_data: bool = True, update_alias: bool = True) -> None:
     any and all searches without any loss of functionality. It should, however,
     not perform any writes at this time as those might be lost.
     """
-    next_index = PATTERN.replace("*", datetime.now(tz=UTC).strftime("%Y%m%d%H%M%S%f"))
+    next_index = await create_next_index()
 
     es = async_connections.get_connection()
 
-    await es.indices.create(index=next_index)
-
     if move_data:
         await es.options(request_timeout=3600).reindex(
             body={"source": {"index": RECIPE_ALIAS}, "dest": {"index": next_index}}
@@ -79,11 +200,4 @@ async def migrate(*, move_data: bool = True, update_alias: bool = True) -> None:
         await es.indices.refresh(index=next_index)
 
     if update_alias:
-        await es.indices.update_aliases(
-            body={
-                "actions": [
-                    {"remove": {"alias": RECIPE_ALIAS, "index": PATTERN}},
-                    {"add": {"alias": RECIPE_ALIAS, "index": next_index}},
-                ]
-            }
-        )
+        await switch_alias(next_index)
@@ -0,0 +1,44 @@
+import logging
+
+from faststream.nats import JStream, NatsBroker
+
+from src.adapters.interfaces.search_indexing import SearchIndexingAdapterProtocol
+from src.schemas.search_indexing import RecipeIndexingMessage
+
+logger = logging.getLogger(__name__)
+
+RECIPES_INDEXING_SUBJECT = "search_indexing.recipes"
+RECIPES_DEAD_LETTER_SUBJECT = "search_indexing.recipes_dead_letter"
+
+search_indexing_stream = JStream(
+    name="search_indexing_stream",
+    subjects=["search_indexing.*"],
+)
+
+
+class SearchIndexingAdapter(SearchIndexingAdapterProtocol):
+    """Adapter for search indexing queue interaction via NATS."""
+
+    def __init__(self, broker: NatsBroker) -> None:
+        self.broker = broker
+
+    async def publish_recipe_operation(self, message: RecipeIndexingMessage) -> None:
+        """Put recipe index write into the indexing queue.
+
+        Args:
+            message: Index or delete operation for a single recipe
+
+        Raises:
+            Exception: When message publishing fails
+
+        """
+        try:
+            await self.broker.publish(
+                message=message.model_dump(mode="json"),
+                subject=RECIPES_INDEXING_SUBJECT,
+                stream=search_indexing_stream.name,
+            )
+        except Exception:
+            msg = f"Error publishing {message.action} indexing task for recipe {message.recipe_id}"
+            logger.exception(msg)
+            raise
@@ -1,4 +1,4 @@
-from elasticsearch.dsl import analyzer, token_filter
+from elasticsearch.dsl import analyzer, normalizer, token_filter
 
 russian_stop = token_filter("russian_stop", type="stop", stopwords="_russian_", ignore_case=True)
 russian_stemmer = token_filter("russian_stemmer", type="snowball", language="Russian", ignore_case=True)
@@ -32,3 +32,33 @@ russian_search_analyzer = analyzer(
         synonym_filter,
     ],
 )
+
+# no stemming and synonyms, so a partially typed word is a prefix of the indexed one
+russian_suggest_analyzer = analyzer(
+    "russian_suggest",
+    type="custom",
+    tokenizer="standard",
+    filter=[lowercase_filter],
+)
+
+# whole ingredient name is a single token, synonym rules are stemmed by the filters preceding the synonym filter
+ingredient_synonym_filter = token_filter(
+    "ingredient_synonym_filter",
+    type="synonym",
+    synonyms_path="analysis/recipe_synonyms.txt",
+    ignore_case=True,
+)
+
+russian_ingredient_analyzer = analyzer(
+    "russian_ingredient",
+    type="custom",
+    tokenizer="keyword",
+    filter=[
+        lowercase_filter,
+        russian_stemmer,
+        ingredient_synonym_filter,
+    ],
+)
+
+# keyword sub-fields for exact filters, term queries are normalized the same way
+lowercase_normalizer = normalizer("lowercase_normalizer", type="custom", filter=["lowercase"])
@@ -1,24 +1,46 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING, Any
 
+from aiobotocore.config import AioConfig
 from aiobotocore.session import get_session
 
 from src.core.config import settings
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator
+    from collections.abc import AsyncIterator, Sequence
 
     from types_aiobotocore_s3 import S3Client
 
 
+# objects are never overwritten under the same key, so clients may cache them for as long as they like
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
 class S3StorageClientManager:
-    def __init__(self, endpoint_url: str, access_key: str, secret_key: str) -> None:
+    def __init__(
+        self,
+        endpoint_url: str,
+        access_key: str,
+        secret_key: str,
+        *,
+        max_pool_connections: int = 50,
+        keepalive_timeout: float = 30.0,
+        signature_version: str | None = None,
+    ) -> None:
         self.session = get_session()
         self.endpoint_url = endpoint_url
         self.access_key = access_key
         self.secret_key = secret_key
+        self.config = AioConfig(
+            max_pool_connections=max_pool_connections,
+            connector_args={"keepalive_timeout": keepalive_timeout},
+            signature_version=signature_version,
+        )
 
     @asynccontextmanager
     async def get_client(self) -> AsyncIterator[S3Client]:
@@ -28,14 +50,71 @@ class S3StorageClientManager:
             aws_access_key_id=self.access_key,
             aws_secret_access_key=self.secret_key,
             use_ssl=False,
+            config=self.config,
         ) as client:
             yield client
 
 
+class PresignedUrlCache:
+    """
+    In-process cache of presigned download URLs keyed by bucket, object key and lifetime.
+
+    A URL is reused until the moment given when it is stored. The least recently used URLs are evicted when the cache
+    grows over `max_size`.
+    """
+
+    def __init__(self, max_size: int = 10000, margin_seconds: int = 300) -> None:
+        self.max_size = max_size
+        self.margin_seconds = margin_seconds
+        self._urls: OrderedDict[tuple[str, str, int], tuple[str, float]] = OrderedDict()
+
+    def get(self, bucket_name: str, file_name: str, expires_in: int) -> str | None:
+        key = (bucket_name, file_name, expires_in)
+        cached = self._urls.get(key)
+        if cached is None:
+            return None
+        url, reuse_until = cached
+        if time.monotonic() >= reuse_until:
+            del self._urls[key]
+            return None
+        self._urls.move_to_end(key)
+        return url
+
+    def set(self, bucket_name: str, file_name: str, expires_in: int, url: str, reuse_until: float) -> None:
+        self._urls[bucket_name, file_name, expires_in] = (url, reuse_until)
+        self._urls.move_to_end((bucket_name, file_name, expires_in))
+        while len(self._urls) > self.max_size:
+            self._urls.popitem(last=False)
+
+    def invalidate(self, bucket_name: str, file_name: str) -> None:
+        for key in [key for key in self._urls if key[:2] == (bucket_name, file_name)]:
+            del self._urls[key]
+
+
 class S3Storage:
-    def __init__(self, client: S3Client, endpoint_url: str) -> None:
+    """
+    Access to S3 objects through presigned URLs.
+
+    With `stable_url_seconds` set, download URLs expire at the end of a window of that length plus their lifetime
+    instead of their lifetime after signing. The query string signature depends only on the expiry, so every request
+    within the window gets the same URL for an object, which lets browsers and nginx cache images by URL. Such URLs
+    are signed with `url_signing_client`, a client using the signature version without a signing time, all other
+    requests go through `client`.
+    """
+
+    def __init__(
+        self,
+        client: S3Client,
+        endpoint_url: str,
+        url_cache: PresignedUrlCache | None = None,
+        stable_url_seconds: int = 0,
+        url_signing_client: S3Client | None = None,
+    ) -> None:
         self.client = client
         self.endpoint_url = endpoint_url
+        self.url_cache = url_cache or PresignedUrlCache()
+        self.stable_url_seconds = stable_url_seconds
+        self.url_signing_client = url_signing_client or client
 
     async def upload_file(
         self,
@@ -43,22 +122,64 @@ class S3Storage:
         file_name: str,
         content_type: str,
         content: Any,
+        cache_control: str | None = None,
     ) -> None:
-        await self.client.put_object(Bucket=bucket_name, Key=file_name, Body=content, ContentType=content_type)
+        extra = {"CacheControl": cache_control} if cache_control else {}
+        await self.client.put_object(Bucket=bucket_name, Key=file_name, Body=content, ContentType=content_type, **extra)
+        self.url_cache.invalidate(bucket_name, file_name)
+
+    async def download_file(self, bucket_name: str, file_name: str) -> bytes | None:
+        """Content of the file or `None` if it does not exist."""
+        try:
+            response = await self.client.get_object(Bucket=bucket_name, Key=file_name)
+        except self.client.exceptions.NoSuchKey:
+            return None
+        async with response["Body"] as stream:
+            return await stream.read()
 
     async def delete_file(self, bucket_name: str, file_name: str) -> None:
         await self.client.delete_object(Bucket=bucket_name, Key=file_name)
+        self.url_cache.invalidate(bucket_name, file_name)
 
     def _get_valid_url(self, url: str) -> str:
         return url.replace(self.endpoint_url, settings.server.url + "/static")
 
     async def get_file_url(self, bucket_name: str, file_name: str, expires_in: int = 3600) -> str:
-        unprepared_url = await self.client.generate_presigned_url(
+        url = self.url_cache.get(bucket_name, file_name, expires_in)
+        if url is not None:
+            return url
+
+        signed_at = time.monotonic()
+        now = int(time.time())
+        if self.stable_url_seconds:
+            window_end = (now // self.stable_url_seconds + 1) * self.stable_url_seconds
+            url_expires_in = window_end + expires_in - now
+            # other processes sign the same URL until the window ends
+            reuse_until = signed_at + window_end - now
+        else:
+            url_expires_in = expires_in
+            # a reused URL stays valid for at least the margin
+            reuse_until = signed_at + expires_in - self.url_cache.margin_seconds
+
+        unprepared_url = await self.url_signing_client.generate_presigned_url(
             "get_object",
             Params={"Bucket": bucket_name, "Key": file_name},
-            ExpiresIn=expires_in,
+            ExpiresIn=url_expires_in,
+        )
+        url = self._get_valid_url(unprepared_url)
+        if reuse_until > signed_at:
+            self.url_cache.set(bucket_name, file_name, expires_in, url, reuse_until)
+        return url
+
+    async def get_file_urls(self, bucket_name: str, file_names: Sequence[str], expires_in: int = 3600) -> list[str]:
+        """
+        Presigned download URLs of several files in the same order.
+
+        Files missing from the URL cache are signed concurrently.
+        """
+        return list(
+            await asyncio.gather(*(self.get_file_url(bucket_name, file_name, expires_in) for file_name in file_names))
         )
-        return self._get_valid_url(unprepared_url)
 
     async def generate_presigned_post(
         self,
@@ -67,7 +188,14 @@ class S3Storage:
         fields: dict[str, Any] | None = None,
         conditions: list[Any] | None = None,
         expires_in: int = 3600,
+        cache_control: str | None = None,
     ) -> dict:
+        if cache_control:
+            # the uploader has to send the header as a form field, it is stored with the object
+            fields = {**(fields or {}), "Cache-Control": cache_control}
+            conditions = [*(conditions or []), {"Cache-Control": cache_control}]
+        # the object is about to be replaced, so its cached download URL should not be reused
+        self.url_cache.invalidate(bucket_name, key)
         presigned_post = await self.client.generate_presigned_post(
             Bucket=bucket_name,
             Key=key,
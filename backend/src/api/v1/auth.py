@@ -1,8 +1,9 @@
 from typing import Annotated
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter, Body, status
+from fastapi import APIRouter, Body, Depends, status
 
+from src.core.rate_limit import rate_limit
 from src.core.security import AnonymousUserOrNoneDependency
 from src.db.uow import SQLAlchemyUnitOfWork
 from src.exceptions import (
@@ -25,6 +26,7 @@ router = APIRouter(route_class=DishkaRoute, prefix="/auth", tags=["Auth"])
 
 @router.post(
     "/register",
+    dependencies=[Depends(rate_limit("register"))],
     summary="Register a new user",
     description="Register a new user with a username, email, and password",
     status_code=status.HTTP_201_CREATED,
@@ -58,14 +60,16 @@ router = APIRouter(route_class=DishkaRoute, prefix="/auth", tags=["Auth"])
 async def register(
     user_in: UserCreate,
     user_service: FromDishka[UserService],
+    security_service: FromDishka[SecurityService],
     uow: FromDishka[SQLAlchemyUnitOfWork],
 ) -> UserRead:
+    hashed_password = await security_service.get_password_hash(user_in.password)
     async with uow:
         try:
             user = await user_service.create(
                 username=user_in.username,
                 email=user_in.email,
-                hashed_password=SecurityService.get_password_hash(user_in.password),
+                hashed_password=hashed_password,
             )
             await uow.commit()
         except (UserNicknameAlreadyExistsError, UserEmailAlreadyExistsError) as e:
@@ -86,6 +90,7 @@ async def register(
 
 @router.post(
     "/login",
+    dependencies=[Depends(rate_limit("login"))],
     summary="Login a user",
     description="Login a user with an email or username and password",
     responses={
@@ -150,6 +155,7 @@ async def login(
 
 @router.post(
     "/refresh",
+    dependencies=[Depends(rate_limit("refresh"))],
     summary="Refresh a user's access token",
     description="Refresh a user's access token with a refresh token",
     responses={
@@ -1,7 +1,8 @@
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter, Request, Response, status
+from fastapi import APIRouter, Depends, Request, Response, status
 
 from src.core.config import Settings
+from src.core.rate_limit import rate_limit
 from src.core.security import AnonymousUserOrNoneDependency
 from src.db.uow import SQLAlchemyUnitOfWork
 from src.exceptions import AppHTTPException
@@ -63,6 +64,7 @@ def _set_cookie(settings: Settings, response: Response, key: str, value: str) ->
 
 @router.post(
     "",
+    dependencies=[Depends(rate_limit("consent"))],
     summary="Create consent",
     description="Creates a new consent for anonymous user",
     status_code=status.HTTP_201_CREATED,
@@ -100,6 +102,7 @@ async def create_consent(
 @router.delete("/revoke", summary="Revoke consent for anonymous user", status_code=status.HTTP_204_NO_CONTENT)
 async def revoke_consent(
     anonymous_user: AnonymousUserOrNoneDependency,
+    anonymous_user_service: FromDishka[AnonymousUserService],
     consent_service: FromDishka[ConsentService],
     uow: FromDishka[SQLAlchemyUnitOfWork],
     response: Response,
@@ -114,5 +117,6 @@ async def revoke_consent(
     async with uow:
         await consent_service.delete_by_anonymous_user_id(anonymous_user.id)
         await uow.commit()
+        await anonymous_user_service.forget_cookie(anonymous_user.cookie_id)
         response.delete_cookie(key="anonymous_id")
     _set_cookie(settings, response, "analytics_allowed", "False")
@@ -1,4 +1,4 @@
-from typing import Annotated
+from typing import Annotated, Any
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
 from fastapi import APIRouter, Query, Response, status
@@ -7,26 +7,77 @@ from src.core.security import (
     AnonymousUserOrNoneDependency,
     CurrentUserOrNoneDependency,
 )
-from src.db.uow import SQLAlchemyUnitOfWork
 from src.exceptions import AppHTTPException
-from src.exceptions.recipe_search import UserIdentityNotProvidedError
-from src.schemas.recipe import RecipeReadShort, RecipeSearchQuery
-from src.schemas.search_query import SearchQueryCreate, SearchQueryRead
+from src.exceptions.recipe_search import (
+    InvalidSearchCursorError,
+    SearchCursorExpiredError,
+    UserIdentityNotProvidedError,
+)
+from src.schemas.recipe import FoundRecipes, RecipeFacetedSearchRead, RecipeReadShort, RecipeSearchQuery
+from src.schemas.search_query import PopularSearchQuery, SearchQueryCreate, SearchQueryRead, SearchSuggestions
 from src.services.search import SearchService
 from src.utils.examples_factory import json_example_factory
 
 router = APIRouter(route_class=DishkaRoute, prefix="/recipes/search", tags=["Recipe Search"])
 
 
+SEARCH_RESPONSES: dict[int | str, dict[str, Any]] = {
+    status.HTTP_200_OK: {
+        "headers": {
+            "X-Total-Count": {
+                "description": "Total number of found recipes, not returned for the following pages of cursor "
+                "pagination",
+                "type": "integer",
+            },
+            "X-Next-Cursor": {
+                "description": "Cursor of the next page in cursor mode, absent on the last page",
+                "type": "string",
+            },
+        }
+    },
+    status.HTTP_400_BAD_REQUEST: {
+        "description": "Bad request - search cursor is malformed or expired",
+        "content": json_example_factory(
+            {
+                "detail": "Search cursor has expired, start the search again",
+                "error_key": "search_cursor_expired",
+            }
+        ),
+    },
+}
+
+
+async def _search(
+    search_service: SearchService,
+    response: Response,
+    params: RecipeSearchQuery,
+    user_id: int | None,
+    anonymous_user_id: int | None,
+    *,
+    with_facets: bool = False,
+) -> FoundRecipes:
+    try:
+        found = await search_service.search(
+            params=params,
+            user_id=user_id,
+            anonymous_user_id=anonymous_user_id,
+            with_facets=with_facets,
+        )
+    except (InvalidSearchCursorError, SearchCursorExpiredError) as e:
+        raise AppHTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e), error_key=e.error_key) from None
+
+    if found.total is not None:
+        response.headers["X-Total-Count"] = str(found.total)
+    if found.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = found.next_cursor
+    return found
+
+
 @router.get(
     "",
     summary="Search recipes",
     description="Search recipes by different criteria using Elasticsearch",
-    responses={
-        status.HTTP_200_OK: {
-            "headers": {"X-Total-Count": {"description": "Total number of found recipes", "type": "integer"}}
-        }
-    },
+    responses=SEARCH_RESPONSES,
 )
 async def search_recipes(
     query: Annotated[RecipeSearchQuery, Query()],
@@ -34,19 +85,57 @@ async def search_recipes(
     response: Response,
     current_user: CurrentUserOrNoneDependency,
     anonymous_user: AnonymousUserOrNoneDependency,
-    uow: FromDishka[SQLAlchemyUnitOfWork],
 ) -> list[RecipeReadShort]:
     user_id = current_user.id if current_user else None
     anonymous_user_id = anonymous_user.id if anonymous_user else None
-    async with uow:
-        total, recipes = await search_service.search(
-            params=query,
-            user_id=user_id,
-            anonymous_user_id=anonymous_user_id,
-        )
-        response.headers["X-Total-Count"] = str(total)
-        await uow.commit()
-    return recipes
+    found = await _search(search_service, response, query, user_id, anonymous_user_id)
+    return found.recipes
+
+
+@router.get(
+    "/faceted",
+    summary="Search recipes with filter counts",
+    description="Search recipes like the search endpoint and return counts of found recipes by tags, difficulty "
+    "and cook time ranges computed in the same Elasticsearch request",
+    responses=SEARCH_RESPONSES,
+)
+async def search_recipes_with_facets(
+    query: Annotated[RecipeSearchQuery, Query()],
+    search_service: FromDishka[SearchService],
+    response: Response,
+    current_user: CurrentUserOrNoneDependency,
+    anonymous_user: AnonymousUserOrNoneDependency,
+) -> RecipeFacetedSearchRead:
+    user_id = current_user.id if current_user else None
+    anonymous_user_id = anonymous_user.id if anonymous_user else None
+    found = await _search(search_service, response, query, user_id, anonymous_user_id, with_facets=True)
+    return RecipeFacetedSearchRead(recipes=found.recipes, facets=found.facets)
+
+
+@router.get(
+    "/suggestions",
+    summary="Autocomplete search query",
+    description="Returns recipes with matching titles, tags and popular search queries for a partially typed query. "
+    "Suggestions are not saved to the search history.",
+)
+async def get_search_suggestions(
+    search_service: FromDishka[SearchService],
+    query: Annotated[str, Query(min_length=1, max_length=100, description="Partially typed search query")],
+    limit: Annotated[int, Query(ge=1, le=10, description="Maximum number of suggestions of each kind")] = 5,
+) -> SearchSuggestions:
+    return await search_service.suggest(prefix=query.strip(), limit=limit)
+
+
+@router.get(
+    "/popular",
+    summary="Get popular search queries",
+    description="Returns the most frequent search queries of the recent hours, most popular first.",
+)
+async def get_popular_search_queries(
+    search_service: FromDishka[SearchService],
+    limit: Annotated[int, Query(ge=1, le=50, description="Maximum number of queries")] = 10,
+) -> list[PopularSearchQuery]:
+    return await search_service.get_popular_queries(limit=limit)
 
 
 @router.get(
@@ -104,19 +193,15 @@ async def save_search_query(
     search_service: FromDishka[SearchService],
     current_user: CurrentUserOrNoneDependency,
     anonymous_user: AnonymousUserOrNoneDependency,
-    uow: FromDishka[SQLAlchemyUnitOfWork],
 ) -> SearchQueryRead:
     user_id = current_user.id if current_user else None
     anonymous_user_id = anonymous_user.id if anonymous_user else None
 
     try:
-        async with uow:
-            search_query = await search_service.save_search_query(
-                query_text=query_data.query,
-                user_id=user_id,
-                anonymous_user_id=anonymous_user_id,
-            )
-            await uow.commit()
-            return search_query
+        return await search_service.save_search_query(
+            query_text=query_data.query,
+            user_id=user_id,
+            anonymous_user_id=anonymous_user_id,
+        )
     except UserIdentityNotProvidedError as e:
         raise AppHTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e), error_key=e.error_key) from None
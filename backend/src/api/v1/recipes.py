@@ -1,9 +1,10 @@
 from typing import Annotated
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter, Body, Path, Query, Response, status
+from fastapi import APIRouter, Body, Depends, Path, Query, Response, status
 from pydantic import PositiveInt
 
+from src.core.rate_limit import rate_limit
 from src.core.security import (
     AnonymousUserOrNoneDependency,
     CurrentUserDependency,
@@ -14,6 +15,7 @@ from src.enums.recipe_get_source import RecipeGetSourceEnum
 from src.exceptions import (
     AppHTTPException,
     AttachInstructionStepError,
+    InvalidRecipeImagePathError,
     NoRecipeImageError,
     NoRecipeInstructionsError,
     RecipeNotFoundError,
@@ -40,6 +42,7 @@ router = APIRouter(route_class=DishkaRoute, prefix="/recipes", tags=["Recipes"])
 
 @router.get(
     "/{recipe_id}",
+    dependencies=[Depends(rate_limit("recipe_view"))],
     summary="Get recipe by ID",
     description="Returns detailed information about a recipe, including ingredients, instructions, and tags.",
     responses={
@@ -87,6 +90,7 @@ async def get_recipe(
 
 @router.get(
     "/by-slug/{slug}",
+    dependencies=[Depends(rate_limit("recipe_view"))],
     summary="Get recipe by slug",
     description="Returns detailed information about a recipe using its URL-friendly slug identifier.",
     responses={
@@ -155,10 +159,20 @@ async def get_recipes(
 
 @router.post(
     "",
+    dependencies=[Depends(rate_limit("recipe_write"))],
     status_code=status.HTTP_201_CREATED,
     summary="Create new recipe",
     description="Creates a new recipe with ingredients, instructions, and tags. Authentication required.",
     responses={
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "Image path is not issued for the recipe",
+            "content": json_example_factory(
+                {
+                    "detail": "Image path 'avatars/1.png' is not an image of recipe 1",
+                    "error_key": "invalid_image_path",
+                }
+            ),
+        },
         status.HTTP_401_UNAUTHORIZED: {
             "description": "Unauthorized",
             "content": json_example_factory({"detail": "Not authenticated", "error_key": "not_authenticated"}),
@@ -172,19 +186,27 @@ async def create_recipe(
     uow: FromDishka[SQLAlchemyUnitOfWork],
 ) -> RecipeRead:
     async with uow:
-        result = await recipe_service.create(user=current_user, recipe_create=recipe_data)
-        await uow.commit()
-        return result
+        try:
+            result = await recipe_service.create(user=current_user, recipe_create=recipe_data)
+            await uow.commit()
+        except InvalidRecipeImagePathError as e:
+            raise AppHTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e), error_key=e.error_key
+            ) from None
+        else:
+            await recipe_service.after_commit()
+            return result
 
 
 @router.patch(
     "/{recipe_id}",
+    dependencies=[Depends(rate_limit("recipe_write"))],
     summary="Update recipe",
     description="Updates an existing recipe. Can update main data and related entities. Authentication required. "
     "Only the owner of the recipe or a superuser can update it.",
     responses={
         status.HTTP_400_BAD_REQUEST: {
-            "description": "Can't publish recipe without instructions or image",
+            "description": "Can't publish recipe without instructions or image, or image path is invalid",
             "content": json_examples_factory(
                 {
                     "No instructions": {
@@ -199,6 +221,12 @@ async def create_recipe(
                             "error_key": "image_required_to_publish",
                         }
                     },
+                    "Invalid image path": {
+                        "value": {
+                            "detail": "Image path 'avatars/1.png' is not an image of recipe 1",
+                            "error_key": "invalid_image_path",
+                        }
+                    },
                 }
             ),
         },
@@ -225,7 +253,9 @@ async def update_recipe(
 ) -> RecipeReadFull:
     async with uow:
         try:
-            result = await recipe_service.update(user=current_user, recipe_id=recipe_id, recipe_update=recipe_data)
+            result, stale_image_paths = await recipe_service.update(
+                user=current_user, recipe_id=recipe_id, recipe_update=recipe_data
+            )
             await uow.commit()
         except RecipeNotFoundError as e:
             raise AppHTTPException(
@@ -235,16 +265,19 @@ async def update_recipe(
             raise AppHTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail=str(e), error_key=e.error_key
             ) from None
-        except (NoRecipeInstructionsError, NoRecipeImageError) as e:
+        except (NoRecipeInstructionsError, NoRecipeImageError, InvalidRecipeImagePathError) as e:
             raise AppHTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail=str(e), error_key=e.error_key
             ) from None
         else:
+            await recipe_service.after_commit()
+            await recipe_service.delete_images(recipe_id, stale_image_paths)
             return result
 
 
 @router.delete(
     "/{recipe_id}",
+    dependencies=[Depends(rate_limit("recipe_write"))],
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete recipe",
     description="Deletes a recipe and all related data (ingredients, instructions, tags). "
@@ -282,10 +315,13 @@ async def delete_recipe(
             raise AppHTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail=str(e), error_key=e.error_key
             ) from None
+        else:
+            await recipe_service.after_commit()
 
 
 @router.post(
     "/{recipe_id}/image/upload-url",
+    dependencies=[Depends(rate_limit("recipe_write"))],
     summary="Get URL for uploading recipe image",
     description="Returns a pre-signed URL for uploading a recipe image. "
     "Authentication required. Only the owner of the recipe or a superuser can get the URL.",
@@ -319,6 +355,7 @@ async def get_upload_image_url(
 
 @router.post(
     "/{recipe_id}/instructions/upload-urls",
+    dependencies=[Depends(rate_limit("recipe_write"))],
     summary="Get URLs for uploading instruction images",
     description="Returns pre-signed URLs for uploading images for recipe instruction steps. Authentication required.",
     responses={
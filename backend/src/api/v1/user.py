@@ -132,6 +132,7 @@ async def update_current_user(
             raise AppHTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e), error_key=e.error_key) from None
         else:
             await uow.commit()
+            await user_service.forget_snapshot(current_user.id)
             return user
 
 
@@ -173,7 +174,7 @@ async def update_user_avatar(
 ) -> dict[str, str]:
     async with uow:
         try:
-            avatar_url = await user_avatar_service.update_avatar(current_user.id, image)
+            avatar_url, stale_avatar_path = await user_avatar_service.update_avatar(current_user.id, image)
         except WrongImageFormatError as e:
             raise AppHTTPException(
                 status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e), error_key=e.error_key
@@ -184,6 +185,7 @@ async def update_user_avatar(
             ) from None
         else:
             await uow.commit()
+            await user_avatar_service.delete_avatar_file(stale_avatar_path)
             return {"avatar_url": avatar_url}
 
 
@@ -195,9 +197,13 @@ async def update_user_avatar(
 )
 async def delete_user_avatar(
     current_user: CurrentUserDependency,
+    uow: FromDishka[SQLAlchemyUnitOfWork],
     user_avatar_service: FromDishka[UserAvatarService],
 ) -> None:
-    await user_avatar_service.delete_avatar(current_user.id)
+    async with uow:
+        avatar_path = await user_avatar_service.delete_avatar(current_user.id)
+        await uow.commit()
+        await user_avatar_service.delete_avatar_file(avatar_path)
 
 
 @router.get(
@@ -303,4 +309,5 @@ async def update_user_role(
             ) from None
         else:
             await uow.commit()
+            await user_service.forget_snapshot(user_id)
             return user
@@ -34,6 +34,10 @@ class JWTConfig(BaseModel):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+    # snapshots of users checked by access tokens, changes of role and username drop them right away
+    user_cache_ttl_seconds: int = 60
+    user_local_cache_ttl_seconds: int = 5
+    user_local_cache_size: int = 10000
 
 
 class RedisConfig(BaseModel):
@@ -54,6 +58,11 @@ class S3Config(BaseModel):
     access_key: str
     secret_key: str
     endpoint_url: str
+    max_pool_connections: int = 50
+    keepalive_timeout: float = 30.0
+    presigned_url_cache_size: int = 10000
+    presigned_url_cache_margin_seconds: int = 300
+    stable_url_seconds: int = 3600
 
 
 class ElasticSearchConfig(BaseModel):
@@ -61,6 +70,69 @@ class ElasticSearchConfig(BaseModel):
     port: int
     user: str
     password: str
+    serve_search_from_source: bool = True
+    queue_index_writes: bool = True
+    indexing_batch_size: int = 500
+    indexing_batch_timeout: float = 1.0
+    indexing_max_retries: int = 3
+    search_cache_ttl_seconds: int = 60
+    search_track_total_hits: int = 10000
+    search_pit_keep_alive: str = "1m"
+    search_warmup_on_startup: bool = False
+    search_warmup_queries: int = 100
+    search_warmup_days: int = 7
+    search_warmup_concurrency: int = 2
+
+
+class SearchHistoryConfig(BaseModel):
+    max_size: int = 50
+    ttl_days: int = 30
+    flush_interval_seconds: float = 5.0
+    flush_batch_size: int = 500
+    trending_window_hours: int = 24
+    trending_refresh_seconds: int = 60
+
+
+class CleanupConfig(BaseModel):
+    interval_seconds: float = 3600
+    batch_size: int = 1000
+    batch_pause_seconds: float = 0.1
+    anonymous_user_inactive_days: int = 90
+
+
+class ImageProcessingConfig(BaseModel):
+    widths: list[int] = [320, 640, 1280]
+    webp_quality: int = 80
+    max_workers: int = 4
+    avatar_max_side: int | None = 1024
+
+
+class PasswordHashingConfig(BaseModel):
+    max_workers: int = 4
+    # Argon2 parameters of new hashes, existing hashes are verified with the parameters stored in them
+    time_cost: int = 3
+    memory_cost: int = 65536
+    parallelism: int = 4
+
+
+class RateLimitRule(BaseModel):
+    limit: int
+    window_seconds: int
+    # "ip" counts requests of a client address, "user" of the user or anonymous user falling back to the address
+    identity: Literal["ip", "user"] = "user"
+
+
+class RateLimitConfig(BaseModel):
+    enabled: bool = True
+    local_cache_size: int = 10000
+    rules: dict[str, RateLimitRule] = {
+        "login": RateLimitRule(limit=10, window_seconds=60, identity="ip"),
+        "register": RateLimitRule(limit=10, window_seconds=3600, identity="ip"),
+        "refresh": RateLimitRule(limit=30, window_seconds=60, identity="ip"),
+        "consent": RateLimitRule(limit=30, window_seconds=3600, identity="ip"),
+        "recipe_view": RateLimitRule(limit=120, window_seconds=60),
+        "recipe_write": RateLimitRule(limit=30, window_seconds=60),
+    }
 
 
 class CookiePolicyConfig(BaseModel):
@@ -69,6 +141,14 @@ class CookiePolicyConfig(BaseModel):
     secure: bool = False
 
 
+class AnonymousUserConfig(BaseModel):
+    # anonymous users resolved by their cookies, consent revocation drops the cookie right away
+    cache_ttl_seconds: int = 300
+    unknown_cache_ttl_seconds: int = 60
+    local_cache_ttl_seconds: float = 5
+    local_cache_size: int = 10000
+
+
 class NatsConfig(BaseModel):
     url: str = "nats://nats:4222"
 
@@ -97,9 +177,15 @@ class Settings(BaseSettings):
     postgres: PostgresConfig
     s3_storage: S3Config
     jwt: JWTConfig
+    password_hashing: PasswordHashingConfig = PasswordHashingConfig()
+    rate_limit: RateLimitConfig = RateLimitConfig()
     cookie_policy: CookiePolicyConfig
+    anonymous_user: AnonymousUserConfig = AnonymousUserConfig()
     redis: RedisConfig
     elasticsearch: ElasticSearchConfig
+    search_history: SearchHistoryConfig = SearchHistoryConfig()
+    cleanup: CleanupConfig = CleanupConfig()
+    image_processing: ImageProcessingConfig = ImageProcessingConfig()
     nats: NatsConfig = NatsConfig()
     tests: TestsConfig = TestsConfig()
     superuser: SuperuserConfig
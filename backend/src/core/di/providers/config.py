@@ -1,11 +1,16 @@
 from dishka import Provider, Scope, provide
 
 from src.core.config import (
+    AnonymousUserConfig,
     ElasticSearchConfig,
+    ImageProcessingConfig,
     JWTConfig,
+    PasswordHashingConfig,
     PostgresConfig,
+    RateLimitConfig,
     RedisConfig,
     S3Config,
+    SearchHistoryConfig,
     Settings,
     settings,
 )
@@ -26,6 +31,18 @@ class ConfigProvider(Provider):
     def get_jwt_config(self, settings: Settings) -> JWTConfig:
         return settings.jwt
 
+    @provide
+    def get_password_hashing_config(self, settings: Settings) -> PasswordHashingConfig:
+        return settings.password_hashing
+
+    @provide
+    def get_rate_limit_config(self, settings: Settings) -> RateLimitConfig:
+        return settings.rate_limit
+
+    @provide
+    def get_anonymous_user_config(self, settings: Settings) -> AnonymousUserConfig:
+        return settings.anonymous_user
+
     @provide
     def get_redis_config(self, settings: Settings) -> RedisConfig:
         return settings.redis
@@ -37,3 +54,11 @@ class ConfigProvider(Provider):
     @provide
     def get_elasticsearch_config(self, settings: Settings) -> ElasticSearchConfig:
         return settings.elasticsearch
+
+    @provide
+    def get_search_history_config(self, settings: Settings) -> SearchHistoryConfig:
+        return settings.search_history
+
+    @provide
+    def get_image_processing_config(self, settings: Settings) -> ImageProcessingConfig:
+        return settings.image_processing
@@ -2,7 +2,10 @@ from collections.abc import AsyncIterator
 
 from dishka import Provider, Scope, provide
 from elasticsearch import AsyncElasticsearch
+from faststream.nats import NatsBroker
 
+from src.adapters.interfaces.search_indexing import SearchIndexingAdapterProtocol
+from src.adapters.search.indexing import SearchIndexingAdapter
 from src.core.config import ElasticSearchConfig
 
 
@@ -19,3 +22,7 @@ class ElasticsearchProvider(Provider):
             max_retries=10,
         ) as client:
             yield client
+
+    @provide
+    def get_search_indexing_adapter(self, broker: NatsBroker) -> SearchIndexingAdapterProtocol:
+        return SearchIndexingAdapter(broker)
@@ -3,19 +3,25 @@ from elasticsearch import AsyncElasticsearch
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.adapters.interfaces.image_processing import ImageProcessingAdapterProtocol
 from src.adapters.interfaces.recommendations import RecommendationsAdapterProtocol
+from src.adapters.interfaces.search_indexing import SearchIndexingAdapterProtocol
 from src.adapters.storage import S3Storage
+from src.core.config import AnonymousUserConfig, ElasticSearchConfig, JWTConfig, RateLimitConfig, SearchHistoryConfig
 from src.repositories.anonymous_user import AnonymousUserRepository
+from src.repositories.anonymous_user_cache import AnonymousUserCacheRepository, LocalAnonymousUserCache
 from src.repositories.banned_email import BannedEmailRepository
 from src.repositories.consent import ConsentRepository
 from src.repositories.disliked_recipe import DislikedRecipeRepository
 from src.repositories.favorite_recipe import FavoriteRecipeRepository
 from src.repositories.interfaces import (
+    AnonymousUserCacheRepositoryProtocol,
     AnonymousUserRepositoryProtocol,
     BannedEmailRepositoryProtocol,
     ConsentRepositoryProtocol,
     DislikedRecipeRepositoryProtocol,
     FavoriteRecipeRepositoryProtocol,
+    RateLimitRepositoryProtocol,
     RecipeImageRepositoryProtocol,
     RecipeImpressionRepositoryProtocol,
     RecipeIngredientRepositoryProtocol,
@@ -26,12 +32,17 @@ from src.repositories.interfaces import (
     RecipeTagRepositoryProtocol,
     RecsysRepositoryProtocol,
     RefreshTokenRepositoryProtocol,
+    SearchCacheRepositoryProtocol,
+    SearchHistoryRepositoryProtocol,
     SearchQueryRepositoryProtocol,
+    SearchTrendsRepositoryProtocol,
     ShoppingListItemRepositoryProtocol,
     UserAvatarRepositoryProtocol,
     UserProfileRepositoryProtocol,
     UserRepositoryProtocol,
+    UserSnapshotRepositoryProtocol,
 )
+from src.repositories.rate_limit import LocalRateLimitBlocks, RateLimitRepository
 from src.repositories.recipe import RecipeRepository
 from src.repositories.recipe_image import RecipeImageRepository
 from src.repositories.recipe_impression import RecipeImpressionRepository
@@ -41,12 +52,16 @@ from src.repositories.recipe_report import RecipeReportRepository
 from src.repositories.recipe_search import RecipeSearchRepository
 from src.repositories.recipe_tag import RecipeTagRepository
 from src.repositories.recsys_client import RecsysRepository
+from src.repositories.search_cache import SearchCacheRepository
+from src.repositories.search_history import SearchHistoryRepository
 from src.repositories.search_query import SearchQueryRepository
+from src.repositories.search_trends import SearchTrendsRepository
 from src.repositories.shopping_list_item import ShoppingListItemRepository
 from src.repositories.token import RefreshTokenRepository
 from src.repositories.user import UserRepository
 from src.repositories.user_avatar import UserAvatarRepository
 from src.repositories.user_profile import UserProfileRepository
+from src.repositories.user_snapshot import LocalUserSnapshotCache, UserSnapshotRepository
 
 
 class RepositoryProvider(Provider):
@@ -65,15 +80,56 @@ class RepositoryProvider(Provider):
     def get_user_avatar_repository(self, session: AsyncSession, s3_storage: S3Storage) -> UserAvatarRepositoryProtocol:
         return UserAvatarRepository(session, s3_storage)
 
+    @provide(scope=Scope.APP)
+    def get_local_user_snapshot_cache(self, jwt_config: JWTConfig) -> LocalUserSnapshotCache:
+        return LocalUserSnapshotCache(
+            ttl_seconds=jwt_config.user_local_cache_ttl_seconds,
+            max_size=jwt_config.user_local_cache_size,
+        )
+
+    @provide
+    def get_user_snapshot_repository(
+        self, redis: Redis, local_cache: LocalUserSnapshotCache, jwt_config: JWTConfig
+    ) -> UserSnapshotRepositoryProtocol:
+        return UserSnapshotRepository(redis, local_cache, ttl_seconds=jwt_config.user_cache_ttl_seconds)
+
     @provide
     def get_anonymous_user_repository(self, session: AsyncSession) -> AnonymousUserRepositoryProtocol:
         return AnonymousUserRepository(session)
 
+    @provide(scope=Scope.APP)
+    def get_local_anonymous_user_cache(self, anonymous_user_config: AnonymousUserConfig) -> LocalAnonymousUserCache:
+        return LocalAnonymousUserCache(
+            ttl_seconds=anonymous_user_config.local_cache_ttl_seconds,
+            max_size=anonymous_user_config.local_cache_size,
+        )
+
+    @provide
+    def get_anonymous_user_cache_repository(
+        self, redis: Redis, local_cache: LocalAnonymousUserCache, anonymous_user_config: AnonymousUserConfig
+    ) -> AnonymousUserCacheRepositoryProtocol:
+        return AnonymousUserCacheRepository(
+            redis,
+            local_cache,
+            ttl_seconds=anonymous_user_config.cache_ttl_seconds,
+            unknown_ttl_seconds=anonymous_user_config.unknown_cache_ttl_seconds,
+        )
+
     # Auth-related repositories
     @provide
     def get_refresh_token_repository(self, session: AsyncSession, redis: Redis) -> RefreshTokenRepositoryProtocol:
         return RefreshTokenRepository(session, redis)
 
+    @provide(scope=Scope.APP)
+    def get_local_rate_limit_blocks(self, rate_limit_config: RateLimitConfig) -> LocalRateLimitBlocks:
+        return LocalRateLimitBlocks(max_size=rate_limit_config.local_cache_size)
+
+    @provide
+    def get_rate_limit_repository(
+        self, redis: Redis, local_blocks: LocalRateLimitBlocks
+    ) -> RateLimitRepositoryProtocol:
+        return RateLimitRepository(redis, local_blocks)
+
     @provide
     def get_banned_email_repository(self, session: AsyncSession) -> BannedEmailRepositoryProtocol:
         return BannedEmailRepository(session)
@@ -104,12 +160,50 @@ class RepositoryProvider(Provider):
         return RecipeReportRepository(session)
 
     @provide
-    def get_recipe_image_repository(self, s3_storage: S3Storage) -> RecipeImageRepositoryProtocol:
-        return RecipeImageRepository(s3_storage)
-
-    @provide
-    def get_recipe_search_repository(self, es_client: AsyncElasticsearch) -> RecipeSearchRepositoryProtocol:
-        return RecipeSearchRepository(es_client)
+    def get_recipe_image_repository(
+        self, s3_storage: S3Storage, processing_adapter: ImageProcessingAdapterProtocol
+    ) -> RecipeImageRepositoryProtocol:
+        return RecipeImageRepository(s3_storage, processing_adapter)
+
+    @provide
+    def get_recipe_search_repository(
+        self,
+        es_client: AsyncElasticsearch,
+        indexing_adapter: SearchIndexingAdapterProtocol,
+        elasticsearch_config: ElasticSearchConfig,
+    ) -> RecipeSearchRepositoryProtocol:
+        return RecipeSearchRepository(
+            es_client,
+            indexing_adapter,
+            track_total_hits=elasticsearch_config.search_track_total_hits,
+            pit_keep_alive=elasticsearch_config.search_pit_keep_alive,
+        )
+
+    @provide
+    def get_search_cache_repository(
+        self, redis: Redis, elasticsearch_config: ElasticSearchConfig
+    ) -> SearchCacheRepositoryProtocol:
+        return SearchCacheRepository(redis, elasticsearch_config.search_cache_ttl_seconds)
+
+    @provide
+    def get_search_history_repository(
+        self, redis: Redis, search_history_config: SearchHistoryConfig
+    ) -> SearchHistoryRepositoryProtocol:
+        return SearchHistoryRepository(
+            redis,
+            max_size=search_history_config.max_size,
+            ttl_seconds=search_history_config.ttl_days * 24 * 60 * 60,
+        )
+
+    @provide
+    def get_search_trends_repository(
+        self, redis: Redis, search_history_config: SearchHistoryConfig
+    ) -> SearchTrendsRepositoryProtocol:
+        return SearchTrendsRepository(
+            redis,
+            window_hours=search_history_config.trending_window_hours,
+            refresh_seconds=search_history_config.trending_refresh_seconds,
+        )
 
     @provide
     def get_search_query_repository(self, session: AsyncSession) -> SearchQueryRepositoryProtocol:
@@ -1,14 +1,18 @@
 from collections.abc import AsyncIterator
 
 from dishka import Provider, Scope, provide
+from faststream.nats import NatsBroker
 from types_aiobotocore_s3 import S3Client
 
-from src.adapters.storage import S3Storage, S3StorageClientManager
+from src.adapters.image_processing import ImageProcessingAdapter
+from src.adapters.interfaces.image_processing import ImageProcessingAdapterProtocol
+from src.adapters.storage import PresignedUrlCache, S3Storage, S3StorageClientManager
 from src.core.config import S3Config
 
 
 class S3Provider(Provider):
-    scope = Scope.REQUEST
+    # the client holds a connection pool, so it is created once and closed with the container
+    scope = Scope.APP
 
     @provide
     async def get_s3_client(self, config: S3Config) -> AsyncIterator[S3Client]:
@@ -16,12 +20,39 @@ class S3Provider(Provider):
             f"{config.host}:{config.port}",
             config.access_key,
             config.secret_key,
+            max_pool_connections=config.max_pool_connections,
+            keepalive_timeout=config.keepalive_timeout,
+            # without an explicit version botocore still presigns URLs and POST policies with version 2
+            signature_version="s3v4",
         ).get_client() as client:
             yield client
 
     @provide
-    def get_s3_storage(self, client: S3Client, config: S3Config) -> S3Storage:
-        return S3Storage(
-            client=client,
-            endpoint_url=config.endpoint_url,
+    async def get_s3_storage(self, client: S3Client, config: S3Config) -> AsyncIterator[S3Storage]:
+        url_cache = PresignedUrlCache(
+            max_size=config.presigned_url_cache_size,
+            margin_seconds=config.presigned_url_cache_margin_seconds,
         )
+        if not config.stable_url_seconds:
+            yield S3Storage(client=client, endpoint_url=config.endpoint_url, url_cache=url_cache)
+            return
+
+        # query string signing of version 2 carries no signing time, so download URLs can be stable, it is used
+        # only to sign them, requests to S3 keep the default signer of `client`
+        async with S3StorageClientManager(
+            f"{config.host}:{config.port}",
+            config.access_key,
+            config.secret_key,
+            signature_version="s3",
+        ).get_client() as url_signing_client:
+            yield S3Storage(
+                client=client,
+                endpoint_url=config.endpoint_url,
+                url_cache=url_cache,
+                stable_url_seconds=config.stable_url_seconds,
+                url_signing_client=url_signing_client,
+            )
+
+    @provide
+    def get_image_processing_adapter(self, broker: NatsBroker) -> ImageProcessingAdapterProtocol:
+        return ImageProcessingAdapter(broker)
@@ -1,11 +1,24 @@
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+from argon2 import PasswordHasher
 from dishka import Provider, Scope, provide
 
+from src.core.config import (
+    ElasticSearchConfig,
+    ImageProcessingConfig,
+    PasswordHashingConfig,
+    RateLimitConfig,
+    SearchHistoryConfig,
+)
 from src.repositories.interfaces import (
+    AnonymousUserCacheRepositoryProtocol,
     AnonymousUserRepositoryProtocol,
     BannedEmailRepositoryProtocol,
     ConsentRepositoryProtocol,
     DislikedRecipeRepositoryProtocol,
     FavoriteRecipeRepositoryProtocol,
+    RateLimitRepositoryProtocol,
     RecipeImageRepositoryProtocol,
     RecipeImpressionRepositoryProtocol,
     RecipeIngredientRepositoryProtocol,
@@ -16,11 +29,15 @@ from src.repositories.interfaces import (
     RecipeTagRepositoryProtocol,
     RecsysRepositoryProtocol,
     RefreshTokenRepositoryProtocol,
+    SearchCacheRepositoryProtocol,
+    SearchHistoryRepositoryProtocol,
     SearchQueryRepositoryProtocol,
+    SearchTrendsRepositoryProtocol,
     ShoppingListItemRepositoryProtocol,
     UserAvatarRepositoryProtocol,
     UserProfileRepositoryProtocol,
     UserRepositoryProtocol,
+    UserSnapshotRepositoryProtocol,
 )
 from src.services.anonymous_user import AnonymousUserService
 from src.services.avatar import UserAvatarService
@@ -28,7 +45,9 @@ from src.services.banned_email import BannedEmailService
 from src.services.consent import ConsentService
 from src.services.disliked_recipe import DislikedRecipeService
 from src.services.favorite_recipe import FavoriteRecipeService
+from src.services.rate_limit import RateLimitService
 from src.services.recipe import RecipeService
+from src.services.recipe_image import RecipeImageService
 from src.services.recipe_impression import RecipeImpressionService
 from src.services.recipe_instructions import RecipeInstructionsService
 from src.services.recipe_report import RecipeReportService
@@ -51,23 +70,36 @@ class ServiceProvider(Provider):
         user_profile_repository: UserProfileRepositoryProtocol,
         banned_email_repository: BannedEmailRepositoryProtocol,
         user_avatar_repository: UserAvatarRepositoryProtocol,
+        user_snapshot_repository: UserSnapshotRepositoryProtocol,
+        security_service: SecurityService,
     ) -> UserService:
         return UserService(
             user_repository=user_repository,
             user_profile_repository=user_profile_repository,
             banned_email_repository=banned_email_repository,
             user_avatar_repository=user_avatar_repository,
+            user_snapshot_repository=user_snapshot_repository,
+            security_service=security_service,
         )
 
     @provide
-    def get_user_avatar_service(self, user_avatar_repository: UserAvatarRepositoryProtocol) -> UserAvatarService:
-        return UserAvatarService(user_avatar_repository=user_avatar_repository)
+    def get_user_avatar_service(
+        self, user_avatar_repository: UserAvatarRepositoryProtocol, image_processing_config: ImageProcessingConfig
+    ) -> UserAvatarService:
+        return UserAvatarService(
+            user_avatar_repository=user_avatar_repository, max_side=image_processing_config.avatar_max_side
+        )
 
     @provide
     def get_anonymous_user_service(
-        self, anonymous_user_repository: AnonymousUserRepositoryProtocol
+        self,
+        anonymous_user_repository: AnonymousUserRepositoryProtocol,
+        anonymous_user_cache_repository: AnonymousUserCacheRepositoryProtocol,
     ) -> AnonymousUserService:
-        return AnonymousUserService(anonymous_user_repository=anonymous_user_repository)
+        return AnonymousUserService(
+            anonymous_user_repository=anonymous_user_repository,
+            anonymous_user_cache_repository=anonymous_user_cache_repository,
+        )
 
     @provide
     def get_consent_service(self, consent_repository: ConsentRepositoryProtocol) -> ConsentService:
@@ -79,10 +111,12 @@ class ServiceProvider(Provider):
         self,
         refresh_token_repository: RefreshTokenRepositoryProtocol,
         user_repository: UserRepositoryProtocol,
+        user_snapshot_repository: UserSnapshotRepositoryProtocol,
     ) -> TokenService:
         return TokenService(
             refresh_token_repository=refresh_token_repository,
             user_repository=user_repository,
+            user_snapshot_repository=user_snapshot_repository,
         )
 
     @provide
@@ -94,9 +128,19 @@ class ServiceProvider(Provider):
             refresh_token_repository=refresh_token_repository,
         )
 
+    @provide(scope=Scope.APP)
+    def get_security_service(self, config: PasswordHashingConfig) -> Iterator[SecurityService]:
+        hasher = PasswordHasher(
+            time_cost=config.time_cost, memory_cost=config.memory_cost, parallelism=config.parallelism
+        )
+        with ThreadPoolExecutor(max_workers=config.max_workers, thread_name_prefix="password-hashing") as executor:
+            yield SecurityService(hasher, executor)
+
     @provide
-    def get_security_service(self) -> SecurityService:
-        return SecurityService()
+    def get_rate_limit_service(
+        self, rate_limit_repository: RateLimitRepositoryProtocol, rate_limit_config: RateLimitConfig
+    ) -> RateLimitService:
+        return RateLimitService(rate_limit_repository=rate_limit_repository, config=rate_limit_config)
 
     # Recipe-related services
     @provide
@@ -109,6 +153,8 @@ class ServiceProvider(Provider):
         recipe_image_repository: RecipeImageRepositoryProtocol,
         recipe_search_repository: RecipeSearchRepositoryProtocol,
         recsys_repository: RecsysRepositoryProtocol,
+        search_cache_repository: SearchCacheRepositoryProtocol,
+        elasticsearch_config: ElasticSearchConfig,
     ) -> RecipeService:
         return RecipeService(
             recipe_repository=recipe_repository,
@@ -118,6 +164,24 @@ class ServiceProvider(Provider):
             recipe_image_repository=recipe_image_repository,
             recipe_search_repository=recipe_search_repository,
             recsys_repository=recsys_repository,
+            search_cache_repository=search_cache_repository,
+            queue_index_writes=elasticsearch_config.queue_index_writes,
+        )
+
+    @provide
+    def get_recipe_image_service(
+        self,
+        recipe_repository: RecipeRepositoryProtocol,
+        recipe_image_repository: RecipeImageRepositoryProtocol,
+        recipe_search_repository: RecipeSearchRepositoryProtocol,
+        image_processing_config: ImageProcessingConfig,
+    ) -> RecipeImageService:
+        return RecipeImageService(
+            recipe_repository=recipe_repository,
+            recipe_image_repository=recipe_image_repository,
+            recipe_search_repository=recipe_search_repository,
+            widths=image_processing_config.widths,
+            webp_quality=image_processing_config.webp_quality,
         )
 
     @provide
@@ -127,12 +191,24 @@ class ServiceProvider(Provider):
         search_query_repository: SearchQueryRepositoryProtocol,
         recipe_repository: RecipeRepositoryProtocol,
         recipe_image_repository: RecipeImageRepositoryProtocol,
+        favorite_recipe_repository: FavoriteRecipeRepositoryProtocol,
+        search_cache_repository: SearchCacheRepositoryProtocol,
+        search_history_repository: SearchHistoryRepositoryProtocol,
+        search_trends_repository: SearchTrendsRepositoryProtocol,
+        elasticsearch_config: ElasticSearchConfig,
+        search_history_config: SearchHistoryConfig,
     ) -> SearchService:
         return SearchService(
             recipe_search_repository=recipe_search_repository,
             search_query_repository=search_query_repository,
             recipe_repository=recipe_repository,
             recipe_image_repository=recipe_image_repository,
+            favorite_recipe_repository=favorite_recipe_repository,
+            search_cache_repository=search_cache_repository,
+            search_history_repository=search_history_repository,
+            search_trends_repository=search_trends_repository,
+            serve_from_source=elasticsearch_config.serve_search_from_source,
+            search_history_size=search_history_config.max_size,
         )
 
     @provide
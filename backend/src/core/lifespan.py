@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
@@ -7,9 +8,12 @@ from elasticsearch.dsl import async_connections
 from fastapi import FastAPI
 from faststream.nats import NatsBroker
 from redis.asyncio import Redis
+from types_aiobotocore_s3 import S3Client
 
 from src.adapters.search.indexes import search_indexes_setup
+from src.core.config import ElasticSearchConfig
 from src.db.manager import DatabaseManager
+from src.warmup import warm_up_search
 
 logger = logging.getLogger(__name__)
 
@@ -29,17 +33,40 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         await search_indexes_setup()
         logger.info("Elasticsearch client initialized through DI container")
 
+        # Create S3 client once, its connection pool is shared by all requests
+        await request_container.get(S3Client)
+        logger.info("S3 client initialized through DI container")
+
         # Initialize NATS broker
         broker: NatsBroker = await request_container.get(NatsBroker)
         await broker.start()
         logger.info("NATS broker started")
 
+        es_config: ElasticSearchConfig = await request_container.get(ElasticSearchConfig)
+
+    # Warm search caches up in background, so startup is not delayed
+    search_warmup_task = None
+    if es_config.search_warmup_on_startup:
+        search_warmup_task = asyncio.create_task(
+            warm_up_search(
+                app.state.dishka_container,
+                queries=es_config.search_warmup_queries,
+                days=es_config.search_warmup_days,
+                concurrency=es_config.search_warmup_concurrency,
+            )
+        )
+        logger.info("Search cache warmup started")
+
     logger.info("Application startup completed")
 
     yield
 
     logger.info("Starting application shutdown...")
 
+    if search_warmup_task is not None and not search_warmup_task.done():
+        search_warmup_task.cancel()
+        logger.info("Search cache warmup cancelled")
+
     # Cleanup services through DI container
     async with app.state.dishka_container() as request_container:
         # Cleanup database connections
@@ -52,6 +79,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         await shutdown_broker.close()
         logger.info("NATS broker closed")
 
+    # Closes application scoped clients, including the S3 client connection pool
     await app.state.dishka_container.close()
     logger.info("DI container closed")
 
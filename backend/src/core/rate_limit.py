@@ -0,0 +1,63 @@
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Annotated
+
+from dishka.integrations.fastapi import FromDishka, inject
+from fastapi import Depends, Request, status
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.core.security import bearer_scheme
+from src.exceptions import AppHTTPException, InvalidJWTError, JWTSignatureExpiredError, RateLimitExceededError
+from src.services.rate_limit import RateLimitService
+from src.services.token import TokenService
+
+
+async def _get_user_identity(
+    request: Request, token_service: TokenService, credentials: HTTPAuthorizationCredentials | None
+) -> str | None:
+    """
+    Identity of the requesting user or anonymous user, `None` for requests without them.
+
+    Only the signature of the access token is checked, without loading the user. The anonymous cookie is not looked
+    up either: a made up cookie escapes the limit but also records nothing for an anonymous user.
+    """
+    if credentials:
+        try:
+            payload = await token_service.verify_token(credentials.credentials)
+        except (InvalidJWTError, JWTSignatureExpiredError):
+            return None
+        return f"user:{payload['sub']}" if payload.get("sub") else None
+
+    anonymous_id = request.cookies.get("anonymous_id")
+    if anonymous_id:
+        try:
+            return f"anonymous:{uuid.UUID(anonymous_id)}"
+        except ValueError:
+            return None
+    return None
+
+
+def rate_limit(rule_name: str) -> Callable[..., Awaitable[None]]:
+    """Dependency limiting requests to a route by the rule of `RateLimitConfig.rules` with the given name."""
+
+    @inject
+    async def check_rate_limit(
+        request: Request,
+        credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer_scheme)],
+        rate_limit_service: FromDishka[RateLimitService],
+        token_service: FromDishka[TokenService],
+    ) -> None:
+        user_identity = await _get_user_identity(request, token_service, credentials)
+        try:
+            await rate_limit_service.check(
+                rule_name, user_identity=user_identity, ip=request.client.host if request.client else None
+            )
+        except RateLimitExceededError as e:
+            raise AppHTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=e.message,
+                error_key=e.error_key,
+                headers={"Retry-After": str(e.retry_after)},
+            ) from None
+
+    return check_rate_limit
@@ -1,17 +1,21 @@
 from src.enums.feedback_type import FeedbackTypeEnum
+from src.enums.index_refresh import IndexRefreshEnum
 from src.enums.recipe_difficulty import RecipeDifficultyEnum
 from src.enums.recipe_get_source import RecipeGetSourceEnum
 from src.enums.recipe_sort_field import RecipeSortFieldEnum
 from src.enums.report_reason import ReportReasonEnum
 from src.enums.report_status import ReportStatusEnum
+from src.enums.search_indexing_action import SearchIndexingActionEnum
 from src.enums.user_role import UserRoleEnum
 
 __all__ = [
     "FeedbackTypeEnum",
+    "IndexRefreshEnum",
     "RecipeDifficultyEnum",
     "RecipeGetSourceEnum",
     "RecipeSortFieldEnum",
     "ReportReasonEnum",
     "ReportStatusEnum",
+    "SearchIndexingActionEnum",
     "UserRoleEnum",
 ]
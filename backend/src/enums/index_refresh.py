@@ -0,0 +1,9 @@
+from enum import StrEnum
+
+
+class IndexRefreshEnum(StrEnum):
+    """Value of the `refresh` parameter for search index writes."""
+
+    NONE = "false"  # change becomes visible after the next scheduled refresh
+    WAIT_FOR = "wait_for"  # block until the change is visible to search, without forcing a refresh
+    IMMEDIATE = "true"  # force a refresh of the affected shards, creates tiny segments
@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class SearchIndexingActionEnum(StrEnum):
+    INDEX = "index"
+    DELETE = "delete"
@@ -13,8 +13,10 @@ from src.exceptions.disliked_recipe import RecipeAlreadyDislikedError, RecipeNot
 from src.exceptions.favorite_recipe import RecipeAlreadyInFavoritesError, RecipeNotInFavoritesError
 from src.exceptions.http import AppHTTPException
 from src.exceptions.image import ImageTooLargeError, WrongImageFormatError
+from src.exceptions.rate_limit import RateLimitExceededError
 from src.exceptions.recipe import (
     AttachInstructionStepError,
+    InvalidRecipeImagePathError,
     NoRecipeImageError,
     NoRecipeInstructionsError,
     RecipeNotFoundError,
@@ -26,7 +28,11 @@ from src.exceptions.recipe_report import (
     RecipeReportAlreadyExistsError,
     RecipeReportNotFoundError,
 )
-from src.exceptions.recipe_search import UserIdentityNotProvidedError
+from src.exceptions.recipe_search import (
+    InvalidSearchCursorError,
+    SearchCursorExpiredError,
+    UserIdentityNotProvidedError,
+)
 from src.exceptions.shopping_list_item import ShoppingListItemNotFoundError
 from src.exceptions.user import (
     InsufficientRoleError,
@@ -49,11 +55,14 @@ __all__ = [
     "IncorrectCredentialsError",
     "InsufficientRoleError",
     "InvalidJWTError",
+    "InvalidRecipeImagePathError",
+    "InvalidSearchCursorError",
     "InvalidTokenError",
     "JWTSignatureExpired",
     "JWTSignatureExpiredError",
     "NoRecipeImageError",
     "NoRecipeInstructionsError",
+    "RateLimitExceededError",
     "RecipeAlreadyDislikedError",
     "RecipeAlreadyInFavoritesError",
     "RecipeIngredientNotFoundError",
@@ -63,6 +72,7 @@ __all__ = [
     "RecipeOwnershipError",
     "RecipeReportAlreadyExistsError",
     "RecipeReportNotFoundError",
+    "SearchCursorExpiredError",
     "ShoppingListItemNotFoundError",
     "UserEmailAlreadyExistsError",
     "UserIdentityNotProvidedError",
@@ -0,0 +1,9 @@
+from src.exceptions.base import BaseAppError
+
+
+class RateLimitExceededError(BaseAppError):
+    error_key = "rate_limit_exceeded"
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -19,3 +19,7 @@ class NoRecipeInstructionsError(BaseAppError):
 
 class AttachInstructionStepError(BaseAppError):
     error_key = "attach_instruction_step"
+
+
+class InvalidRecipeImagePathError(BaseAppError):
+    error_key = "invalid_image_path"
@@ -3,3 +3,11 @@ from src.exceptions.base import BaseAppError
 
 class UserIdentityNotProvidedError(BaseAppError):
     error_key = "user_id_or_anonymous_user_id_not_provided"
+
+
+class InvalidSearchCursorError(BaseAppError):
+    error_key = "invalid_search_cursor"
+
+
+class SearchCursorExpiredError(BaseAppError):
+    error_key = "search_cursor_expired"
@@ -13,7 +13,8 @@ async def main() -> None:
         uow = await request_container.get(SQLAlchemyUnitOfWork)
         user_service: UserService = await request_container.get(UserService)
         settings = await request_container.get(Settings)
-        hashed_password = SecurityService.get_password_hash(settings.superuser.password)
+        security_service = await request_container.get(SecurityService)
+        hashed_password = await security_service.get_password_hash(settings.superuser.password)
         async with uow:
             try:
                 await user_service.get_by_email(settings.superuser.email)
@@ -43,7 +43,7 @@ def create_app(app_settings: Settings, app_lifespan: Callable) -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-        expose_headers=["X-Total-Count"],
+        expose_headers=["X-Total-Count", "X-Next-Cursor"],
     )
 
     app.include_router(v1_router)
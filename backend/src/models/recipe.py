@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy import ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.enums.recipe_difficulty import RecipeDifficultyEnum
@@ -26,6 +27,8 @@ class Recipe(Base):
     author_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"))
     short_description: Mapped[str] = mapped_column(String(255), nullable=False)
     image_path: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # widths of resized WebP copies of the image, None until they are generated
+    image_widths: Mapped[list[int] | None] = mapped_column(ARRAY(Integer), nullable=True)
     difficulty: Mapped[RecipeDifficultyEnum]
     cook_time_minutes: Mapped[int]
     is_published: Mapped[bool] = mapped_column(default=False)
@@ -0,0 +1,140 @@
+"""
+Rebuild the recipe search index from PostgreSQL without downtime.
+
+Published recipes are loaded in keyset-paginated chunks by several parallel workers into a fresh
+`recipes-<timestamp>` index created with refreshes disabled and without replicas. Then recipes changed
+during the load are caught up, index settings are restored, document count is verified against the
+database and the `recipes` alias is switched to the new index.
+
+Usage: python -m src.reindex [--workers 4] [--chunk-size 500] [--delete-old] [--force]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import UTC, datetime
+
+from elasticsearch import AsyncElasticsearch
+from elasticsearch.dsl import Q, async_connections
+
+from src.adapters.search.indexes import (
+    RecipeIndex,
+    create_next_index,
+    finish_bulk_load,
+    search_indexes_setup,
+    switch_alias,
+)
+from src.core.di import container
+from src.repositories.interfaces import (
+    RecipeRepositoryProtocol,
+    RecipeSearchRepositoryProtocol,
+    SearchCacheRepositoryProtocol,
+)
+from src.utils.search_document import serialize_recipe_for_search
+
+logger = logging.getLogger(__name__)
+
+
+async def index_slice(
+    slice_id: int, slices: int, chunk_size: int, index: str | None = None, updated_since: datetime | None = None
+) -> int:
+    indexed = 0
+    after_id = 0
+    while True:
+        # every chunk gets its own session, so loaded recipes do not pile up in the identity map
+        async with container() as request_container:
+            recipe_repository = await request_container.get(RecipeRepositoryProtocol)
+            recipe_search_repository = await request_container.get(RecipeSearchRepositoryProtocol)
+            recipes = await recipe_repository.get_for_indexing(
+                after_id, chunk_size, slices=slices, slice_id=slice_id, updated_since=updated_since
+            )
+            if not recipes:
+                return indexed
+
+            indexed += await recipe_search_repository.bulk_sync_recipes(
+                [serialize_recipe_for_search(recipe) for recipe in recipes], index=index, chunk_size=chunk_size
+            )
+            after_id = recipes[-1].id
+
+
+async def index_all(
+    workers: int, chunk_size: int, index: str | None = None, updated_since: datetime | None = None
+) -> int:
+    counts = await asyncio.gather(
+        *(index_slice(slice_id, workers, chunk_size, index, updated_since) for slice_id in range(workers))
+    )
+    return sum(counts)
+
+
+async def count_published_documents(index: str) -> int:
+    search = RecipeIndex.search(index=index).filter(Q("term", is_published=True))
+    return await search.count()
+
+
+async def main(workers: int, chunk_size: int, *, delete_old: bool, force: bool) -> int:
+    es_client = await container.get(AsyncElasticsearch)
+    async_connections.add_connection("default", es_client)
+    # saves the current mapping and analyzers as index template, the new index is created from it
+    await search_indexes_setup()
+
+    started_at = datetime.now(UTC)
+    started = time.perf_counter()
+    next_index = await create_next_index(bulk_load=True)
+    logger.info("Created index %s, loading recipes with %s workers", next_index, workers)
+
+    loaded = await index_all(workers, chunk_size, index=next_index)
+    elapsed = time.perf_counter() - started
+    logger.info("Loaded %s recipes in %.1fs (%.0f docs/sec)", loaded, elapsed, loaded / max(elapsed, 1e-6))
+
+    # writes made while loading went to the old index only
+    caught_up_at = datetime.now(UTC)
+    caught_up = await index_all(workers, chunk_size, index=next_index, updated_since=started_at)
+    logger.info("Caught up %s recipes changed during the load", caught_up)
+
+    await finish_bulk_load(next_index)
+
+    async with container() as request_container:
+        recipe_repository = await request_container.get(RecipeRepositoryProtocol)
+        expected = await recipe_repository.count_published()
+    actual = await count_published_documents(next_index)
+    if actual != expected:
+        logger.error("Index %s has %s published recipes, database has %s", next_index, actual, expected)
+        if not force:
+            logger.error("Alias is not switched, rerun the command or pass --force to switch anyway")
+            return 1
+
+    await switch_alias(next_index, delete_old=delete_old)
+    async with container() as request_container:
+        search_cache_repository = await request_container.get(SearchCacheRepositoryProtocol)
+        await search_cache_repository.invalidate()
+    # writes made between the catch-up and the alias switch went to the old index only
+    await index_all(workers, chunk_size, updated_since=caught_up_at)
+
+    total = time.perf_counter() - started
+    logger.info(
+        "Switched alias to %s with %s recipes in %.1fs (%.0f docs/sec)", next_index, actual, total, actual / total
+    )
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild the recipe search index from the database")
+    parser.add_argument("--workers", type=int, default=4, help="number of parallel loading workers")
+    parser.add_argument("--chunk-size", type=int, default=500, help="recipes per database query and bulk request")
+    parser.add_argument("--delete-old", action="store_true", help="delete previous indexes after switching alias")
+    parser.add_argument("--force", action="store_true", help="switch alias even if document counts differ")
+    return parser.parse_args()
+
+
+async def run() -> int:
+    args = parse_args()
+    try:
+        return await main(args.workers, args.chunk_size, delete_old=args.delete_old, force=args.force)
+    finally:
+        await container.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    raise SystemExit(asyncio.run(run()))
@@ -1,3 +1,4 @@
+from src.repositories.anonymous_user_cache import AnonymousUserCacheRepository
 from src.repositories.banned_email import BannedEmailRepository
 from src.repositories.consent import ConsentRepository
 from src.repositories.disliked_recipe import DislikedRecipeRepository
@@ -8,12 +9,17 @@ from src.repositories.recipe_ingredient import RecipeIngredientRepository
 from src.repositories.recipe_instruction import RecipeInstructionRepository
 from src.repositories.recipe_search import RecipeSearchRepository
 from src.repositories.recipe_tag import RecipeTagRepository
+from src.repositories.search_cache import SearchCacheRepository
+from src.repositories.search_history import SearchHistoryRepository
+from src.repositories.search_trends import SearchTrendsRepository
 from src.repositories.shopping_list_item import ShoppingListItemRepository
 from src.repositories.token import RefreshTokenRepository
 from src.repositories.user import UserRepository
 from src.repositories.user_profile import UserProfileRepository
+from src.repositories.user_snapshot import UserSnapshotRepository
 
 __all__ = [
+    "AnonymousUserCacheRepository",
     "BannedEmailRepository",
     "ConsentRepository",
     "DislikedRecipeRepository",
@@ -25,7 +31,11 @@ __all__ = [
     "RecipeSearchRepository",
     "RecipeTagRepository",
     "RefreshTokenRepository",
+    "SearchCacheRepository",
+    "SearchHistoryRepository",
+    "SearchTrendsRepository",
     "ShoppingListItemRepository",
     "UserProfileRepository",
     "UserRepository",
+    "UserSnapshotRepository",
 ]
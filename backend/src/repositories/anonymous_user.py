@@ -1,10 +1,15 @@
 import uuid
+from collections.abc import Sequence
+from datetime import datetime
 from typing import Any
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.anonymous_user import AnonymousUser
+from src.models.consent import Consent
+from src.models.recipe_impression import RecipeImpression
+from src.models.search_query import SearchQuery
 from src.repositories.interfaces.anonymous_user import AnonymousUserRepositoryProtocol
 
 
@@ -34,6 +39,35 @@ class AnonymousUserRepository(AnonymousUserRepositoryProtocol):
         await self.session.execute(stmt)
         await self.session.flush()
 
+    async def delete_inactive(self, inactive_since: datetime, limit: int) -> Sequence[uuid.UUID]:
+        """
+        Delete up to `limit` anonymous users without consent changes, impressions or searches since `inactive_since`.
+
+        Consents, impressions and search queries of the deleted users are removed by the cascading foreign keys,
+        their unique constraints start with the anonymous user, so the cascade uses an index.
+        Returns cookie ids of the deleted anonymous users, so they can be dropped from the cache.
+        """
+        inactive = (
+            select(AnonymousUser.id)
+            .where(
+                AnonymousUser.created_at < inactive_since,
+                ~exists().where(Consent.anonymous_user_id == AnonymousUser.id, Consent.updated_at >= inactive_since),
+                ~exists().where(
+                    RecipeImpression.anonymous_user_id == AnonymousUser.id,
+                    RecipeImpression.updated_at >= inactive_since,
+                ),
+                ~exists().where(
+                    SearchQuery.anonymous_user_id == AnonymousUser.id, SearchQuery.updated_at >= inactive_since
+                ),
+            )
+            .limit(limit)
+            # users taking part in a running transaction, e.g. being merged on login, are left for the next run
+            .with_for_update(of=AnonymousUser, skip_locked=True)
+        )
+        stmt = delete(AnonymousUser).where(AnonymousUser.id.in_(inactive)).returning(AnonymousUser.cookie_id)
+        result = await self.session.scalars(stmt)
+        return result.all()
+
     async def exists(self, anonymous_user_id: int) -> bool:
         stmt = select(AnonymousUser.id).where(AnonymousUser.id == anonymous_user_id).exists()
         final_stmt = select(stmt)
@@ -0,0 +1,93 @@
+import time
+import uuid
+from collections import OrderedDict
+
+from redis.asyncio import Redis
+
+from src.repositories.interfaces.anonymous_user_cache import AnonymousUserCacheRepositoryProtocol
+from src.schemas.anonymous_user import AnonymousUserRead, CachedAnonymousUser
+
+
+class LocalAnonymousUserCache:
+    """
+    In-process cache of cookies which belong to no anonymous user in front of Redis.
+
+    Other processes can not drop its entries, so they live only for a few seconds. Found anonymous users are not kept
+    here: a user deleted by another process would still be served, and writes referencing it would fail on foreign
+    keys. The least recently used entries are evicted when the cache grows over `max_size`.
+    """
+
+    def __init__(self, ttl_seconds: float = 5, max_size: int = 10000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: OrderedDict[uuid.UUID, tuple[CachedAnonymousUser, float]] = OrderedDict()
+
+    def get(self, cookie_id: uuid.UUID) -> CachedAnonymousUser | None:
+        cached = self._entries.get(cookie_id)
+        if cached is None:
+            return None
+        entry, expires_at = cached
+        if time.monotonic() >= expires_at:
+            del self._entries[cookie_id]
+            return None
+        self._entries.move_to_end(cookie_id)
+        return entry
+
+    def set(self, cookie_id: uuid.UUID, entry: CachedAnonymousUser) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._entries[cookie_id] = (entry, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(cookie_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, cookie_id: uuid.UUID) -> None:
+        self._entries.pop(cookie_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class AnonymousUserCacheRepository(AnonymousUserCacheRepositoryProtocol):
+    """
+    Anonymous users resolved by the cookie on every request of a visitor, so most requests skip Postgres.
+
+    Cookies of no anonymous user are cached as well for a shorter time, so made up or stale cookies do not reach
+    Postgres on every request either.
+    """
+
+    def __init__(
+        self, redis: Redis, local_cache: LocalAnonymousUserCache, ttl_seconds: int, unknown_ttl_seconds: int
+    ) -> None:
+        self.redis = redis
+        self.local_cache = local_cache
+        self.ttl_seconds = ttl_seconds
+        self.unknown_ttl_seconds = unknown_ttl_seconds
+
+    async def get(self, cookie_id: uuid.UUID) -> CachedAnonymousUser | None:
+        if self.ttl_seconds <= 0:
+            return None
+        entry = self.local_cache.get(cookie_id)
+        if entry is not None:
+            return entry
+
+        cached = await self.redis.get(f"anonymous_user:{cookie_id}")
+        if not cached:
+            return None
+        entry = CachedAnonymousUser.model_validate_json(cached)
+        if entry.anonymous_user is None:
+            self.local_cache.set(cookie_id, entry)
+        return entry
+
+    async def set(self, cookie_id: uuid.UUID, anonymous_user: AnonymousUserRead | None) -> None:
+        ttl_seconds = self.ttl_seconds if anonymous_user is not None else self.unknown_ttl_seconds
+        if self.ttl_seconds <= 0 or ttl_seconds <= 0:
+            return
+        entry = CachedAnonymousUser(anonymous_user=anonymous_user)
+        await self.redis.set(f"anonymous_user:{cookie_id}", entry.model_dump_json(), ex=ttl_seconds)
+        if anonymous_user is None:
+            self.local_cache.set(cookie_id, entry)
+
+    async def invalidate(self, cookie_id: uuid.UUID) -> None:
+        self.local_cache.invalidate(cookie_id)
+        await self.redis.delete(f"anonymous_user:{cookie_id}")
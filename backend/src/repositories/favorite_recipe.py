@@ -66,3 +66,10 @@ class FavoriteRecipeRepository(FavoriteRecipeRepositoryProtocol):
         final_stmt = select(stmt)
         result = await self.session.scalar(final_stmt)
         return bool(result)
+
+    async def get_favorite_recipe_ids(self, user_id: int, recipe_ids: Sequence[int]) -> set[int]:
+        stmt = select(FavoriteRecipe.recipe_id).where(
+            FavoriteRecipe.user_id == user_id, FavoriteRecipe.recipe_id.in_(recipe_ids)
+        )
+        result = await self.session.scalars(stmt)
+        return set(result.all())
@@ -1,8 +1,10 @@
 from src.repositories.interfaces.anonymous_user import AnonymousUserRepositoryProtocol
+from src.repositories.interfaces.anonymous_user_cache import AnonymousUserCacheRepositoryProtocol
 from src.repositories.interfaces.banned_email import BannedEmailRepositoryProtocol
 from src.repositories.interfaces.consent import ConsentRepositoryProtocol
 from src.repositories.interfaces.disliked_recipe import DislikedRecipeRepositoryProtocol
 from src.repositories.interfaces.favorite_recipe import FavoriteRecipeRepositoryProtocol
+from src.repositories.interfaces.rate_limit import RateLimitRepositoryProtocol
 from src.repositories.interfaces.recipe import RecipeRepositoryProtocol
 from src.repositories.interfaces.recipe_image import RecipeImageRepositoryProtocol
 from src.repositories.interfaces.recipe_impression import RecipeImpressionRepositoryProtocol
@@ -12,19 +14,25 @@ from src.repositories.interfaces.recipe_report import RecipeReportRepositoryProt
 from src.repositories.interfaces.recipe_search import RecipeSearchRepositoryProtocol
 from src.repositories.interfaces.recipe_tag import RecipeTagRepositoryProtocol
 from src.repositories.interfaces.recsys import RecsysRepositoryProtocol
+from src.repositories.interfaces.search_cache import SearchCacheRepositoryProtocol
+from src.repositories.interfaces.search_history import SearchHistoryRepositoryProtocol
 from src.repositories.interfaces.search_query import SearchQueryRepositoryProtocol
+from src.repositories.interfaces.search_trends import SearchTrendsRepositoryProtocol
 from src.repositories.interfaces.shopping_list_item import ShoppingListItemRepositoryProtocol
 from src.repositories.interfaces.token import RefreshTokenRepositoryProtocol
 from src.repositories.interfaces.user import UserRepositoryProtocol
 from src.repositories.interfaces.user_avatar import UserAvatarRepositoryProtocol
 from src.repositories.interfaces.user_profile import UserProfileRepositoryProtocol
+from src.repositories.interfaces.user_snapshot import UserSnapshotRepositoryProtocol
 
 __all__ = [
+    "AnonymousUserCacheRepositoryProtocol",
     "AnonymousUserRepositoryProtocol",
     "BannedEmailRepositoryProtocol",
     "ConsentRepositoryProtocol",
     "DislikedRecipeRepositoryProtocol",
     "FavoriteRecipeRepositoryProtocol",
+    "RateLimitRepositoryProtocol",
     "RecipeImageRepositoryProtocol",
     "RecipeImpressionRepositoryProtocol",
     "RecipeIngredientRepositoryProtocol",
@@ -35,9 +43,13 @@ __all__ = [
     "RecipeTagRepositoryProtocol",
     "RecsysRepositoryProtocol",
     "RefreshTokenRepositoryProtocol",
+    "SearchCacheRepositoryProtocol",
+    "SearchHistoryRepositoryProtocol",
     "SearchQueryRepositoryProtocol",
+    "SearchTrendsRepositoryProtocol",
     "ShoppingListItemRepositoryProtocol",
     "UserAvatarRepositoryProtocol",
     "UserProfileRepositoryProtocol",
     "UserRepositoryProtocol",
+    "UserSnapshotRepositoryProtocol",
 ]
@@ -4,6 +4,8 @@ from typing import TYPE_CHECKING, Any, Protocol
 
 if TYPE_CHECKING:
     import uuid
+    from collections.abc import Sequence
+    from datetime import datetime
 
     from src.models.anonymous_user import AnonymousUser
 
@@ -17,6 +19,8 @@ class AnonymousUserRepositoryProtocol(Protocol):
 
     async def delete_by_id(self, anonymous_user_id: int) -> None: ...
 
+    async def delete_inactive(self, inactive_since: datetime, limit: int) -> Sequence[uuid.UUID]: ...
+
     async def exists(self, anonymous_user_id: int) -> bool: ...
 
     async def exists_by_cookie_id(self, cookie_id: uuid.UUID) -> bool: ...
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    import uuid
+
+    from src.schemas.anonymous_user import AnonymousUserRead, CachedAnonymousUser
+
+
+class AnonymousUserCacheRepositoryProtocol(Protocol):
+    async def get(self, cookie_id: uuid.UUID) -> CachedAnonymousUser | None: ...
+
+    async def set(self, cookie_id: uuid.UUID, anonymous_user: AnonymousUserRead | None) -> None: ...
+
+    async def invalidate(self, cookie_id: uuid.UUID) -> None: ...
@@ -19,3 +19,5 @@ class FavoriteRecipeRepositoryProtocol(Protocol):
     async def delete(self, user_id: int, recipe_id: int) -> None: ...
 
     async def exists(self, user_id: int, recipe_id: int) -> bool: ...
+
+    async def get_favorite_recipe_ids(self, user_id: int, recipe_ids: Sequence[int]) -> set[int]: ...
@@ -0,0 +1,5 @@
+from typing import Protocol
+
+
+class RateLimitRepositoryProtocol(Protocol):
+    async def hit(self, key: str, limit: int, window_seconds: int) -> float: ...
@@ -1,4 +1,5 @@
 from collections.abc import Sequence
+from datetime import datetime
 from typing import Any, Protocol
 
 from src.enums.recipe_sort_field import RecipeSortFieldEnum
@@ -9,7 +10,19 @@ from src.typings.recipe_with_favorite import RecipeWithExtra
 class RecipeRepositoryProtocol(Protocol):
     async def get_by_id(self, recipe_id: int, user_id: int | None = None) -> RecipeWithExtra | None: ...
 
-    async def get_by_ids(self, recipe_ids: Sequence[int]) -> Sequence[Recipe]: ...
+    async def get_by_ids(self, recipe_ids: Sequence[int]) -> Sequence[RecipeWithExtra]: ...
+
+    async def get_for_indexing(
+        self,
+        after_id: int = 0,
+        limit: int = 500,
+        *,
+        slices: int = 1,
+        slice_id: int = 0,
+        updated_since: datetime | None = None,
+    ) -> Sequence[RecipeWithExtra]: ...
+
+    async def count_published(self) -> int: ...
 
     async def get_all(
         self,
@@ -44,6 +57,8 @@ class RecipeRepositoryProtocol(Protocol):
 
     async def update(self, recipe_id: int, **fields: Any) -> Recipe | None: ...
 
+    async def set_image_widths(self, recipe_id: int, image_path: str, image_widths: list[int]) -> bool: ...
+
     async def delete_by_id(self, recipe_id: int) -> None: ...
 
     async def exists(self, recipe_id: int) -> bool: ...
@@ -1,9 +1,20 @@
+from collections.abc import Mapping, Sequence
 from typing import Any, Protocol
 
 
 class RecipeImageRepositoryProtocol(Protocol):
     async def get_image_url(self, image_path: str, expires_in: int = 3600) -> str: ...
 
+    async def get_image_urls(self, image_paths: Sequence[str | None], expires_in: int = 3600) -> list[str | None]: ...
+
+    async def download_image(self, image_path: str) -> bytes | None: ...
+
+    async def upload_image_derivatives(self, image_path: str, derivatives: Mapping[int, bytes]) -> None: ...
+
+    async def delete_images(self, recipe_id: int, image_paths: Sequence[str]) -> None: ...
+
+    async def enqueue_image_processing(self, recipe_id: int, image_path: str) -> bool: ...
+
     async def generate_recipe_image_upload_url(self, recipe_id: int) -> dict[str, Any]: ...
 
     async def generate_instruction_image_upload_urls(
@@ -2,13 +2,33 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Protocol
 
+from src.enums.index_refresh import IndexRefreshEnum
+
 if TYPE_CHECKING:
-    from src.schemas.recipe import RecipeSearchQuery
+    from collections.abc import Sequence
+
+    from src.schemas.recipe import RecipeSearchQuery, RecipeSearchResult
+    from src.schemas.search_indexing import RecipeIndexingMessage
+    from src.schemas.search_query import SearchSuggestions
 
 
 class RecipeSearchRepositoryProtocol(Protocol):
-    async def search_recipes(self, params: RecipeSearchQuery) -> tuple[int, list[int]]: ...
+    async def search_recipes(self, params: RecipeSearchQuery, *, with_facets: bool = False) -> RecipeSearchResult: ...
+
+    async def suggest(self, prefix: str, limit: int = 5) -> SearchSuggestions: ...
+
+    async def index_recipe(self, recipe_data: dict, refresh: IndexRefreshEnum = IndexRefreshEnum.NONE) -> None: ...
+
+    async def delete_recipe(self, recipe_id: int, refresh: IndexRefreshEnum = IndexRefreshEnum.NONE) -> None: ...
+
+    async def bulk_sync_recipes(
+        self, recipes_data: Sequence[dict], index: str | None = None, chunk_size: int = 500
+    ) -> int: ...
+
+    async def enqueue_index_recipe(self, recipe_data: dict) -> bool: ...
 
-    async def index_recipe(self, recipe_data: dict) -> None: ...
+    async def enqueue_delete_recipe(self, recipe_id: int) -> bool: ...
 
-    async def delete_recipe(self, recipe_id: int) -> None: ...
+    async def bulk_write(
+        self, messages: Sequence[RecipeIndexingMessage], max_retries: int = 3
+    ) -> list[RecipeIndexingMessage]: ...
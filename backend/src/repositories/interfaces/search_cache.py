@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from src.schemas.recipe import RecipeSearchPage, RecipeSearchQuery
+
+
+class SearchCacheRepositoryProtocol(Protocol):
+    async def build_key(self, params: RecipeSearchQuery, *, with_facets: bool = False) -> str: ...
+
+    async def get(self, key: str) -> RecipeSearchPage | None: ...
+
+    async def set(self, key: str, page: RecipeSearchPage) -> None: ...
+
+    async def invalidate(self) -> None: ...
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from datetime import datetime
+
+    from src.schemas.search_query import SearchHistoryEntry
+
+
+class SearchHistoryRepositoryProtocol(Protocol):
+    async def add(self, entry: SearchHistoryEntry) -> datetime: ...
+
+    async def get(
+        self, user_id: int | None, anonymous_user_id: int | None, limit: int = 10, offset: int = 0
+    ) -> list[SearchHistoryEntry] | None: ...
+
+    async def fill(
+        self, user_id: int | None, anonymous_user_id: int | None, entries: Sequence[SearchHistoryEntry]
+    ) -> None: ...
+
+    async def merge(self, anonymous_user_id: int, user_id: int) -> None: ...
+
+    async def pop_pending(self, count: int) -> list[SearchHistoryEntry]: ...
+
+    async def requeue(self, entries: Sequence[SearchHistoryEntry]) -> None: ...
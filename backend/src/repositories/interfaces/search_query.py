@@ -4,8 +4,10 @@ from typing import TYPE_CHECKING, Protocol
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
+    from datetime import datetime
 
     from src.models.search_query import SearchQuery
+    from src.schemas.search_query import SearchHistoryEntry
 
 
 class SearchQueryRepositoryProtocol(Protocol):
@@ -13,6 +15,8 @@ class SearchQueryRepositoryProtocol(Protocol):
         self, query_text: str, user_id: int | None, anonymous_user_id: int | None
     ) -> SearchQuery | None: ...
 
+    async def save_search_queries(self, entries: Sequence[SearchHistoryEntry]) -> None: ...
+
     async def get_user_search_history(
         self, user_id: int, limit: int = 10, offset: int = 0
     ) -> Sequence[SearchQuery]: ...
@@ -21,4 +25,6 @@ class SearchQueryRepositoryProtocol(Protocol):
         self, anonymous_user_id: int, limit: int = 10, offset: int = 0
     ) -> Sequence[SearchQuery]: ...
 
+    async def get_frequent_queries(self, since: datetime, limit: int) -> Sequence[str]: ...
+
     async def merge_search_queries(self, anonymous_user_id: int, user_id: int) -> None: ...
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from src.schemas.search_query import PopularSearchQuery
+
+
+class SearchTrendsRepositoryProtocol(Protocol):
+    async def increment(self, query: str, searched_at: datetime) -> None: ...
+
+    async def get_top(self, limit: int, prefix: str | None = None) -> list[PopularSearchQuery]: ...
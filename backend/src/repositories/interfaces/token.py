@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import Protocol
 
 from src.models.token import RefreshToken
+from src.schemas.token import CachedRefreshToken
 
 
 class RefreshTokenRepositoryProtocol(Protocol):
@@ -9,14 +10,14 @@ class RefreshTokenRepositoryProtocol(Protocol):
 
     async def create(self, user_id: int, token: str, expires_at: datetime) -> RefreshToken: ...
 
-    async def update(
-        self, refresh_token: RefreshToken, new_token: str | None = None, new_expires_at: datetime | None = None
-    ) -> None: ...
+    async def rotate(self, token: str, new_token: str, new_expires_at: datetime) -> bool: ...
 
-    async def deactivate(self, refresh_token: RefreshToken) -> None: ...
+    async def deactivate(self, token: str) -> None: ...
 
-    async def cache_refresh_token(self, token: str, expires_in: int) -> None: ...
+    async def delete_expired(self, limit: int) -> int: ...
 
-    async def get_cached_refresh_token(self, token: str) -> str | None: ...
+    async def cache_refresh_token(self, token: str, cached_token: CachedRefreshToken) -> None: ...
+
+    async def get_cached_refresh_token(self, token: str) -> CachedRefreshToken | None: ...
 
     async def delete_cached_refresh_token(self, token: str) -> None: ...
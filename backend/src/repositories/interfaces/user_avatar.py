@@ -1,4 +1,4 @@
-from typing import BinaryIO, Protocol
+from typing import Protocol
 
 
 class UserAvatarRepositoryProtocol(Protocol):
@@ -11,10 +11,14 @@ class UserAvatarRepositoryProtocol(Protocol):
     async def upload_avatar(
         self,
         user_id: int,
-        content: BinaryIO,
+        content: bytes,
         content_type: str,
-    ) -> str: ...
+    ) -> tuple[str, str | None]: ...
 
-    async def delete_avatar(self, user_id: int) -> None: ...
+    async def delete_avatar(self, user_id: int) -> str | None: ...
+
+    async def delete_avatar_file(self, file_name: str) -> None: ...
+
+    async def get_avatar_file_url(self, avatar_path: str) -> str: ...
 
     async def get_avatar_presigned_url(self, user_id: int) -> str | None: ...
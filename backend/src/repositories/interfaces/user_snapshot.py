@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from src.schemas.user import UserSnapshot
+
+
+class UserSnapshotRepositoryProtocol(Protocol):
+    async def get(self, user_id: int) -> UserSnapshot | None: ...
+
+    async def set(self, snapshot: UserSnapshot) -> None: ...
+
+    async def invalidate(self, user_id: int) -> None: ...
@@ -0,0 +1,82 @@
+import time
+from collections import OrderedDict
+
+from redis.asyncio import Redis
+
+from src.repositories.interfaces.rate_limit import RateLimitRepositoryProtocol
+
+# Sliding window counter: requests are counted per fixed window in a hash keyed by the window number, the previous
+# window counts in proportion to the part of it still inside the sliding window. Redis time is used, so all
+# processes share one clock. Returns "0" when the request is counted, otherwise seconds until it would be allowed.
+SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local now = redis.call('TIME')
+local now_seconds = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local current = math.floor(now_seconds / window)
+local elapsed = now_seconds - current * window
+local current_count = tonumber(redis.call('HGET', KEYS[1], current) or '0')
+local previous_count = tonumber(redis.call('HGET', KEYS[1], current - 1) or '0')
+
+if previous_count * (window - elapsed) / window + current_count + 1 > limit then
+    if current_count + 1 > limit or previous_count == 0 then
+        return tostring(window - elapsed)
+    end
+    return tostring((window - elapsed) - (limit - current_count - 1) * window / previous_count)
+end
+
+redis.call('HINCRBY', KEYS[1], current, 1)
+redis.call('HDEL', KEYS[1], current - 2)
+redis.call('EXPIRE', KEYS[1], window * 2)
+return '0'
+"""
+
+
+class LocalRateLimitBlocks:
+    """
+    In-process record of rate limited keys and the moments they are allowed again.
+
+    Requests of a blocked key are rejected without asking Redis, so abusive clients cost no round trips until their
+    block ends. The least recently blocked keys are evicted when the record grows over `max_size`.
+    """
+
+    def __init__(self, max_size: int = 10000) -> None:
+        self.max_size = max_size
+        self._blocked: OrderedDict[str, float] = OrderedDict()
+
+    def get_retry_after(self, key: str) -> float:
+        blocked_until = self._blocked.get(key)
+        if blocked_until is None:
+            return 0
+        retry_after = blocked_until - time.monotonic()
+        if retry_after <= 0:
+            del self._blocked[key]
+            return 0
+        return retry_after
+
+    def block(self, key: str, retry_after: float) -> None:
+        self._blocked[key] = time.monotonic() + retry_after
+        self._blocked.move_to_end(key)
+        while len(self._blocked) > self.max_size:
+            self._blocked.popitem(last=False)
+
+    def clear(self) -> None:
+        self._blocked.clear()
+
+
+class RateLimitRepository(RateLimitRepositoryProtocol):
+    def __init__(self, redis: Redis, local_blocks: LocalRateLimitBlocks) -> None:
+        self.redis = redis
+        self.local_blocks = local_blocks
+        self.sliding_window_script = redis.register_script(SLIDING_WINDOW_SCRIPT)
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> float:
+        """Count a request of the key, return 0 when it is allowed or the seconds to wait before retrying."""
+        retry_after = self.local_blocks.get_retry_after(key)
+        if retry_after:
+            return retry_after
+
+        retry_after = float(await self.sliding_window_script(keys=[f"rate_limit:{key}"], args=[limit, window_seconds]))
+        if retry_after:
+            self.local_blocks.block(key, retry_after)
+        return retry_after
@@ -1,4 +1,5 @@
 from collections.abc import Sequence
+from datetime import datetime
 from typing import Any
 
 from sqlalchemy import Select, delete, exists, func, literal_column, select, text, union_all, update
@@ -122,10 +123,53 @@ class RecipeRepository(RecipeRepositoryProtocol):
             return recipe
         return None
 
-    async def get_by_ids(self, recipe_ids: Sequence[int]) -> Sequence[Recipe]:
-        stmt = self._get_with_author_short().where(Recipe.id.in_(recipe_ids))  # TODO: add impressions and favorites
-        result = await self.session.scalars(stmt)
-        return result.all()
+    async def get_by_ids(self, recipe_ids: Sequence[int]) -> Sequence[RecipeWithExtra]:
+        stmt = self._get_with_author_short().where(Recipe.id.in_(recipe_ids))  # TODO: add favorites
+        stmt = self._add_impressions_subquery(stmt)
+        result = await self.session.execute(stmt)
+        recipes: list[RecipeWithExtra] = []
+        for recipe, impressions_count in result.all():
+            recipe.impressions_count = impressions_count
+            recipe.is_on_favorites = False
+            recipes.append(recipe)
+        return recipes
+
+    async def get_for_indexing(
+        self,
+        after_id: int = 0,
+        limit: int = 500,
+        *,
+        slices: int = 1,
+        slice_id: int = 0,
+        updated_since: datetime | None = None,
+    ) -> Sequence[RecipeWithExtra]:
+        """
+        Get recipes for search indexing, ordered by id.
+
+        Keyset pagination by `after_id` keeps every chunk query equally cheap. Recipes are split into
+        `slices` disjoint sets by id, so several workers can load them in parallel. Only published recipes
+        are returned, unless `updated_since` is given, in which case all recipes changed since that time
+        are returned for the caller to index or remove.
+        """
+        stmt = self._get_with_author_short().where(Recipe.id > after_id).order_by(Recipe.id).limit(limit)
+        if slices > 1:
+            stmt = stmt.where(Recipe.id % slices == slice_id)
+        if updated_since is None:
+            stmt = stmt.where(Recipe.is_published.is_(True))
+        else:
+            stmt = stmt.where(Recipe.updated_at >= updated_since)
+        stmt = self._add_impressions_subquery(stmt)
+
+        result = await self.session.execute(stmt)
+        recipes: list[RecipeWithExtra] = []
+        for recipe, impressions_count in result.all():
+            recipe.impressions_count = impressions_count
+            recipe.is_on_favorites = False
+            recipes.append(recipe)
+        return recipes
+
+    async def count_published(self) -> int:
+        return await self._get_count_with_filters(is_published=True)
 
     async def _get_recipes_with_filters(
         self,
@@ -252,6 +296,17 @@ class RecipeRepository(RecipeRepositoryProtocol):
         await self.session.flush()
         return await self.get_by_id(recipe_id=recipe_id)
 
+    async def set_image_widths(self, recipe_id: int, image_path: str, image_widths: list[int]) -> bool:
+        """Record widths of resized image copies, unless the recipe image has been removed meanwhile."""
+        stmt = (
+            update(Recipe)
+            .where(Recipe.id == recipe_id, Recipe.image_path == image_path)
+            .values(image_widths=image_widths)
+            .returning(Recipe.id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
     async def delete_by_id(self, recipe_id: int) -> None:
         stmt = delete(Recipe).where(Recipe.id == recipe_id)
         await self.session.execute(stmt)
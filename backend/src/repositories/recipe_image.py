@@ -1,19 +1,94 @@
+import asyncio
+import logging
+import secrets
+from collections.abc import Mapping, Sequence
 from typing import Any
 
-from src.adapters.storage import S3Storage
+from src.adapters.interfaces.image_processing import ImageProcessingAdapterProtocol
+from src.adapters.storage import IMMUTABLE_CACHE_CONTROL, S3Storage
 from src.repositories.interfaces.recipe_image import RecipeImageRepositoryProtocol
+from src.schemas.image_processing import RecipeImageProcessingMessage
+from src.utils.recipe_images import image_derivative_path, is_recipe_image_path
+
+logger = logging.getLogger(__name__)
+
+
+def _version() -> str:
+    # every upload gets a new key, so a key always points to the same content and can be cached forever
+    return secrets.token_hex(8)
 
 
 class RecipeImageRepository(RecipeImageRepositoryProtocol):
-    def __init__(self, s3_storage: S3Storage) -> None:
+    def __init__(self, s3_storage: S3Storage, processing_adapter: ImageProcessingAdapterProtocol) -> None:
         self.s3_storage = s3_storage
+        self.processing_adapter = processing_adapter
         self._bucket_name = "images"
 
     async def get_image_url(self, image_path: str, expires_in: int = 3600) -> str:
         return await self.s3_storage.get_file_url(self._bucket_name, image_path, expires_in=expires_in)
 
+    async def get_image_urls(self, image_paths: Sequence[str | None], expires_in: int = 3600) -> list[str | None]:
+        """URLs of images in the same order, `None` for missing images."""
+        paths = [image_path for image_path in image_paths if image_path]
+        urls = iter(await self.s3_storage.get_file_urls(self._bucket_name, paths, expires_in=expires_in))
+        return [next(urls) if image_path else None for image_path in image_paths]
+
+    async def download_image(self, image_path: str) -> bytes | None:
+        return await self.s3_storage.download_file(self._bucket_name, image_path)
+
+    async def upload_image_derivatives(self, image_path: str, derivatives: Mapping[int, bytes]) -> None:
+        """Store resized WebP copies of the image next to it."""
+        await asyncio.gather(
+            *(
+                self.s3_storage.upload_file(
+                    self._bucket_name,
+                    image_derivative_path(image_path, width),
+                    "image/webp",
+                    content,
+                    cache_control=IMMUTABLE_CACHE_CONTROL,
+                )
+                for width, content in derivatives.items()
+            )
+        )
+
+    async def delete_images(self, recipe_id: int, image_paths: Sequence[str]) -> None:
+        """
+        Delete images of the recipe, keys outside of its prefix are refused.
+
+        Meant to run after the change which stopped referencing the images is committed, so failures are only logged.
+        """
+        allowed_paths = []
+        for image_path in image_paths:
+            if is_recipe_image_path(image_path, recipe_id):
+                allowed_paths.append(image_path)
+            else:
+                logger.warning("Refused to delete image %r outside of recipe %s images", image_path, recipe_id)
+
+        results = await asyncio.gather(
+            *(self.s3_storage.delete_file(self._bucket_name, image_path) for image_path in allowed_paths),
+            return_exceptions=True,
+        )
+        for image_path, result in zip(allowed_paths, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning("Failed to delete recipe %s image %s: %s", recipe_id, image_path, result)
+
+    async def enqueue_image_processing(self, recipe_id: int, image_path: str) -> bool:
+        """
+        Put uploaded recipe image into the processing queue, which generates its resized copies.
+
+        Returns `False` when the queue is unavailable, the original image is served until the image is uploaded again.
+        """
+        try:
+            await self.processing_adapter.publish_recipe_image(
+                RecipeImageProcessingMessage(recipe_id=recipe_id, image_path=image_path)
+            )
+        except Exception:  # noqa: BLE001
+            logger.warning("Image processing queue is unavailable, recipe %s image is not resized", recipe_id)
+            return False
+        return True
+
     async def generate_recipe_image_upload_url(self, recipe_id: int) -> dict[str, Any]:
-        file_name = f"recipes/{recipe_id}/main.png"
+        file_name = f"recipes/{recipe_id}/main-{_version()}.png"
         return await self.s3_storage.generate_presigned_post(
             bucket_name=self._bucket_name,
             key=file_name,
@@ -22,28 +97,33 @@ class RecipeImageRepository(RecipeImageRepositoryProtocol):
                 ["starts-with", "$Content-Type", "image/"],
             ],
             expires_in=300,
+            cache_control=IMMUTABLE_CACHE_CONTROL,
         )
 
     async def get_instructions_image_url(self, image_path: str, expires_in: int = 3600) -> str:
         return await self.s3_storage.get_file_url(self._bucket_name, image_path, expires_in=expires_in)
 
     async def generate_instruction_image_upload_urls(self, recipe_id: int, steps: list[int]) -> list[dict[str, Any]]:
-        urls = [f"recipes/{recipe_id}/instructions/{step}/step.png" for step in steps]
-        presigned_urls = []
-
-        for index, url in enumerate(urls):
-            conditions = [
-                {"acl": "private"},
-                ["starts-with", "$Content-Type", "image/"],
-                ["starts-with", "$key", f"recipes/{recipe_id}/instructions"],
-            ]
-            presigned_url = await self.s3_storage.generate_presigned_post(
-                bucket_name=self._bucket_name,
-                key=url,
-                conditions=conditions,
-                expires_in=300,
+        conditions = [
+            {"acl": "private"},
+            ["starts-with", "$Content-Type", "image/"],
+            ["starts-with", "$key", f"recipes/{recipe_id}/instructions"],
+        ]
+        # policies of the steps differ only by key, so they are signed all at once
+        presigned_urls = await asyncio.gather(
+            *(
+                self.s3_storage.generate_presigned_post(
+                    bucket_name=self._bucket_name,
+                    key=f"recipes/{recipe_id}/instructions/{step}/step-{_version()}.png",
+                    # the client appends the bucket and key to the conditions, so every step gets its own copy
+                    conditions=list(conditions),
+                    expires_in=300,
+                    cache_control=IMMUTABLE_CACHE_CONTROL,
+                )
+                for step in steps
             )
-            presigned_url["step_number"] = steps[index]
-            presigned_urls.append(presigned_url)
+        )
 
-        return presigned_urls
+        for step, presigned_url in zip(steps, presigned_urls, strict=True):
+            presigned_url["step_number"] = step
+        return list(presigned_urls)
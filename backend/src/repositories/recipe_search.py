@@ -1,26 +1,166 @@
+import base64
+import json
 import logging
+import time
+from collections.abc import Sequence
+from http import HTTPStatus
+from typing import Any, cast
 
-from elasticsearch import AsyncElasticsearch
-from elasticsearch.dsl import Q
+from elasticsearch import AsyncElasticsearch, BadRequestError, NotFoundError, helpers
+from elasticsearch.dsl import AsyncSearch, Q
+from elasticsearch.dsl.response import AggResponse
 
-from src.adapters.search.indexes import RecipeIndex
+from src.adapters.interfaces.search_indexing import SearchIndexingAdapterProtocol
+from src.adapters.search.indexes import RECIPE_ALIAS, RecipeIndex
+from src.enums.index_refresh import IndexRefreshEnum
+from src.enums.search_indexing_action import SearchIndexingActionEnum
+from src.exceptions.recipe_search import InvalidSearchCursorError, SearchCursorExpiredError
 from src.repositories.interfaces.recipe_search import RecipeSearchRepositoryProtocol
-from src.schemas.recipe import RecipeSearchQuery
+from src.schemas.recipe import (
+    CookTimeFacetBucket,
+    FacetBucket,
+    RecipeSearchFacets,
+    RecipeSearchQuery,
+    RecipeSearchResult,
+)
+from src.schemas.search_indexing import RecipeIndexingMessage
+from src.schemas.search_query import RecipeSuggestion, SearchSuggestions
 
 logger = logging.getLogger(__name__)
 
+# Fields required to build `RecipeReadShort` straight from the search engine response
+RECIPE_SHORT_SOURCE_FIELDS = [
+    "id",
+    "slug",
+    "title",
+    "short_description",
+    "difficulty",
+    "cook_time_minutes",
+    "image_path",
+    "impressions_count",
+]
+
+
+RECIPE_SUGGEST_FIELDS = ["title.suggest", "title.suggest._2gram", "title.suggest._3gram"]
+
+TAGS_FACET_SIZE = 20
+# inclusive bounds, the same as cook_time_from and cook_time_to search parameters
+COOK_TIME_FACET_RANGES: list[tuple[int | None, int | None]] = [(None, 15), (16, 30), (31, 60), (61, None)]
+
+
+# Every write carries an external version, so out of order queued writes can not overwrite a newer document
+EXTERNAL_VERSION_TYPE = "external_gte"
+
+
+def _next_document_version() -> int:
+    """
+    Return the wall clock time in microseconds of the process that builds the write.
+
+    Versions from different hosts are only comparable while their clocks are synchronized: a write built on a host
+    lagging behind by more than the time between two writes of the same recipe is dropped as a version conflict.
+    `Recipe.updated_at` would not help, it is set by the same application clock, and deletes have no row to take it
+    from.
+    """
+    return time.time_ns() // 1000
+
+
+def _build_recipe_document(recipe_data: dict) -> dict[str, Any]:
+    document = recipe_data.copy()
+    document["tags"] = [tag["name"] for tag in document.get("tags", [])]
+    document["ingredients"] = [ingredient["name"] for ingredient in document.get("ingredients", [])]
+    document["tags_suggest"] = document["tags"] if document.get("is_published") else []
+    return document
+
+
+def _encode_cursor(pit_id: str, search_after: list[Any]) -> str:
+    payload = json.dumps({"pit_id": pit_id, "search_after": search_after}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[str, list[Any]]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        pit_id, search_after = payload["pit_id"], payload["search_after"]
+    except (ValueError, KeyError, TypeError):
+        msg = "Search cursor is malformed"
+        raise InvalidSearchCursorError(msg) from None
+    if not isinstance(pit_id, str) or not isinstance(search_after, list):
+        msg = "Search cursor is malformed"
+        raise InvalidSearchCursorError(msg)
+    return pit_id, search_after
+
+
+def _cook_time_facet_key(cook_time_from: int | None, cook_time_to: int | None) -> str:
+    if cook_time_to is None:
+        return f"{cook_time_from}+"
+    return f"{cook_time_from or 0}-{cook_time_to}"
+
+
+def _add_facet_aggregations(search: AsyncSearch) -> AsyncSearch:
+    cook_time_ranges = []
+    for cook_time_from, cook_time_to in COOK_TIME_FACET_RANGES:
+        cook_time_range: dict[str, Any] = {"key": _cook_time_facet_key(cook_time_from, cook_time_to)}
+        if cook_time_from is not None:
+            cook_time_range["from"] = cook_time_from
+        if cook_time_to is not None:
+            # range aggregation excludes the upper bound
+            cook_time_range["to"] = cook_time_to + 1
+        cook_time_ranges.append(cook_time_range)
+
+    search.aggs.bucket("tags", "terms", field="tags.raw", size=TAGS_FACET_SIZE)
+    search.aggs.bucket("difficulty", "terms", field="difficulty")
+    search.aggs.bucket("cook_time", "range", field="cook_time_minutes", ranges=cook_time_ranges)
+    return search
+
+
+def _parse_facets(aggregations: AggResponse) -> RecipeSearchFacets:
+    cook_time_counts = {bucket.key: bucket.doc_count for bucket in aggregations.cook_time.buckets}
+    cook_time = []
+    for cook_time_from, cook_time_to in COOK_TIME_FACET_RANGES:
+        key = _cook_time_facet_key(cook_time_from, cook_time_to)
+        cook_time.append(
+            CookTimeFacetBucket(
+                key=key,
+                count=cook_time_counts.get(key, 0),
+                cook_time_from=cook_time_from,
+                cook_time_to=cook_time_to,
+            )
+        )
+
+    return RecipeSearchFacets(
+        tags=[FacetBucket(key=bucket.key, count=bucket.doc_count) for bucket in aggregations.tags.buckets],
+        difficulty=[FacetBucket(key=bucket.key, count=bucket.doc_count) for bucket in aggregations.difficulty.buckets],
+        cook_time=cook_time,
+    )
+
 
 class RecipeSearchRepository(RecipeSearchRepositoryProtocol):
-    def __init__(self, es_client: AsyncElasticsearch) -> None:
+    def __init__(
+        self,
+        es_client: AsyncElasticsearch,
+        indexing_adapter: SearchIndexingAdapterProtocol,
+        *,
+        track_total_hits: int = 10000,
+        pit_keep_alive: str = "1m",
+    ) -> None:
         self.es_client = es_client
+        self.indexing_adapter = indexing_adapter
+        self.track_total_hits = track_total_hits
+        self.pit_keep_alive = pit_keep_alive
+
+    async def search_recipes(self, params: RecipeSearchQuery, *, with_facets: bool = False) -> RecipeSearchResult:
+        """
+        Search published recipes.
 
-    async def search_recipes(self, params: RecipeSearchQuery) -> tuple[int, list[int]]:
-        search = RecipeIndex.search()
+        Hits are counted exactly up to `track_total_hits`, above it the total is a lower bound. Offset pagination is
+        limited by `index.max_result_window`, cursor mode pages through a point in time with `search_after` instead.
+        With `with_facets` tag, difficulty and cook time counts are aggregated in the same request.
+        """
+        search = RecipeIndex.search().source(RECIPE_SHORT_SOURCE_FIELDS)
 
         must_queries = []
         must_not_queries = []
-        filter_queries = []
-        must_queries.append(Q("term", is_published=True))
+        filter_queries = [Q("term", is_published=True)]
         if params.query:
             text_query = Q("multi_match", query=params.query, fields=["title", "short_description"])
             must_queries.append(text_query)
@@ -28,16 +168,26 @@ class RecipeSearchRepository(RecipeSearchRepositoryProtocol):
                 "Text search query: '%s' - using multi_match on fields: ['title', 'short_description']", params.query
             )
 
+        # tags and ingredients are set filters: they are matched in the filter context without scoring,
+        # ingredient names are reduced to a single canonical token (stem and synonyms) on both sides
         if params.tags:
-            filter_queries.append(Q("terms", tags=params.tags))
+            filter_queries.append(Q("terms", **{"tags.exact": params.tags}))
 
         if params.include_ingredients:
-            include_ingredients_list = [Q("match", ingredients=ingredient) for ingredient in params.include_ingredients]
-            must_queries.extend(include_ingredients_list)
+            include_ingredients_list = [
+                Q("match", **{"ingredients.canonical": ingredient}) for ingredient in params.include_ingredients
+            ]
+            if params.include_ingredients_min_match is None:
+                filter_queries.extend(include_ingredients_list)
+            else:
+                min_match = min(params.include_ingredients_min_match, len(include_ingredients_list))
+                filter_queries.append(Q("bool", should=include_ingredients_list, minimum_should_match=min_match))
             logger.info("Include ingredients: %s", params.include_ingredients)
 
         if params.exclude_ingredients:
-            exclude_ingredients_list = [Q("match", ingredients=ingredient) for ingredient in params.exclude_ingredients]
+            exclude_ingredients_list = [
+                Q("match", **{"ingredients.canonical": ingredient}) for ingredient in params.exclude_ingredients
+            ]
             must_not_queries.extend(exclude_ingredients_list)
 
         if params.cook_time_from is not None or params.cook_time_to is not None:
@@ -50,27 +200,223 @@ class RecipeSearchRepository(RecipeSearchRepositoryProtocol):
 
         query = Q("bool", must=must_queries, must_not=must_not_queries, filter=filter_queries)
 
-        search = search.query(query).extra(from_=params.offset, size=params.limit, track_total_hits=True)
+        search = search.query(query)
+        if params.is_cursor_mode:
+            return await self._search_with_cursor(search, params, with_facets=with_facets)
+
+        search = search.extra(from_=params.offset, size=params.limit, track_total_hits=self.track_total_hits)
 
         if params.sort_by:
             search = search.sort(params.sort_by)
+        if with_facets:
+            search = _add_facet_aggregations(search)
 
         result = await search.execute()
         total = result.hits.total.value  # type: ignore[attr-defined]
-        recipe_ids = [hit.to_dict()["id"] for hit in result]
+        documents = [hit.to_dict(skip_empty=False) for hit in result]
+        facets = _parse_facets(result.aggregations) if with_facets else None
+
+        return RecipeSearchResult(total=total, documents=documents, facets=facets)
+
+    async def _search_with_cursor(
+        self, search: AsyncSearch, params: RecipeSearchQuery, *, with_facets: bool
+    ) -> RecipeSearchResult:
+        """
+        Fetch a page of a point in time, so pages stay consistent while recipes are being indexed.
+
+        The total and facets are computed only on the first page, the client already knows them on the following ones.
+        """
+        if params.cursor is not None:
+            pit_id, search_after = _decode_cursor(params.cursor)
+            track_total_hits: int | bool = False
+        else:
+            pit = await self.es_client.open_point_in_time(index=RECIPE_ALIAS, keep_alive=self.pit_keep_alive)
+            pit_id, search_after = pit["id"], []
+            track_total_hits = self.track_total_hits
+            if with_facets:
+                search = _add_facet_aggregations(search)
+
+        # requests to a point in time must not name an index, id is the tiebreaker for equal sort values
+        search = (
+            search.index()
+            .sort(params.sort_by or "_score", "id")
+            .extra(size=params.limit, track_total_hits=track_total_hits)
+            .extra(pit={"id": pit_id, "keep_alive": self.pit_keep_alive})
+        )
+        if search_after:
+            search = search.extra(search_after=search_after)
+
+        try:
+            result = await search.execute()
+        except NotFoundError:
+            msg = "Search cursor has expired, start the search again"
+            raise SearchCursorExpiredError(msg) from None
+        except BadRequestError:
+            if params.cursor is None:
+                raise
+            msg = "Search cursor is malformed"
+            raise InvalidSearchCursorError(msg) from None
+
+        hits = list(result)
+        documents = [hit.to_dict(skip_empty=False) for hit in hits]
+        total = result.hits.total.value if track_total_hits else None  # type: ignore[attr-defined]
+        facets = _parse_facets(result.aggregations) if with_facets and params.cursor is None else None
+        # point in time id may change between requests, the latest one must be used
+        pit_id = getattr(result, "pit_id", pit_id)
+
+        if not hits or len(hits) < params.limit:
+            await self.es_client.close_point_in_time(id=pit_id)
+            return RecipeSearchResult(total=total, documents=documents, facets=facets)
+
+        next_cursor = _encode_cursor(pit_id, list(hits[-1].meta.sort))
+        return RecipeSearchResult(total=total, documents=documents, next_cursor=next_cursor, facets=facets)
+
+    async def suggest(self, prefix: str, limit: int = 5) -> SearchSuggestions:
+        """
+        Suggest published recipe titles and tags for a partially typed query in a single request.
+
+        Titles are matched by prefixes of their words, tags with the completion suggester.
+        """
+        search = (
+            RecipeIndex.search()
+            .source(["id", "slug", "title"])
+            .query(
+                Q(
+                    "bool",
+                    must=[Q("multi_match", query=prefix, type="bool_prefix", fields=RECIPE_SUGGEST_FIELDS)],
+                    filter=[Q("term", is_published=True)],
+                )
+            )
+            .extra(size=limit, track_total_hits=False)
+            .suggest("tags", prefix, completion={"field": "tags_suggest", "size": limit, "skip_duplicates": True})
+        )
+        result = await search.execute()
+
+        return SearchSuggestions(
+            recipes=[RecipeSuggestion.model_validate(hit.to_dict()) for hit in result],
+            tags=[option.text for option in result.suggest.tags[0].options],  # type: ignore[attr-defined]
+        )
+
+    async def index_recipe(self, recipe_data: dict, refresh: IndexRefreshEnum = IndexRefreshEnum.NONE) -> None:
+        """
+        Index recipe document.
+
+        By default the document becomes searchable after the next scheduled index refresh. Pass
+        `IndexRefreshEnum.WAIT_FOR` only when the caller must be able to read its own write right away.
+        """
+        document = _build_recipe_document(recipe_data)
+        recipe_index = RecipeIndex(meta={"id": document["id"]}, **document)
+        await recipe_index.save(
+            refresh=refresh.value, version=_next_document_version(), version_type=EXTERNAL_VERSION_TYPE
+        )
+
+    async def delete_recipe(self, recipe_id: int, refresh: IndexRefreshEnum = IndexRefreshEnum.NONE) -> None:
+        await self.es_client.options(ignore_status=HTTPStatus.NOT_FOUND).delete(
+            index=RECIPE_ALIAS,
+            id=str(recipe_id),
+            refresh=refresh.value,
+            version=_next_document_version(),
+            version_type=EXTERNAL_VERSION_TYPE,
+        )
+
+    async def bulk_sync_recipes(
+        self, recipes_data: Sequence[dict], index: str | None = None, chunk_size: int = 500
+    ) -> int:
+        """
+        Index published recipes and remove unpublished ones with the bulk API.
+
+        Writes to `index` instead of the alias when given, which is used to build a new index from the
+        database. Raises `BulkIndexError` if any write fails, returns number of applied operations.
+        """
+        version = _next_document_version()
+        actions = []
+        for recipe_data in recipes_data:
+            if recipe_data["is_published"]:
+                document = _build_recipe_document(recipe_data)
+                action = RecipeIndex(meta={"id": document["id"]}, **document).to_dict(include_meta=True)
+                action["_op_type"] = SearchIndexingActionEnum.INDEX.value
+            else:
+                action = {"_op_type": SearchIndexingActionEnum.DELETE.value, "_id": recipe_data["id"]}
+            action["_index"] = index or RECIPE_ALIAS
+            action["_version"] = version
+            action["_version_type"] = EXTERNAL_VERSION_TYPE
+            actions.append(action)
+
+        success, _ = await helpers.async_bulk(
+            self.es_client,
+            actions,
+            chunk_size=chunk_size,
+            ignore_status=(HTTPStatus.NOT_FOUND, HTTPStatus.CONFLICT),
+        )
+        return success
+
+    async def enqueue_index_recipe(self, recipe_data: dict) -> bool:
+        """
+        Put recipe document into the indexing queue.
+
+        Returns `False` when the queue is unavailable, so the caller can fall back to a direct write.
+        """
+        message = RecipeIndexingMessage(
+            action=SearchIndexingActionEnum.INDEX,
+            recipe_id=recipe_data["id"],
+            version=_next_document_version(),
+            document=_build_recipe_document(recipe_data),
+        )
+        return await self._enqueue(message)
+
+    async def enqueue_delete_recipe(self, recipe_id: int) -> bool:
+        message = RecipeIndexingMessage(
+            action=SearchIndexingActionEnum.DELETE, recipe_id=recipe_id, version=_next_document_version()
+        )
+        return await self._enqueue(message)
+
+    async def _enqueue(self, message: RecipeIndexingMessage) -> bool:
+        try:
+            await self.indexing_adapter.publish_recipe_operation(message)
+        except Exception:  # noqa: BLE001
+            logger.warning("Search indexing queue is unavailable, recipe %s is written directly", message.recipe_id)
+            return False
+        return True
+
+    async def bulk_write(
+        self, messages: Sequence[RecipeIndexingMessage], max_retries: int = 3
+    ) -> list[RecipeIndexingMessage]:
+        """
+        Apply queued index and delete operations with the bulk API.
 
-        return total, recipe_ids
+        Returns operations that could not be applied. Version conflicts mean a newer write of the same
+        recipe is already in the index, and deletes of missing documents are no-ops, so neither is a failure.
+        """
+        latest: dict[int, RecipeIndexingMessage] = {}
+        for message in messages:
+            current = latest.get(message.recipe_id)
+            if current is None or message.version >= current.version:
+                latest[message.recipe_id] = message
 
-    async def index_recipe(self, recipe_data: dict) -> None:
-        schema = recipe_data.copy()
-        schema["_id"] = schema["id"]
-        schema["tags"] = [tag["name"] for tag in schema.get("tags", [])]
-        schema["ingredients"] = [ingredient["name"] for ingredient in schema.get("ingredients", [])]
-        recipe_index = RecipeIndex(**schema)
-        await recipe_index.save()
+        actions = [self._to_bulk_action(message) for message in latest.values()]
+        _, errors = await helpers.async_bulk(
+            self.es_client, actions, max_retries=max_retries, raise_on_error=False, stats_only=False
+        )
 
-        await self.es_client.indices.refresh(index="recipes")
+        failed = []
+        for error in cast("list[dict[str, Any]]", errors):
+            action, item = next(iter(error.items()))
+            status = item.get("status")
+            if status == HTTPStatus.CONFLICT or (
+                action == SearchIndexingActionEnum.DELETE and status == HTTPStatus.NOT_FOUND
+            ):
+                continue
+            logger.error("Failed to %s recipe %s in search index: %s", action, item.get("_id"), item.get("error"))
+            failed.append(latest[int(item["_id"])])
+        return failed
 
-    async def delete_recipe(self, recipe_id: int) -> None:
-        search = RecipeIndex.search()
-        await search.query(Q("term", id=recipe_id)).delete()
+    def _to_bulk_action(self, message: RecipeIndexingMessage) -> dict[str, Any]:
+        if message.action == SearchIndexingActionEnum.DELETE:
+            action: dict[str, Any] = {"_index": RECIPE_ALIAS, "_id": str(message.recipe_id)}
+        else:
+            recipe_index = RecipeIndex(meta={"id": message.recipe_id}, **(message.document or {}))
+            action = recipe_index.to_dict(include_meta=True)
+        action["_op_type"] = message.action.value
+        action["_version"] = message.version
+        action["_version_type"] = EXTERNAL_VERSION_TYPE
+        return action
@@ -0,0 +1,61 @@
+import hashlib
+import json
+
+from redis.asyncio import Redis
+
+from src.repositories.interfaces.search_cache import SearchCacheRepositoryProtocol
+from src.schemas.recipe import RecipeSearchPage, RecipeSearchQuery
+
+GENERATION_KEY = "search_cache:generation"
+
+
+def normalize_search_query(params: RecipeSearchQuery, *, with_facets: bool = False) -> str:
+    """
+    Build a canonical representation of search parameters.
+
+    Free text, tags and ingredients are all matched case-insensitively.
+    """
+    query = " ".join(params.query.lower().split()) if params.query else None
+    normalized = params.model_dump()
+    normalized.update(
+        query=query or None,
+        offset=params.offset or 0,
+        tags=sorted({tag.lower() for tag in params.tags or []}),
+        include_ingredients=sorted({ingredient.lower() for ingredient in params.include_ingredients or []}),
+        exclude_ingredients=sorted({ingredient.lower() for ingredient in params.exclude_ingredients or []}),
+        with_facets=with_facets,
+    )
+    return json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+
+
+class SearchCacheRepository(SearchCacheRepositoryProtocol):
+    """
+    Cache of search result pages: total, ordered recipe ids and facets if they were requested.
+
+    Keys include a generation counter, so bumping it invalidates all cached pages at once without scanning keys,
+    stale pages just expire.
+    """
+
+    def __init__(self, redis: Redis, ttl_seconds: int) -> None:
+        self.redis = redis
+        self.ttl_seconds = ttl_seconds
+
+    async def build_key(self, params: RecipeSearchQuery, *, with_facets: bool = False) -> str:
+        # read the generation once per request, so a page found before an invalidation is never stored after it
+        generation = await self.redis.get(GENERATION_KEY) or "0"
+        digest = hashlib.sha256(normalize_search_query(params, with_facets=with_facets).encode()).hexdigest()
+        return f"search_cache:{generation}:{digest}"
+
+    async def get(self, key: str) -> RecipeSearchPage | None:
+        if self.ttl_seconds <= 0:
+            return None
+        cached = await self.redis.get(key)
+        return RecipeSearchPage.model_validate_json(cached) if cached else None
+
+    async def set(self, key: str, page: RecipeSearchPage) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        await self.redis.set(key, page.model_dump_json(), ex=self.ttl_seconds)
+
+    async def invalidate(self) -> None:
+        await self.redis.incr(GENERATION_KEY)
@@ -0,0 +1,134 @@
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from src.repositories.interfaces.search_history import SearchHistoryRepositoryProtocol
+from src.schemas.search_query import SearchHistoryEntry
+
+PENDING_KEY = "search_history:pending"
+
+
+def _history_key(user_id: int | None, anonymous_user_id: int | None) -> str:
+    if user_id:
+        return f"search_history:user:{user_id}"
+    return f"search_history:anonymous:{anonymous_user_id}"
+
+
+def _first_searched_key(history_key: str) -> str:
+    return f"{history_key}:first"
+
+
+class SearchHistoryRepository(SearchHistoryRepositoryProtocol):
+    """
+    Recent search queries in capped per user sorted sets scored by the time of the last search.
+
+    A companion set keeps the time of the first search of every query in the history, it is trimmed by intersecting
+    with the history. Every added query is also put into a pending list, which a background job persists to the
+    database in batches.
+    """
+
+    def __init__(self, redis: Redis, max_size: int, ttl_seconds: int) -> None:
+        self.redis = redis
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+    def _trim(self, pipe: Pipeline, key: str) -> None:
+        first_searched_key = _first_searched_key(key)
+        pipe.zremrangebyrank(key, 0, -self.max_size - 1)
+        # weights keep the first search times, queries trimmed from the history are dropped
+        pipe.zinterstore(first_searched_key, {first_searched_key: 1, key: 0})
+        pipe.expire(key, self.ttl_seconds)
+        pipe.expire(first_searched_key, self.ttl_seconds)
+
+    async def add(self, entry: SearchHistoryEntry) -> datetime:
+        """Add the query to the history, return the time it was searched first."""
+        key = _history_key(entry.user_id, entry.anonymous_user_id)
+        first_searched_key = _first_searched_key(key)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(key, {entry.query: entry.searched_at.timestamp()})
+            pipe.zadd(first_searched_key, {entry.query: entry.searched_at.timestamp()}, nx=True)
+            self._trim(pipe, key)
+            pipe.zscore(first_searched_key, entry.query)
+            pipe.rpush(PENDING_KEY, entry.model_dump_json(exclude={"first_searched_at"}))
+            results = await pipe.execute()
+        first_searched_score = results[-2]
+        return datetime.fromtimestamp(first_searched_score, UTC) if first_searched_score else entry.searched_at
+
+    async def get(
+        self, user_id: int | None, anonymous_user_id: int | None, limit: int = 10, offset: int = 0
+    ) -> list[SearchHistoryEntry] | None:
+        """Return queries starting from the latest one or `None` if the history is not loaded into Redis."""
+        key = _history_key(user_id, anonymous_user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.exists(key)
+            pipe.zrevrange(key, offset, offset + limit - 1, withscores=True)
+            exists, queries = await pipe.execute()
+
+        if not exists:
+            return None
+        first_searched_scores = (
+            await self.redis.zmscore(_first_searched_key(key), [query for query, _ in queries]) if queries else []
+        )
+        return [
+            SearchHistoryEntry(
+                query=query,
+                user_id=user_id,
+                anonymous_user_id=anonymous_user_id,
+                searched_at=datetime.fromtimestamp(score, UTC),
+                first_searched_at=datetime.fromtimestamp(first_searched_score or score, UTC),
+            )
+            for (query, score), first_searched_score in zip(queries, first_searched_scores, strict=True)
+        ]
+
+    async def fill(
+        self, user_id: int | None, anonymous_user_id: int | None, entries: Sequence[SearchHistoryEntry]
+    ) -> None:
+        """Load history persisted in the database without queueing it for persisting again."""
+        if not entries:
+            return
+        key = _history_key(user_id, anonymous_user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            # queries added while the history was being read from the database are newer, so they are kept
+            pipe.zadd(key, {entry.query: entry.searched_at.timestamp() for entry in entries}, nx=True)
+            # while their first search times are older
+            pipe.zadd(
+                _first_searched_key(key),
+                {entry.query: (entry.first_searched_at or entry.searched_at).timestamp() for entry in entries},
+                lt=True,
+            )
+            self._trim(pipe, key)
+            await pipe.execute()
+
+    async def merge(self, anonymous_user_id: int, user_id: int) -> None:
+        """
+        Move anonymous history to the user.
+
+        If the user history is not loaded yet, the anonymous one is dropped: it will be loaded from the database,
+        where queries are merged as well.
+        """
+        anonymous_key = _history_key(None, anonymous_user_id)
+        user_key = _history_key(user_id, None)
+        anonymous_first_searched_key = _first_searched_key(anonymous_key)
+        user_first_searched_key = _first_searched_key(user_key)
+        if await self.redis.exists(user_key):
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.zunionstore(user_key, [user_key, anonymous_key], aggregate="MAX")
+                pipe.zunionstore(
+                    user_first_searched_key, [user_first_searched_key, anonymous_first_searched_key], aggregate="MIN"
+                )
+                self._trim(pipe, user_key)
+                pipe.delete(anonymous_key, anonymous_first_searched_key)
+                await pipe.execute()
+        else:
+            await self.redis.delete(anonymous_key, anonymous_first_searched_key)
+
+    async def pop_pending(self, count: int) -> list[SearchHistoryEntry]:
+        entries = await self.redis.lpop(PENDING_KEY, count)
+        return [SearchHistoryEntry.model_validate_json(entry) for entry in entries or []]
+
+    async def requeue(self, entries: Sequence[SearchHistoryEntry]) -> None:
+        """Return entries which failed to persist to the head of the pending list."""
+        if entries:
+            await self.redis.lpush(PENDING_KEY, *(entry.model_dump_json() for entry in reversed(entries)))
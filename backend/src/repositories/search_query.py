@@ -1,4 +1,5 @@
 from collections.abc import Sequence
+from datetime import datetime
 
 from sqlalchemy import delete, desc, func, select, update
 from sqlalchemy.dialects.postgresql import insert
@@ -6,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.search_query import SearchQuery
 from src.repositories.interfaces.search_query import SearchQueryRepositoryProtocol
+from src.schemas.search_query import SearchHistoryEntry
 
 
 class SearchQueryRepository(SearchQueryRepositoryProtocol):
@@ -37,11 +39,48 @@ class SearchQueryRepository(SearchQueryRepositoryProtocol):
         await self.session.flush()
         return result.first()
 
+    async def save_search_queries(self, entries: Sequence[SearchHistoryEntry]) -> None:
+        """Upsert queued search queries in bulk, keeping the times of the first and the latest search of every query."""
+        latest: dict[tuple[int | None, int | None, str], SearchHistoryEntry] = {}
+        first_searched: dict[tuple[int | None, int | None, str], datetime] = {}
+        for entry in entries:
+            key = (entry.user_id, entry.anonymous_user_id, entry.query)
+            if key not in latest or entry.searched_at > latest[key].searched_at:
+                latest[key] = entry
+            if key not in first_searched or entry.searched_at < first_searched[key]:
+                first_searched[key] = entry.searched_at
+
+        user_rows = []
+        anonymous_rows = []
+        for key, entry in latest.items():
+            row = {
+                "query": entry.query,
+                "user_id": entry.user_id,
+                "anonymous_user_id": None if entry.user_id else entry.anonymous_user_id,
+                "created_at": first_searched[key],
+                "updated_at": entry.searched_at,
+            }
+            (user_rows if entry.user_id else anonymous_rows).append(row)
+
+        for rows, index_elements in (
+            (user_rows, [SearchQuery.user_id, SearchQuery.query]),
+            (anonymous_rows, [SearchQuery.anonymous_user_id, SearchQuery.query]),
+        ):
+            if not rows:
+                continue
+            stmt = insert(SearchQuery).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={SearchQuery.updated_at: func.greatest(SearchQuery.updated_at, stmt.excluded.updated_at)},
+            )
+            await self.session.execute(stmt)
+        await self.session.flush()
+
     async def get_user_search_history(self, user_id: int, limit: int = 10, offset: int = 0) -> Sequence[SearchQuery]:
         stmt = (
             select(SearchQuery)
             .where(SearchQuery.user_id == user_id)
-            .order_by(desc(SearchQuery.created_at))
+            .order_by(desc(SearchQuery.updated_at))
             .limit(limit)
             .offset(offset)
         )
@@ -54,13 +93,26 @@ class SearchQueryRepository(SearchQueryRepositoryProtocol):
         stmt = (
             select(SearchQuery)
             .where(SearchQuery.anonymous_user_id == anonymous_user_id)
-            .order_by(desc(SearchQuery.created_at))
+            .order_by(desc(SearchQuery.updated_at))
             .limit(limit)
             .offset(offset)
         )
         result = await self.session.scalars(stmt)
         return result.all()
 
+    async def get_frequent_queries(self, since: datetime, limit: int) -> Sequence[str]:
+        """Most often searched queries since the moment, each user counts once per query, recent ones first on ties."""
+        lower_query = func.lower(SearchQuery.query)
+        stmt = (
+            select(lower_query)
+            .where(SearchQuery.updated_at >= since)
+            .group_by(lower_query)
+            .order_by(desc(func.count()), desc(func.max(SearchQuery.updated_at)))
+            .limit(limit)
+        )
+        result = await self.session.scalars(stmt)
+        return result.all()
+
     async def merge_search_queries(self, anonymous_user_id: int, user_id: int) -> None:
         user_searched_queries_subq = select(SearchQuery.query).where(SearchQuery.user_id == user_id).scalar_subquery()
         unique_update_stmt = (
@@ -0,0 +1,62 @@
+from datetime import UTC, datetime
+
+from redis.asyncio import Redis
+
+from src.repositories.interfaces.search_trends import SearchTrendsRepositoryProtocol
+from src.schemas.search_query import PopularSearchQuery
+
+BUCKET_KEY_PREFIX = "search_trends:bucket"
+TOP_KEY = "search_trends:top"
+# popular queries matching an autocomplete prefix are picked from this many top queries
+PREFIX_POOL_SIZE = 500
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _hour(moment: datetime) -> int:
+    return int(moment.timestamp()) // 3600
+
+
+class SearchTrendsRepository(SearchTrendsRepositoryProtocol):
+    """
+    Search query frequencies over a rolling window of hours.
+
+    Every search increments the normalized query in the sorted set of the current hour. Buckets of the window are
+    merged with ZUNIONSTORE into a top set, which is rebuilt once it expires, so reads never aggregate raw queries.
+    """
+
+    def __init__(self, redis: Redis, window_hours: int, refresh_seconds: int) -> None:
+        self.redis = redis
+        self.window_hours = window_hours
+        self.refresh_seconds = refresh_seconds
+
+    async def increment(self, query: str, searched_at: datetime) -> None:
+        key = f"{BUCKET_KEY_PREFIX}:{_hour(searched_at)}"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zincrby(key, 1, normalize_query(query))
+            # a bucket is kept for as long as it is inside the window
+            pipe.expire(key, (self.window_hours + 1) * 3600)
+            await pipe.execute()
+
+    async def get_top(self, limit: int, prefix: str | None = None) -> list[PopularSearchQuery]:
+        """Most frequent queries of the window, optionally only the ones starting with the prefix."""
+        size = PREFIX_POOL_SIZE if prefix else limit
+        top = await self.redis.zrevrange(TOP_KEY, 0, size - 1, withscores=True)
+        if not top and not await self.redis.exists(TOP_KEY):
+            await self._merge_buckets()
+            top = await self.redis.zrevrange(TOP_KEY, 0, size - 1, withscores=True)
+
+        if prefix:
+            prefix = normalize_query(prefix)
+            top = [(query, count) for query, count in top if query.startswith(prefix)]
+        return [PopularSearchQuery(query=query, count=int(count)) for query, count in top[:limit]]
+
+    async def _merge_buckets(self) -> None:
+        current_hour = _hour(datetime.now(UTC))
+        keys = [f"{BUCKET_KEY_PREFIX}:{hour}" for hour in range(current_hour - self.window_hours + 1, current_hour + 1)]
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zunionstore(TOP_KEY, keys)
+            pipe.expire(TOP_KEY, self.refresh_seconds)
+            await pipe.execute()
@@ -1,20 +1,33 @@
+import hashlib
 from datetime import UTC, datetime
 
 from redis.asyncio import Redis
-from sqlalchemy import select
+from sqlalchemy import delete, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.token import RefreshToken
 from src.repositories.interfaces.token import RefreshTokenRepositoryProtocol
+from src.schemas.token import CachedRefreshToken
+
+
+def hash_refresh_token(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
 
 
 class RefreshTokenRepository(RefreshTokenRepositoryProtocol):
+    """
+    Refresh tokens are stored by their SHA-256 digest both in Postgres and in Redis.
+
+    Redis holds the user and the expiry of every issued token, so tokens are verified without Postgres, which is
+    only consulted when the Redis entry is missing.
+    """
+
     def __init__(self, session: AsyncSession, redis: Redis) -> None:
         self.session = session
         self.redis = redis
 
     async def get_by_token(self, token: str, *, active_only: bool = True) -> RefreshToken | None:
-        query = select(RefreshToken).where(RefreshToken.token == token)
+        query = select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(token))
 
         if active_only:
             query = query.where(
@@ -27,37 +40,51 @@ class RefreshTokenRepository(RefreshTokenRepositoryProtocol):
     async def create(self, user_id: int, token: str, expires_at: datetime) -> RefreshToken:
         refresh_token = RefreshToken(
             user_id=user_id,
-            token=token,
+            token_hash=hash_refresh_token(token),
             expires_at=expires_at,
         )
         self.session.add(refresh_token)
         await self.session.flush()
         return refresh_token
 
-    async def update(
-        self, refresh_token: RefreshToken, new_token: str | None = None, new_expires_at: datetime | None = None
-    ) -> None:
-        if new_token is not None:
-            refresh_token.token = new_token
-        if new_expires_at is not None:
-            refresh_token.expires_at = new_expires_at
-        await self.session.flush()
-        await self.session.refresh(refresh_token)
+    async def rotate(self, token: str, new_token: str, new_expires_at: datetime) -> bool:
+        """Replace an active token with a new one, `False` if the token was already rotated or deactivated."""
+        query = (
+            update(RefreshToken)
+            .where(RefreshToken.token_hash == hash_refresh_token(token), RefreshToken.is_active.is_(True))
+            .values(token_hash=hash_refresh_token(new_token), expires_at=new_expires_at)
+            .returning(RefreshToken.id)
+        )
+        return await self.session.scalar(query) is not None
 
-    async def deactivate(self, refresh_token: RefreshToken) -> None:
-        refresh_token.is_active = False
-        await self.session.flush()
+    async def deactivate(self, token: str) -> None:
+        query = update(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(token)).values(is_active=False)
+        await self.session.execute(query)
+
+    async def delete_expired(self, limit: int) -> int:
+        """Delete up to `limit` expired or deactivated tokens, return the number of deleted tokens."""
+        expired = (
+            select(RefreshToken.id)
+            .where(or_(RefreshToken.expires_at <= datetime.now(UTC), RefreshToken.is_active.is_(False)))
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(delete(RefreshToken).where(RefreshToken.id.in_(expired)))
+        return result.rowcount
 
-    async def cache_refresh_token(self, token: str, expires_in: int) -> None:
+    async def cache_refresh_token(self, token: str, cached_token: CachedRefreshToken) -> None:
+        expires_in = int((cached_token.expires_at - datetime.now(UTC)).total_seconds())
+        if expires_in <= 0:
+            return
         await self.redis.set(
-            f"refresh_token:{token}",
-            "1",
+            f"refresh_token:{hash_refresh_token(token).hex()}",
+            cached_token.model_dump_json(),
             ex=expires_in,
         )
 
-    async def get_cached_refresh_token(self, token: str) -> str | None:
-        result = await self.redis.get(f"refresh_token:{token}")
-        return result if result else None
+    async def get_cached_refresh_token(self, token: str) -> CachedRefreshToken | None:
+        cached = await self.redis.get(f"refresh_token:{hash_refresh_token(token).hex()}")
+        return CachedRefreshToken.model_validate_json(cached) if cached else None
 
     async def delete_cached_refresh_token(self, token: str) -> None:
-        await self.redis.delete(f"refresh_token:{token}")
+        await self.redis.delete(f"refresh_token:{hash_refresh_token(token).hex()}")
@@ -1,12 +1,16 @@
-from typing import BinaryIO
+import hashlib
+import logging
+import mimetypes
 
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.adapters.storage import S3Storage
+from src.adapters.storage import IMMUTABLE_CACHE_CONTROL, S3Storage
 from src.models.user_profile import UserProfile
 from src.repositories.interfaces.user_avatar import UserAvatarRepositoryProtocol
 
+logger = logging.getLogger(__name__)
+
 
 class UserAvatarRepository(UserAvatarRepositoryProtocol):
     def __init__(self, session: AsyncSession, s3_storage: S3Storage) -> None:
@@ -32,27 +36,52 @@ class UserAvatarRepository(UserAvatarRepositoryProtocol):
     async def upload_avatar(
         self,
         user_id: int,
-        content: BinaryIO,
+        content: bytes,
         content_type: str,
-    ) -> str:
-        file_name = f"avatars/{user_id}/avatar.png"
+    ) -> tuple[str, str | None]:
+        """
+        Upload the avatar and point the profile to it.
+
+        Returns the URL of the new avatar and the key of the replaced one, which is passed to `delete_avatar_file`
+        once the change is committed.
+        """
+        # the key is derived from the content, so an avatar URL never changes its image and can be cached forever
+        extension = mimetypes.guess_extension(content_type) or ""
+        file_name = f"avatars/{user_id}/{hashlib.sha256(content).hexdigest()[:32]}{extension}"
+        previous_file_name = await self.get_avatar_url(user_id)
 
         await self.s3_storage.upload_file(
             bucket_name=self._bucket_name,
             file_name=file_name,
             content=content,
             content_type=content_type,
+            cache_control=IMMUTABLE_CACHE_CONTROL,
         )
 
         await self.update_avatar_url(user_id=user_id, avatar_url=file_name)
+        stale_file_name = previous_file_name if previous_file_name != file_name else None
 
-        return await self.s3_storage.get_file_url(self._bucket_name, file_name)
-
-    async def delete_avatar(self, user_id: int) -> None:
-        file_name = f"avatars/{user_id}/avatar.png"
+        return await self.s3_storage.get_file_url(self._bucket_name, file_name), stale_file_name
 
-        await self.s3_storage.delete_file(self._bucket_name, file_name)
+    async def delete_avatar(self, user_id: int) -> str | None:
+        """Unset the avatar of the user, returns the key of the removed avatar for `delete_avatar_file`."""
+        file_name = await self.get_avatar_url(user_id)
         await self.delete_avatar_url(user_id)
+        return file_name
+
+    async def delete_avatar_file(self, file_name: str) -> None:
+        """
+        Delete the avatar image.
+
+        Meant to run after the change which stopped referencing the avatar is committed, so failures are only logged.
+        """
+        try:
+            await self.s3_storage.delete_file(self._bucket_name, file_name)
+        except Exception:
+            logger.warning("Failed to delete avatar %s", file_name, exc_info=True)
+
+    async def get_avatar_file_url(self, avatar_path: str) -> str:
+        return await self.s3_storage.get_file_url(self._bucket_name, avatar_path)
 
     async def get_avatar_presigned_url(self, user_id: int) -> str | None:
         avatar_url = await self.get_avatar_url(user_id)
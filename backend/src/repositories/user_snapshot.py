@@ -0,0 +1,83 @@
+import time
+from collections import OrderedDict
+
+from redis.asyncio import Redis
+
+from src.repositories.interfaces.user_snapshot import UserSnapshotRepositoryProtocol
+from src.schemas.user import UserSnapshot
+
+
+class LocalUserSnapshotCache:
+    """
+    In-process cache of user snapshots in front of Redis.
+
+    Other processes can not drop its entries, so they live only for a few seconds. The least recently used snapshots
+    are evicted when the cache grows over `max_size`.
+    """
+
+    def __init__(self, ttl_seconds: float = 5, max_size: int = 10000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._snapshots: OrderedDict[int, tuple[UserSnapshot, float]] = OrderedDict()
+
+    def get(self, user_id: int) -> UserSnapshot | None:
+        cached = self._snapshots.get(user_id)
+        if cached is None:
+            return None
+        snapshot, expires_at = cached
+        if time.monotonic() >= expires_at:
+            del self._snapshots[user_id]
+            return None
+        self._snapshots.move_to_end(user_id)
+        return snapshot
+
+    def set(self, snapshot: UserSnapshot) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._snapshots[snapshot.id] = (snapshot, time.monotonic() + self.ttl_seconds)
+        self._snapshots.move_to_end(snapshot.id)
+        while len(self._snapshots) > self.max_size:
+            self._snapshots.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._snapshots.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+
+
+class UserSnapshotRepository(UserSnapshotRepositoryProtocol):
+    """
+    Snapshots of users checked on every authenticated request, so access tokens are verified without Postgres.
+
+    Snapshots are dropped when the fields they hold change, the TTL bounds how long other changes take to apply.
+    """
+
+    def __init__(self, redis: Redis, local_cache: LocalUserSnapshotCache, ttl_seconds: int) -> None:
+        self.redis = redis
+        self.local_cache = local_cache
+        self.ttl_seconds = ttl_seconds
+
+    async def get(self, user_id: int) -> UserSnapshot | None:
+        if self.ttl_seconds <= 0:
+            return None
+        snapshot = self.local_cache.get(user_id)
+        if snapshot is not None:
+            return snapshot
+
+        cached = await self.redis.get(f"user_snapshot:{user_id}")
+        if not cached:
+            return None
+        snapshot = UserSnapshot.model_validate_json(cached)
+        self.local_cache.set(snapshot)
+        return snapshot
+
+    async def set(self, snapshot: UserSnapshot) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        await self.redis.set(f"user_snapshot:{snapshot.id}", snapshot.model_dump_json(), ex=self.ttl_seconds)
+        self.local_cache.set(snapshot)
+
+    async def invalidate(self, user_id: int) -> None:
+        self.local_cache.invalidate(user_id)
+        await self.redis.delete(f"user_snapshot:{user_id}")
@@ -22,7 +22,7 @@ from src.schemas.recipe_report import (
 )
 from src.schemas.search_query import SearchQueryRead
 from src.schemas.shopping_list_item import ShoppingListItemCreate, ShoppingListItemRead, ShoppingListItemUpdate
-from src.schemas.token import Token, TokenPayload
+from src.schemas.token import CachedRefreshToken, Token, TokenPayload
 from src.schemas.user import (
     UserCreate,
     UserProfileRead,
@@ -31,6 +31,7 @@ from src.schemas.user import (
     UserRead,
     UserReadShort,
     UserRoleUpdate,
+    UserSnapshot,
     UserUpdate,
 )
 
@@ -39,6 +40,7 @@ __all__ = [
     "BannedEmailDomainRead",
     "BaseReadSchema",
     "BaseSchema",
+    "CachedRefreshToken",
     "ConsentCreate",
     "ConsentRead",
     "ConsentUpdate",
@@ -73,5 +75,6 @@ __all__ = [
     "UserRead",
     "UserReadShort",
     "UserRoleUpdate",
+    "UserSnapshot",
     "UserUpdate",
 ]
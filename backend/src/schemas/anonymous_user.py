@@ -20,3 +20,9 @@ class AnonymousUserRead(BaseAnonymousUserSchema, BaseReadSchema):
     model_config = ConfigDict(from_attributes=True, extra="ignore")
 
     cookie_id: UUID4
+
+
+class CachedAnonymousUser(BaseModel):
+    """Anonymous user found by a cookie, `anonymous_user` is `None` when the cookie belongs to nobody."""
+
+    anonymous_user: AnonymousUserRead | None
@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+
+
+class RecipeImageProcessingMessage(BaseModel):
+    recipe_id: int = Field(gt=0)
+    image_path: str
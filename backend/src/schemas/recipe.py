@@ -1,4 +1,4 @@
-from typing import Annotated, Literal
+from typing import Annotated, Any, Literal
 
 from pydantic import AfterValidator, BaseModel, ConfigDict, Field, HttpUrl, PositiveInt
 
@@ -35,7 +35,9 @@ class IngredientRead(IngredientCreate):
 class BaseRecipeInstruction(BaseSchema):
     step_number: PositiveInt = Field(le=MAX_RECIPE_INSTRUCTIONS_COUNT)
     description: str = Field(max_length=255, examples=["Boil water", "Добавьте соль"])
-    image_path: str | None = Field(default=None, max_length=255, examples=["images/recipes/1/instructions/1/step.png"])
+    image_path: str | None = Field(
+        default=None, max_length=255, examples=["recipes/1/instructions/1/step-3f2a9c1d7b5e4a60.png"]
+    )
 
 
 class RecipeInstruction(BaseRecipeInstruction):
@@ -94,9 +96,19 @@ class RecipeShort(BaseSchema):
     slug: str = Field(description="Recipe slug for URL")
 
 
+class RecipeImageVariant(BaseSchema):
+    width: PositiveInt = Field(description="Image width in pixels", examples=[640])
+    url: str = Field(examples=["https://example.com/static/images/recipes/1/main_640.webp"])
+
+
 class RecipeReadShort(BaseRecipeSchema):
     id: PositiveInt
     image_url: str | None = Field(None, examples=["https://example.com/static/images/recipes/1/main.png"])
+    image_variants: list[RecipeImageVariant] = Field(
+        default_factory=list,
+        description="Resized WebP copies of the image for srcset, narrowest first. "
+        "Empty until they are generated after the image upload",
+    )
     impressions_count: int = Field(default=0, description="Count of impressions")
     is_on_favorites: bool = Field(default=False, description="Is the recipe in user's favorites")
     slug: str = Field(description="Recipe slug for URL")
@@ -115,7 +127,7 @@ class RecipeReadFull(RecipeRead):
 
 
 class RecipeCreate(_TagsMixin, BaseRecipeSchema):
-    image_path: str | None = Field(default=None, max_length=255, examples=["images/recipes/1/main.png"])
+    image_path: str | None = Field(default=None, max_length=255, examples=["recipes/1/main-3f2a9c1d7b5e4a60.png"])
 
     instructions: Annotated[list[RecipeInstructionCreate] | None, AfterValidator(validate_instructions_steps)] = Field(
         default=None, max_length=MAX_RECIPE_INSTRUCTIONS_COUNT
@@ -125,7 +137,7 @@ class RecipeCreate(_TagsMixin, BaseRecipeSchema):
 
 @partial_model
 class RecipeUpdate(_IsPublishedMixin, BaseRecipeSchema):
-    image_path: str | None = Field(default=None, max_length=255, examples=["images/recipes/1/main.png"])
+    image_path: str | None = Field(default=None, max_length=255, examples=["recipes/1/main-3f2a9c1d7b5e4a60.png"])
     instructions: Annotated[list[RecipeInstructionCreate] | None, AfterValidator(validate_instructions_steps)] = Field(
         default=None, max_length=MAX_RECIPE_INSTRUCTIONS_COUNT
     )
@@ -140,9 +152,87 @@ class RecipeSearchQuery(BaseModel):
     tags: list[str] | None = Field(default=None)
     include_ingredients: list[str] | None = Field(default=None)
     exclude_ingredients: list[str] | None = Field(default=None)
+    include_ingredients_min_match: int | None = Field(
+        default=None,
+        ge=1,
+        description="Find recipes with at least this many of include_ingredients instead of all of them",
+    )
     cook_time_from: int | None = Field(default=None, ge=0)
     cook_time_to: int | None = Field(default=None, ge=0)
     sort_by: Literal["-created_at", "created_at"] | None = Field(default=None)
+    use_cursor: bool = Field(
+        default=False,
+        description="Paginate with a cursor instead of offset, the cursor of the next page is returned in "
+        "the X-Next-Cursor header",
+    )
+    cursor: str | None = Field(
+        default=None,
+        description="Cursor from the X-Next-Cursor header of the previous page, offset is ignored when it is passed",
+    )
+
+    @property
+    def is_cursor_mode(self) -> bool:
+        return self.use_cursor or self.cursor is not None
+
+
+class FacetBucket(BaseModel):
+    key: str = Field(examples=["Dinner", "EASY"])
+    count: int = Field(description="Number of found recipes in the bucket")
+
+
+class CookTimeFacetBucket(FacetBucket):
+    cook_time_from: int | None = Field(description="Value for the cook_time_from search parameter")
+    cook_time_to: int | None = Field(description="Value for the cook_time_to search parameter")
+
+
+class RecipeSearchFacets(BaseModel):
+    """Filter counts over all recipes matching the search query."""
+
+    tags: list[FacetBucket] = Field(default_factory=list, description="Most common tags, most frequent first")
+    difficulty: list[FacetBucket] = Field(default_factory=list)
+    cook_time: list[CookTimeFacetBucket] = Field(default_factory=list)
+
+
+class RecipeSearchResult(BaseModel):
+    """
+    Search engine response: total number of hits and `_source` of the found documents in relevance order.
+
+    Total is not counted on the following pages of cursor pagination, `next_cursor` is set only in cursor mode
+    while there may be more results.
+    """
+
+    total: int | None
+    documents: list[dict[str, Any]] = Field(default_factory=list)
+    next_cursor: str | None = None
+    facets: RecipeSearchFacets | None = None
+
+    @property
+    def recipe_ids(self) -> list[int]:
+        return [document["id"] for document in self.documents]
+
+
+class RecipeSearchPage(BaseModel):
+    """Cached search result: total number of hits and ids of the recipes on the page in relevance order."""
+
+    total: int
+    recipe_ids: list[int]
+    facets: RecipeSearchFacets | None = None
+
+
+class FoundRecipes(BaseModel):
+    """Page of search results. Total is `None` on the following pages of cursor pagination."""
+
+    total: int | None
+    recipes: list[RecipeReadShort]
+    next_cursor: str | None = None
+    facets: RecipeSearchFacets | None = None
+
+
+class RecipeFacetedSearchRead(BaseModel):
+    recipes: list[RecipeReadShort]
+    facets: RecipeSearchFacets | None = Field(
+        default=None, description="Filter counts, not returned for the following pages of cursor pagination"
+    )
 
 
 class RecipeFilterParams(BaseModel):
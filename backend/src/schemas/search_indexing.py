@@ -0,0 +1,13 @@
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from src.enums.search_indexing_action import SearchIndexingActionEnum
+
+
+class RecipeIndexingMessage(BaseModel):
+    action: SearchIndexingActionEnum
+    recipe_id: int = Field(gt=0)
+    # external document version, an older message never overwrites a newer write of the same recipe
+    version: int = Field(gt=0)
+    document: dict[str, Any] | None = None
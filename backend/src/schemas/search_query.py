@@ -3,6 +3,7 @@ from datetime import datetime
 from pydantic import Field
 
 from src.schemas.base import BaseReadSchema, BaseSchema
+from src.schemas.recipe import RecipeShort
 
 
 class SearchQueryCreate(BaseSchema):
@@ -14,5 +15,39 @@ class SearchQueryCreate(BaseSchema):
 class SearchQueryRead(BaseReadSchema):
     """Schema for reading search query history."""
 
+    id: int = Field(description="Stable identifier of the query in the history of its user")
     query: str = Field(description="Search query text")
-    created_at: datetime = Field(description="Date and time when the search was made")
+    created_at: datetime = Field(description="Date and time when the query was searched first")
+    updated_at: datetime | None = Field(None, description="Date and time when the query was searched last time")
+
+
+class SearchHistoryEntry(BaseSchema):
+    """Search query of a user or an anonymous user, queued for persisting to the database."""
+
+    query: str
+    user_id: int | None = None
+    anonymous_user_id: int | None = None
+    searched_at: datetime
+    # known for entries read from the history, queued entries are only searched at `searched_at`
+    first_searched_at: datetime | None = None
+
+
+class PopularSearchQuery(BaseSchema):
+    """Search query frequently searched during the recent hours."""
+
+    query: str = Field(description="Normalized search query text")
+    count: int = Field(description="Number of searches with the query during the trending window")
+
+
+class RecipeSuggestion(RecipeShort):
+    title: str = Field(description="Recipe title")
+
+
+class SearchSuggestions(BaseSchema):
+    """Autocomplete suggestions for a partially typed search query."""
+
+    recipes: list[RecipeSuggestion] = Field(default_factory=list, description="Recipes with matching titles")
+    tags: list[str] = Field(default_factory=list, description="Tags starting with the typed text")
+    queries: list[str] = Field(
+        default_factory=list, description="Popular search queries starting with the typed text, most popular first"
+    )
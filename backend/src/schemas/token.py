@@ -11,3 +11,8 @@ class Token(BaseModel):
 class TokenPayload(BaseModel):
     sub: int
     exp: datetime
+
+
+class CachedRefreshToken(BaseModel):
+    user_id: int
+    expires_at: datetime
@@ -98,6 +98,16 @@ class UserRead(BaseReadSchema):
     last_login: datetime | None
 
 
+class UserSnapshot(BaseSchema):
+    """Fields of the user that authentication and permission checks need, cached between requests."""
+
+    id: int
+    username: str
+    is_active: bool
+    is_superuser: bool
+    role: UserRoleEnum
+
+
 class UserProfileShort(BaseSchema):
     avatar_url: str | None
 
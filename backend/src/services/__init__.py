@@ -3,6 +3,7 @@ from src.services.banned_email import BannedEmailService
 from src.services.consent import ConsentService
 from src.services.disliked_recipe import DislikedRecipeService
 from src.services.favorite_recipe import FavoriteRecipeService
+from src.services.rate_limit import RateLimitService
 from src.services.recipe import RecipeService
 from src.services.recipe_impression import RecipeImpressionService
 from src.services.recipe_instructions import RecipeInstructionsService
@@ -18,6 +19,7 @@ __all__ = [
     "ConsentService",
     "DislikedRecipeService",
     "FavoriteRecipeService",
+    "RateLimitService",
     "RecipeImpressionService",
     "RecipeInstructionsService",
     "RecipeReportService",
@@ -1,13 +1,18 @@
 import uuid
 
 from src.exceptions.anonymous_user import AnonymousUserDoesNotExistError
-from src.repositories.interfaces import AnonymousUserRepositoryProtocol
+from src.repositories.interfaces import AnonymousUserCacheRepositoryProtocol, AnonymousUserRepositoryProtocol
 from src.schemas.anonymous_user import AnonymousUserCreate, AnonymousUserRead
 
 
 class AnonymousUserService:
-    def __init__(self, anonymous_user_repository: AnonymousUserRepositoryProtocol) -> None:
+    def __init__(
+        self,
+        anonymous_user_repository: AnonymousUserRepositoryProtocol,
+        anonymous_user_cache_repository: AnonymousUserCacheRepositoryProtocol,
+    ) -> None:
         self.anonymous_user_repository = anonymous_user_repository
+        self.anonymous_user_cache_repository = anonymous_user_cache_repository
 
     async def create(
         self,
@@ -27,6 +32,8 @@ class AnonymousUserService:
             cookie_id=cookie_id,
             user_agent=user_agent,
         )
+        # the cookie may have been cached as unknown before the user was created
+        await self.anonymous_user_cache_repository.invalidate(cookie_id)
         return AnonymousUserRead.model_validate(anonymous_user)
 
     async def get_by_id(self, anonymous_user_id: int) -> AnonymousUserRead | None:
@@ -37,11 +44,22 @@ class AnonymousUserService:
         return AnonymousUserRead.model_validate(anonymous_user)
 
     async def get_by_cookie_id(self, cookie_id: uuid.UUID) -> AnonymousUserRead | None:
-        anonymous_user = await self.anonymous_user_repository.get_by_cookie_id(cookie_id)
-        if not anonymous_user:
+        cached = await self.anonymous_user_cache_repository.get(cookie_id)
+        if cached is not None:
+            anonymous_user_read = cached.anonymous_user
+        else:
+            anonymous_user = await self.anonymous_user_repository.get_by_cookie_id(cookie_id)
+            anonymous_user_read = AnonymousUserRead.model_validate(anonymous_user) if anonymous_user else None
+            await self.anonymous_user_cache_repository.set(cookie_id, anonymous_user_read)
+
+        if anonymous_user_read is None:
             msg = f"Anonymous user with cookie_id {cookie_id} not found"
             raise AnonymousUserDoesNotExistError(msg)
-        return AnonymousUserRead.model_validate(anonymous_user)
+        return anonymous_user_read
+
+    async def forget_cookie(self, cookie_id: uuid.UUID) -> None:
+        """Drop the cached anonymous user of the cookie, so the next request resolves it again."""
+        await self.anonymous_user_cache_repository.invalidate(cookie_id)
 
     async def delete_by_id(self, anonymous_user_id: int) -> None:
         await self.anonymous_user_repository.delete_by_id(anonymous_user_id)
@@ -1,30 +1,76 @@
+import asyncio
+
 from fastapi import UploadFile
+from PIL import Image
 
 from src.exceptions.image import ImageTooLargeError, WrongImageFormatError
 from src.repositories.interfaces import UserAvatarRepositoryProtocol
+from src.utils.images import detect_image_type, downscale_image
+
+MAX_AVATAR_SIZE = 5 * 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
 
 
 class UserAvatarService:
-    def __init__(self, user_avatar_repository: UserAvatarRepositoryProtocol) -> None:
+    def __init__(self, user_avatar_repository: UserAvatarRepositoryProtocol, max_side: int | None = None) -> None:
         self.user_avatar_repository = user_avatar_repository
+        self.max_side = max_side
+
+    async def _read_image(self, file: UploadFile) -> tuple[bytes, str]:
+        """
+        Read the upload in chunks, checking its format by the first chunk and its size while reading.
 
-    async def update_avatar(self, user_id: int, file: UploadFile) -> str:
-        if not file.size or not file.content_type or not file.content_type.startswith("image/"):
+        The declared size and content type are only used to reject files early, as clients can send anything there.
+        """
+        if not file.content_type or not file.content_type.startswith("image/"):
             msg = "File is not an image"
             raise WrongImageFormatError(msg)
-
-        if file.size > 5 * 1024 * 1024:
+        if file.size and file.size > MAX_AVATAR_SIZE:
             msg = "File is larger than 5MB"
             raise ImageTooLargeError(msg)
 
+        content = bytearray(await file.read(READ_CHUNK_SIZE))
+        content_type = detect_image_type(content)
+        if content_type is None:
+            msg = "File is not an image"
+            raise WrongImageFormatError(msg)
+
+        while chunk := await file.read(READ_CHUNK_SIZE):
+            content.extend(chunk)
+            if len(content) > MAX_AVATAR_SIZE:
+                msg = "File is larger than 5MB"
+                raise ImageTooLargeError(msg)
+        return bytes(content), content_type
+
+    async def update_avatar(self, user_id: int, file: UploadFile) -> tuple[str, str | None]:
+        """
+        Replace the avatar of the user.
+
+        Returns the URL of the new avatar and the replaced avatar, which is passed to `delete_avatar_file` once the
+        update is committed, so a failed commit does not leave the profile pointing to a deleted image.
+        """
+        content, content_type = await self._read_image(file)
+
+        if self.max_side:
+            try:
+                content = await asyncio.to_thread(downscale_image, content, self.max_side)
+            except (OSError, Image.DecompressionBombError):
+                msg = "File is not an image"
+                raise WrongImageFormatError(msg) from None
+
         return await self.user_avatar_repository.upload_avatar(
             user_id=user_id,
-            content=file.file,
-            content_type=file.content_type,
+            content=content,
+            content_type=content_type,
         )
 
     async def get_avatar_url(self, user_id: int) -> str | None:
         return await self.user_avatar_repository.get_avatar_presigned_url(user_id)
 
-    async def delete_avatar(self, user_id: int) -> None:
-        await self.user_avatar_repository.delete_avatar(user_id)
+    async def delete_avatar(self, user_id: int) -> str | None:
+        """Unset the avatar of the user, returns the avatar to pass to `delete_avatar_file` after the commit."""
+        return await self.user_avatar_repository.delete_avatar(user_id)
+
+    async def delete_avatar_file(self, avatar_path: str | None) -> None:
+        if avatar_path:
+            await self.user_avatar_repository.delete_avatar_file(avatar_path)
@@ -12,6 +12,7 @@ from src.repositories.interfaces import (
 )
 from src.schemas.disliked_recipe import DislikedRecipeCreate
 from src.schemas.recipe import RecipeReadShort
+from src.utils.recipe_images import set_recipe_image_urls
 
 
 class DislikedRecipeService:
@@ -29,11 +30,17 @@ class DislikedRecipeService:
         self.recipe_image_repository = recipe_image_repository
         self.recsys_repository = recsys_repository
 
-    async def _to_recipe_with_dislike_schema(self, disliked_recipe: Recipe) -> RecipeReadShort:
-        recipe = RecipeReadShort.model_validate(disliked_recipe)
-        if disliked_recipe.image_path:
-            recipe.image_url = await self.recipe_image_repository.get_image_url(disliked_recipe.image_path)
+    async def _to_recipes_with_dislike_schemas(self, disliked_recipes: list[Recipe]) -> list[RecipeReadShort]:
+        recipes = [RecipeReadShort.model_validate(recipe) for recipe in disliked_recipes]
+        await set_recipe_image_urls(
+            self.recipe_image_repository,
+            recipes,
+            [(recipe.image_path, recipe.image_widths) for recipe in disliked_recipes],
+        )
+        return recipes
 
+    async def _to_recipe_with_dislike_schema(self, disliked_recipe: Recipe) -> RecipeReadShort:
+        [recipe] = await self._to_recipes_with_dislike_schemas([disliked_recipe])
         return recipe
 
     async def get_user_dislikes(
@@ -41,7 +48,7 @@ class DislikedRecipeService:
     ) -> tuple[int, list[RecipeReadShort]]:
         count, dislikes = await self.disliked_recipe_repository.get_all_by_user(user_id=user_id, skip=skip, limit=limit)
 
-        disliked_recipes = [await self._to_recipe_with_dislike_schema(dislike.recipe) for dislike in dislikes]
+        disliked_recipes = await self._to_recipes_with_dislike_schemas([dislike.recipe for dislike in dislikes])
 
         return count, disliked_recipes
 
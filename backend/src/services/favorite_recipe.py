@@ -14,6 +14,7 @@ from src.repositories.interfaces import (
 )
 from src.schemas.favorite_recipe import FavoriteRecipeCreate
 from src.schemas.recipe import RecipeReadShort
+from src.utils.recipe_images import set_recipe_image_urls
 
 if TYPE_CHECKING:
     from src.typings.recipe_with_favorite import RecipeWithExtra
@@ -34,12 +35,19 @@ class FavoriteRecipeService:
         self.recipe_image_repository = recipe_image_repository
         self.recsys_repository = recsys_repository
 
-    async def _to_recipe_with_like_schema(self, favorite_recipe: Recipe) -> RecipeReadShort:
-        recipe = RecipeReadShort.model_validate(favorite_recipe, from_attributes=True)
-        if favorite_recipe.image_path:
-            recipe.image_url = await self.recipe_image_repository.get_image_url(favorite_recipe.image_path)
+    async def _to_recipes_with_like_schemas(self, favorite_recipes: list[Recipe]) -> list[RecipeReadShort]:
+        recipes = [RecipeReadShort.model_validate(recipe, from_attributes=True) for recipe in favorite_recipes]
+        await set_recipe_image_urls(
+            self.recipe_image_repository,
+            recipes,
+            [(recipe.image_path, recipe.image_widths) for recipe in favorite_recipes],
+        )
+        for recipe in recipes:
+            recipe.is_on_favorites = True
+        return recipes
 
-        recipe.is_on_favorites = True
+    async def _to_recipe_with_like_schema(self, favorite_recipe: Recipe) -> RecipeReadShort:
+        [recipe] = await self._to_recipes_with_like_schemas([favorite_recipe])
         return recipe
 
     async def get_user_favorites(
@@ -49,7 +57,7 @@ class FavoriteRecipeService:
             user_id=user_id, skip=skip, limit=limit
         )
 
-        favorite_recipes = [await self._to_recipe_with_like_schema(favorite.recipe) for favorite in favorites]
+        favorite_recipes = await self._to_recipes_with_like_schemas([favorite.recipe for favorite in favorites])
 
         return count, favorite_recipes
 
@@ -0,0 +1,25 @@
+import math
+
+from src.core.config import RateLimitConfig
+from src.exceptions.rate_limit import RateLimitExceededError
+from src.repositories.interfaces import RateLimitRepositoryProtocol
+
+
+class RateLimitService:
+    def __init__(self, rate_limit_repository: RateLimitRepositoryProtocol, config: RateLimitConfig) -> None:
+        self.rate_limit_repository = rate_limit_repository
+        self.config = config
+
+    async def check(self, rule_name: str, *, user_identity: str | None, ip: str | None) -> None:
+        """Count a request against the rule, raise `RateLimitExceededError` when the limit of the rule is reached."""
+        rule = self.config.rules.get(rule_name)
+        if not self.config.enabled or rule is None:
+            return
+
+        identity = user_identity if rule.identity == "user" and user_identity else f"ip:{ip}"
+        retry_after = await self.rate_limit_repository.hit(
+            f"{rule_name}:{identity}", limit=rule.limit, window_seconds=rule.window_seconds
+        )
+        if retry_after:
+            msg = "Too many requests, try again later"
+            raise RateLimitExceededError(msg, retry_after=math.ceil(retry_after))
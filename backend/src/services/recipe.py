@@ -1,10 +1,15 @@
-from collections.abc import Sequence
-from typing import cast
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from functools import partial
+from typing import Any, cast
 
 from pydantic import HttpUrl
 
+from src.enums.index_refresh import IndexRefreshEnum
 from src.enums.recipe_sort_field import RecipeSortFieldEnum
 from src.exceptions.recipe import (
+    InvalidRecipeImagePathError,
     NoRecipeImageError,
     NoRecipeInstructionsError,
     RecipeNotFoundError,
@@ -20,6 +25,7 @@ from src.repositories.interfaces import (
     RecipeSearchRepositoryProtocol,
     RecipeTagRepositoryProtocol,
     RecsysRepositoryProtocol,
+    SearchCacheRepositoryProtocol,
 )
 from src.schemas.direct_upload import DirectUpload
 from src.schemas.recipe import (
@@ -34,8 +40,12 @@ from src.schemas.recipe import (
 )
 from src.schemas.user import UserReadShort
 from src.typings.recipe_with_favorite import RecipeWithExtra
+from src.utils.recipe_images import image_derivative_path, is_recipe_image_path, set_recipe_image_urls
+from src.utils.search_document import serialize_recipe_for_search
 from src.utils.slug import create_recipe_slug
 
+logger = logging.getLogger(__name__)
+
 
 class RecipeService:
     def __init__(
@@ -47,6 +57,9 @@ class RecipeService:
         recipe_image_repository: RecipeImageRepositoryProtocol,
         recipe_search_repository: RecipeSearchRepositoryProtocol,
         recsys_repository: RecsysRepositoryProtocol,
+        search_cache_repository: SearchCacheRepositoryProtocol,
+        *,
+        queue_index_writes: bool = False,
     ) -> None:
         self.recipe_repository = recipe_repository
         self.recipe_ingredient_repository = recipe_ingredient_repository
@@ -55,27 +68,49 @@ class RecipeService:
         self.recipe_image_repository = recipe_image_repository
         self.recipe_search_repository = recipe_search_repository
         self.recsys_repository = recsys_repository
+        self.search_cache_repository = search_cache_repository
+        self.queue_index_writes = queue_index_writes
+        # side effects which must not happen for a rolled back change, they are run by `after_commit`
+        self._after_commit: list[Callable[[], Awaitable[Any]]] = []
+
+    async def after_commit(self) -> None:
+        """
+        Run side effects deferred until the changes of the request are committed.
+
+        The changes are already stored at this point, so failures are only logged.
+        """
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            try:
+                await callback()
+            except Exception:
+                logger.exception("Deferred recipe side effect failed")
 
     async def _to_recipe_schema(self, recipe: RecipeWithExtra) -> RecipeReadFull:
         recipe_schema = RecipeReadFull.model_validate(recipe)
 
-        if recipe.image_path:
-            recipe_schema.image_url = await self.recipe_image_repository.get_image_url(recipe.image_path)
+        instructions = recipe_schema.instructions or []
+        _, instruction_image_urls = await asyncio.gather(
+            set_recipe_image_urls(
+                self.recipe_image_repository, [recipe_schema], [(recipe.image_path, recipe.image_widths)]
+            ),
+            self.recipe_image_repository.get_image_urls(
+                [str(instruction.image_path) if instruction.image_path else None for instruction in instructions]
+            ),
+        )
 
-        if recipe_schema.instructions:
-            for i, instruction in enumerate(recipe_schema.instructions):
-                if instruction.image_path:
-                    recipe_schema.instructions[i].image_url = HttpUrl(
-                        await self.recipe_image_repository.get_image_url(str(instruction.image_path))
-                    )
+        for instruction, instruction_image_url in zip(instructions, instruction_image_urls, strict=True):
+            if instruction_image_url:
+                instruction.image_url = HttpUrl(instruction_image_url)
 
         return recipe_schema
 
-    async def _to_recipe_short_schema(self, recipe: Recipe) -> RecipeReadShort:
-        schema = RecipeReadShort.model_validate(recipe, from_attributes=True)
-        if recipe.image_path:
-            schema.image_url = await self.recipe_image_repository.get_image_url(recipe.image_path)
-        return schema
+    async def _to_recipe_short_schemas(self, recipes: Sequence[Recipe]) -> list[RecipeReadShort]:
+        schemas = [RecipeReadShort.model_validate(recipe, from_attributes=True) for recipe in recipes]
+        await set_recipe_image_urls(
+            self.recipe_image_repository, schemas, [(recipe.image_path, recipe.image_widths) for recipe in recipes]
+        )
+        return schemas
 
     async def _to_recipe_full_schema(self, recipe: RecipeWithExtra) -> RecipeReadFull:
         recipe_schema = await self._to_recipe_schema(recipe)
@@ -106,7 +141,7 @@ class RecipeService:
         count, recipes = await self.recipe_repository.get_all(
             user_id=user_id, skip=skip, limit=limit, sort_by=sort_by, is_published=is_published
         )
-        recipe_schemas = [await self._to_recipe_short_schema(recipe) for recipe in recipes]
+        recipe_schemas = await self._to_recipe_short_schemas(recipes)
 
         return count, recipe_schemas
 
@@ -126,7 +161,7 @@ class RecipeService:
             limit=limit,
             is_published=is_published,
         )
-        recipe_schemas = [await self._to_recipe_short_schema(recipe) for recipe in recipes]
+        recipe_schemas = await self._to_recipe_short_schemas(recipes)
 
         return count, recipe_schemas
 
@@ -140,7 +175,7 @@ class RecipeService:
             limit=limit,
             is_published=is_published,
         )
-        recipe_schemas = [await self._to_recipe_short_schema(recipe) for recipe in recipes]
+        recipe_schemas = await self._to_recipe_short_schemas(recipes)
         return count, recipe_schemas
 
     async def _create_ingredients(self, recipe_id: int, ingredients: list[IngredientCreate]) -> None:
@@ -173,10 +208,33 @@ class RecipeService:
         if tags_data:
             await self.recipe_tag_repository.bulk_create(tags_data)
 
-    async def _update_elasticsearch_index(self, recipe: Recipe) -> None:
-        unprepared_schema = RecipeRead.model_validate(recipe, from_attributes=True)
-        schema = unprepared_schema.model_dump(exclude={"updated_at", "instructions", "image_url"})
-        await self.recipe_search_repository.index_recipe(schema)
+    async def _update_elasticsearch_index(
+        self, recipe: Recipe, refresh: IndexRefreshEnum = IndexRefreshEnum.NONE
+    ) -> None:
+        schema = serialize_recipe_for_search(recipe)
+        # Writes that are not awaited by the caller go through the indexing queue after the commit, the worker
+        # must not index a change that is rolled back
+        if refresh == IndexRefreshEnum.NONE and self.queue_index_writes:
+            self._after_commit.append(partial(self._enqueue_index_recipe, schema))
+            return
+        await self.recipe_search_repository.index_recipe(schema, refresh=refresh)
+
+    async def _enqueue_index_recipe(self, schema: dict[str, Any]) -> None:
+        # written directly when the queue is unavailable
+        if not await self.recipe_search_repository.enqueue_index_recipe(schema):
+            await self.recipe_search_repository.index_recipe(schema)
+
+    async def _delete_from_elasticsearch_index(
+        self, recipe_id: int, refresh: IndexRefreshEnum = IndexRefreshEnum.NONE
+    ) -> None:
+        if refresh == IndexRefreshEnum.NONE and self.queue_index_writes:
+            self._after_commit.append(partial(self._enqueue_delete_recipe, recipe_id))
+            return
+        await self.recipe_search_repository.delete_recipe(recipe_id, refresh=refresh)
+
+    async def _enqueue_delete_recipe(self, recipe_id: int) -> None:
+        if not await self.recipe_search_repository.enqueue_delete_recipe(recipe_id):
+            await self.recipe_search_repository.delete_recipe(recipe_id)
 
     async def _update_recsys_on_update(
         self,
@@ -215,11 +273,53 @@ class RecipeService:
                 is_published=recipe_update.is_published,
             )
 
+    @staticmethod
+    def _get_stale_image_paths(
+        existing_recipe: Recipe, recipe_update: RecipeUpdate, *, image_changed: bool
+    ) -> list[str]:
+        """Images which the update stops referencing, every upload gets a new key, so they are never reused."""
+        stale_image_paths = []
+        if image_changed and existing_recipe.image_path:
+            stale_image_paths.append(existing_recipe.image_path)
+            stale_image_paths.extend(
+                image_derivative_path(existing_recipe.image_path, width) for width in existing_recipe.image_widths or ()
+            )
+        if recipe_update.instructions is not None:
+            kept_paths = {instruction.image_path for instruction in recipe_update.instructions}
+            stale_image_paths.extend(
+                instruction.image_path
+                for instruction in existing_recipe.instructions or ()
+                if instruction.image_path and instruction.image_path not in kept_paths
+            )
+        return stale_image_paths
+
+    @staticmethod
+    def _validate_image_paths(
+        recipe_id: int,
+        image_path: str | None,
+        instructions: Sequence[RecipeInstructionCreate] | None,
+        known_instruction_paths: set[str] | None = None,
+    ) -> None:
+        """Check that new image paths are keys issued for the recipe, as its stale images are deleted by them."""
+        if image_path is not None and not is_recipe_image_path(image_path, recipe_id):
+            msg = f"Image path {image_path!r} is not an image of recipe {recipe_id}"
+            raise InvalidRecipeImagePathError(msg)
+        for instruction in instructions or ():
+            if (
+                instruction.image_path is not None
+                and instruction.image_path not in (known_instruction_paths or set())
+                and not is_recipe_image_path(instruction.image_path, recipe_id, instruction=True)
+            ):
+                msg = f"Image path {instruction.image_path!r} is not an instruction image of recipe {recipe_id}"
+                raise InvalidRecipeImagePathError(msg)
+
     async def create(self, user: User, recipe_create: RecipeCreate) -> RecipeRead:
         recipe_data = recipe_create.model_dump(exclude={"ingredients", "instructions", "tags"})
         recipe = await self.recipe_repository.create(
             slug=create_recipe_slug(recipe_create.title), is_published=False, author_id=user.id, **recipe_data
         )
+        # upload keys are issued per recipe, the error rolls the created recipe back
+        self._validate_image_paths(recipe.id, recipe_create.image_path, recipe_create.instructions)
 
         await self._create_ingredients(recipe.id, recipe_create.ingredients)
 
@@ -232,7 +332,13 @@ class RecipeService:
         await self._update_elasticsearch_index(created_recipe)
         return await self._to_recipe_schema(created_recipe)
 
-    async def update(self, user: User, recipe_id: int, recipe_update: RecipeUpdate) -> RecipeReadFull:
+    async def update(self, user: User, recipe_id: int, recipe_update: RecipeUpdate) -> tuple[RecipeReadFull, list[str]]:
+        """
+        Update the recipe and its ingredients, instructions and tags.
+
+        Returns the updated recipe and the images it no longer references, which are passed to `delete_images` once
+        the update is committed, so a failed commit does not leave the recipe pointing to deleted images.
+        """
         existing_recipe = await self.recipe_repository.get_by_id(recipe_id)
         recipe_data = recipe_update.model_dump(exclude={"ingredients", "instructions", "tags"}, exclude_unset=True)
         if not existing_recipe:
@@ -253,10 +359,25 @@ class RecipeService:
             msg = "Recipe can not be published without instructions"
             raise NoRecipeInstructionsError(msg)
 
-        if recipe_data:
-            if "title" in recipe_data:
-                recipe_data["slug"] = create_recipe_slug(recipe_data["title"])
-            await self.recipe_repository.update(recipe_id, **recipe_data)
+        if "title" in recipe_data:
+            recipe_data["slug"] = create_recipe_slug(recipe_data["title"])
+        # image keys are versioned, so the same path means the same image
+        image_changed = "image_path" in recipe_data and recipe_data["image_path"] != existing_recipe.image_path
+        self._validate_image_paths(
+            recipe_id,
+            recipe_data["image_path"] if image_changed else None,
+            recipe_update.instructions,
+            known_instruction_paths={
+                instruction.image_path for instruction in existing_recipe.instructions or () if instruction.image_path
+            },
+        )
+        if image_changed:
+            # resized copies of the previous image are stale, the original is served until new ones are generated
+            recipe_data["image_widths"] = None
+        stale_image_paths = self._get_stale_image_paths(existing_recipe, recipe_update, image_changed=image_changed)
+        # The row is updated even without own field changes, so updated_at also tracks ingredients,
+        # instructions and tags edits, e.g. for the search index rebuild catch-up
+        await self.recipe_repository.update(recipe_id, **recipe_data)
 
         if recipe_update.ingredients is not None:
             await self.recipe_ingredient_repository.delete_by_recipe_id(recipe_id)
@@ -272,11 +393,28 @@ class RecipeService:
 
         updated_recipe = cast("RecipeWithExtra", await self.recipe_repository.get_by_id(recipe_id, user_id=user.id))
 
-        await self._update_elasticsearch_index(updated_recipe)
+        # Publishing/unpublishing must be visible in search right after the response, other edits can wait
+        # for the next scheduled refresh of the index
+        refresh = IndexRefreshEnum.WAIT_FOR if recipe_update.is_published is not None else IndexRefreshEnum.NONE
+        await self._update_elasticsearch_index(updated_recipe, refresh=refresh)
+        if recipe_update.is_published is not None:
+            # a search between the invalidation and the commit would cache the old page again
+            self._after_commit.append(self.search_cache_repository.invalidate)
+
+        # setting the image path after the direct upload marks the upload as complete, the worker reads the image
+        # path of the recipe, so it is queued once the path is committed
+        if image_changed and recipe_data["image_path"]:
+            self._after_commit.append(
+                partial(self.recipe_image_repository.enqueue_image_processing, recipe_id, recipe_data["image_path"])
+            )
 
         await self._update_recsys_on_update(existing_recipe, recipe_update)
 
-        return await self._to_recipe_full_schema(updated_recipe)
+        return await self._to_recipe_full_schema(updated_recipe), stale_image_paths
+
+    async def delete_images(self, recipe_id: int, image_paths: Sequence[str]) -> None:
+        if image_paths:
+            await self.recipe_image_repository.delete_images(recipe_id, image_paths)
 
     async def delete(self, user: User, recipe_id: int) -> None:
         existing_recipe = await self.recipe_repository.get_by_id(recipe_id)
@@ -294,7 +432,11 @@ class RecipeService:
 
         await self.recipe_repository.delete_by_id(recipe_id)
 
-        await self.recipe_search_repository.delete_recipe(recipe_id)
+        # Published recipe must disappear from search results right away, drafts are not searchable anyway
+        refresh = IndexRefreshEnum.WAIT_FOR if existing_recipe.is_published else IndexRefreshEnum.NONE
+        await self._delete_from_elasticsearch_index(recipe_id, refresh=refresh)
+        if existing_recipe.is_published:
+            self._after_commit.append(self.search_cache_repository.invalidate)
 
     async def get_image_upload_url(self, user: User, recipe_id: int) -> DirectUpload:
         existing_recipe = await self.recipe_repository.get_by_id(recipe_id)
@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from collections.abc import Sequence
+
+from PIL import Image
+
+from src.repositories.interfaces import (
+    RecipeImageRepositoryProtocol,
+    RecipeRepositoryProtocol,
+    RecipeSearchRepositoryProtocol,
+)
+from src.utils.recipe_images import is_recipe_image_path, make_webp_derivatives
+from src.utils.search_document import serialize_recipe_for_search
+
+logger = logging.getLogger(__name__)
+
+
+class RecipeImageService:
+    def __init__(
+        self,
+        recipe_repository: RecipeRepositoryProtocol,
+        recipe_image_repository: RecipeImageRepositoryProtocol,
+        recipe_search_repository: RecipeSearchRepositoryProtocol,
+        *,
+        widths: Sequence[int] = (320, 640, 1280),
+        webp_quality: int = 80,
+    ) -> None:
+        self.recipe_repository = recipe_repository
+        self.recipe_image_repository = recipe_image_repository
+        self.recipe_search_repository = recipe_search_repository
+        self.widths = widths
+        self.webp_quality = webp_quality
+
+    async def generate_image_variants(self, recipe_id: int, image_path: str) -> list[int] | None:
+        """
+        Store resized WebP copies of the uploaded recipe image and record their widths.
+
+        Returns the widths or `None` when the recipe, its image or the image file is gone, the file is not an image,
+        or the path is not a key issued for the recipe images.
+        """
+        if not is_recipe_image_path(image_path, recipe_id):
+            logger.warning("Recipe %s image %r is outside of its images, not resized", recipe_id, image_path)
+            return None
+
+        content = await self.recipe_image_repository.download_image(image_path)
+        if content is None:
+            return None
+
+        try:
+            derivatives = await asyncio.to_thread(make_webp_derivatives, content, self.widths, self.webp_quality)
+        except (OSError, Image.DecompressionBombError):
+            logger.warning("Recipe %s image %s can not be resized", recipe_id, image_path)
+            return None
+
+        await self.recipe_image_repository.upload_image_derivatives(image_path, derivatives)
+        widths = sorted(derivatives)
+        # the request which set the image may still be in progress, the update waits for its row lock,
+        # so the image path is compared against the committed row
+        if not await self.recipe_repository.set_image_widths(recipe_id, image_path, widths):
+            return None
+
+        # search results are built from the index, so it gets the widths as well
+        updated_recipe = await self.recipe_repository.get_by_id(recipe_id)
+        if updated_recipe:
+            await self.recipe_search_repository.index_recipe(serialize_recipe_for_search(updated_recipe))
+        return widths
@@ -12,6 +12,7 @@ from src.repositories.interfaces import (
 from src.schemas.recipe import RecipeReadShort
 from src.schemas.recipe_impression import RecipeImpressionRead
 from src.schemas.recsys_messages import AddImpressionMessage
+from src.utils.recipe_images import set_recipe_image_urls
 
 if TYPE_CHECKING:
     from src.models.recipe_impression import RecipeImpression
@@ -30,13 +31,19 @@ class RecipeImpressionService:
         self.recipe_image_repository = recipe_image_repository
         self.recsys_repository = recsys_repository
 
-    async def _to_recipe_impression_schema(self, impression: "RecipeImpression") -> RecipeImpressionRead:
-        recipe = RecipeReadShort.model_validate(impression.recipe)
-        if impression.recipe.image_path:
-            recipe.image_url = await self.recipe_image_repository.get_image_url(impression.recipe.image_path)
-        schema = RecipeImpressionRead.model_validate(impression)
-        schema.recipe = recipe
-        return schema
+    async def _to_recipe_impression_schemas(self, impressions: "list[RecipeImpression]") -> list[RecipeImpressionRead]:
+        recipes = [RecipeReadShort.model_validate(impression.recipe) for impression in impressions]
+        await set_recipe_image_urls(
+            self.recipe_image_repository,
+            recipes,
+            [(impression.recipe.image_path, impression.recipe.image_widths) for impression in impressions],
+        )
+        schemas = []
+        for impression, recipe in zip(impressions, recipes, strict=True):
+            schema = RecipeImpressionRead.model_validate(impression)
+            schema.recipe = recipe
+            schemas.append(schema)
+        return schemas
 
     async def get_user_impressions(
         self, user_id: int, skip: int = 0, limit: int = 10
@@ -45,7 +52,7 @@ class RecipeImpressionService:
             user_id=user_id, skip=skip, limit=limit
         )
 
-        impression_schemas = [await self._to_recipe_impression_schema(impression) for impression in impressions]
+        impression_schemas = await self._to_recipe_impression_schemas(list(impressions))
 
         return count, impression_schemas
 
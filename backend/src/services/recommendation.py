@@ -6,6 +6,7 @@ from src.repositories.interfaces import (
     RecsysRepositoryProtocol,
 )
 from src.schemas.recipe import RecipeReadShort
+from src.utils.recipe_images import set_recipe_image_urls
 
 logger = logging.getLogger(__name__)
 
@@ -37,23 +38,20 @@ class RecommendationService:
             recipe_ids = [rec.recipe_id for rec in recommendations]
 
             recipes = []
+            images = []
             for recipe_id in recipe_ids:
                 try:
                     recipe = await self.recipe_repository.get_by_id(recipe_id)
                     if recipe:
-                        recipe_schema = RecipeReadShort.model_validate(recipe)
-
-                        if recipe.image_path:
-                            recipe_schema.image_url = await self.recipe_image_repository.get_image_url(
-                                recipe.image_path
-                            )
-
-                        recipes.append(recipe_schema)
+                        recipes.append(RecipeReadShort.model_validate(recipe))
+                        images.append((recipe.image_path, recipe.image_widths))
 
                 except Exception:
                     logger.exception("Failed to load recipe %s for user %s", recipe_id, user_id)
                     continue
 
+            await set_recipe_image_urls(self.recipe_image_repository, recipes, images)
+
             return recipes[:limit]
 
         except Exception:
@@ -1,13 +1,45 @@
+import asyncio
+import hashlib
+from datetime import UTC, datetime
+from typing import Any
+
 from src.exceptions.recipe_search import UserIdentityNotProvidedError
 from src.models.recipe import Recipe
 from src.repositories.interfaces import (
+    FavoriteRecipeRepositoryProtocol,
     RecipeImageRepositoryProtocol,
     RecipeRepositoryProtocol,
     RecipeSearchRepositoryProtocol,
+    SearchCacheRepositoryProtocol,
+    SearchHistoryRepositoryProtocol,
     SearchQueryRepositoryProtocol,
+    SearchTrendsRepositoryProtocol,
+)
+from src.schemas.recipe import (
+    FoundRecipes,
+    RecipeReadShort,
+    RecipeSearchPage,
+    RecipeSearchQuery,
+    RecipeSearchResult,
 )
-from src.schemas.recipe import RecipeReadShort, RecipeSearchQuery
-from src.schemas.search_query import SearchQueryRead
+from src.schemas.search_query import PopularSearchQuery, SearchHistoryEntry, SearchQueryRead, SearchSuggestions
+from src.utils.recipe_images import set_recipe_image_urls
+
+
+def _to_search_query_read(entry: SearchHistoryEntry, first_searched_at: datetime | None = None) -> SearchQueryRead:
+    """
+    Response schema of a history entry.
+
+    Queries in the history may not be persisted yet, so instead of the database id they get one derived from the
+    query text. It is the same in every history, survives history merges and fits into 53 bits for JavaScript clients.
+    """
+    digest = hashlib.blake2b(entry.query.encode(), digest_size=8).digest()
+    return SearchQueryRead(
+        id=int.from_bytes(digest) & (2**53 - 1),
+        query=entry.query,
+        created_at=first_searched_at or entry.first_searched_at or entry.searched_at,
+        updated_at=entry.searched_at,
+    )
 
 
 class SearchService:
@@ -17,47 +49,135 @@ class SearchService:
         search_query_repository: SearchQueryRepositoryProtocol,
         recipe_repository: RecipeRepositoryProtocol,
         recipe_image_repository: RecipeImageRepositoryProtocol,
+        favorite_recipe_repository: FavoriteRecipeRepositoryProtocol,
+        search_cache_repository: SearchCacheRepositoryProtocol,
+        search_history_repository: SearchHistoryRepositoryProtocol,
+        search_trends_repository: SearchTrendsRepositoryProtocol,
+        *,
+        serve_from_source: bool = True,
+        search_history_size: int = 50,
     ) -> None:
         self.recipe_search_repository = recipe_search_repository
         self.search_query_repository = search_query_repository
         self.recipe_repository = recipe_repository
         self.recipe_image_repository = recipe_image_repository
+        self.favorite_recipe_repository = favorite_recipe_repository
+        self.search_cache_repository = search_cache_repository
+        self.search_history_repository = search_history_repository
+        self.search_trends_repository = search_trends_repository
+        self.serve_from_source = serve_from_source
+        self.search_history_size = search_history_size
+
+    async def _to_recipe_short_schemas(self, recipes: list[Recipe]) -> list[RecipeReadShort]:
+        schemas = [RecipeReadShort.model_validate(recipe, from_attributes=True) for recipe in recipes]
+        await set_recipe_image_urls(
+            self.recipe_image_repository, schemas, [(recipe.image_path, recipe.image_widths) for recipe in recipes]
+        )
+        return schemas
+
+    async def _documents_to_recipe_short_schemas(self, documents: list[dict[str, Any]]) -> list[RecipeReadShort]:
+        schemas = [RecipeReadShort.model_validate(document) for document in documents]
+        await set_recipe_image_urls(
+            self.recipe_image_repository,
+            schemas,
+            # documents indexed before image widths were added have no resized copies listed
+            [(document["image_path"], document.get("image_widths")) for document in documents],
+        )
+        return schemas
+
+    @staticmethod
+    def _is_complete_document(document: dict[str, Any]) -> bool:
+        # documents indexed before image_path was added to the index can't be served from the search engine
+        return "image_path" in document and "slug" in document
+
+    async def _get_recipes_from_database(self, recipe_ids: list[int]) -> list[RecipeReadShort]:
+        recipes = await self.recipe_repository.get_by_ids(recipe_ids=recipe_ids)
+        recipes_by_id = {recipe.id: recipe for recipe in recipes}
+        return await self._to_recipe_short_schemas(
+            [recipes_by_id[recipe_id] for recipe_id in recipe_ids if recipe_id in recipes_by_id]
+        )
 
-    async def _to_recipe_short_schema(self, recipe: Recipe) -> RecipeReadShort:
-        schema = RecipeReadShort.model_validate(recipe, from_attributes=True)
-        if recipe.image_path:
-            schema.image_url = await self.recipe_image_repository.get_image_url(recipe.image_path)
-        return schema
+    async def _mark_favorites(self, recipes: list[RecipeReadShort], user_id: int) -> None:
+        favorite_ids = await self.favorite_recipe_repository.get_favorite_recipe_ids(
+            user_id=user_id, recipe_ids=[recipe.id for recipe in recipes]
+        )
+        for recipe in recipes:
+            recipe.is_on_favorites = recipe.id in favorite_ids
 
     async def search(
         self,
         params: RecipeSearchQuery,
         user_id: int | None = None,
         anonymous_user_id: int | None = None,
-    ) -> tuple[int, list[RecipeReadShort]]:
+        *,
+        with_facets: bool = False,
+    ) -> FoundRecipes:
         """
         Search recipes by different criteria using search engine.
 
-        If user/anonymous_user is provided, it will be saved in the database for displaying user history.
+        If user/anonymous_user is provided, the query is saved to the search history.
+        Results are built from the documents returned by the search engine, Postgres is queried only for per-user
+        fields (favorites) or when `serve_from_source` is disabled or documents lack required fields.
+        Pages of repeated queries are taken from the cache without querying the search engine and hydrated
+        from Postgres. In cursor mode the cursor of the next page is returned, total is counted on the first page only.
+        With `with_facets` filter counts are returned along with the page.
         """
-        # Save search query if there's a query text and user identification
-        if params.query and (user_id or anonymous_user_id):
+        # Save search query if there's a query text and user identification, following cursor pages repeat it
+        if params.query and params.cursor is None and (user_id or anonymous_user_id):
             await self.save_search_query(
                 query_text=params.query,
                 user_id=user_id,
                 anonymous_user_id=anonymous_user_id,
             )
 
-        total, recipe_ids = await self.recipe_search_repository.search_recipes(params)
-        recipes = await self.recipe_repository.get_by_ids(recipe_ids=recipe_ids)
-        recipes_short = [await self._to_recipe_short_schema(recipe) for recipe in recipes]
-        return total, recipes_short
+        if params.is_cursor_mode:
+            # cursor pages belong to a point in time of a single client, so they are never cached
+            result = await self.recipe_search_repository.search_recipes(params, with_facets=with_facets)
+            found = FoundRecipes(
+                total=result.total,
+                recipes=await self._get_recipes_from_search_result(result),
+                next_cursor=result.next_cursor,
+                facets=result.facets,
+            )
+        else:
+            found = await self._search_page(params, with_facets=with_facets)
+
+        if user_id and found.recipes:
+            await self._mark_favorites(found.recipes, user_id)
+
+        return found
+
+    async def _search_page(self, params: RecipeSearchQuery, *, with_facets: bool) -> FoundRecipes:
+        cache_key = await self.search_cache_repository.build_key(params, with_facets=with_facets)
+        cached_page = await self.search_cache_repository.get(cache_key)
+        if cached_page is not None:
+            return FoundRecipes(
+                total=cached_page.total,
+                recipes=await self._get_recipes_from_database(cached_page.recipe_ids),
+                facets=cached_page.facets,
+            )
+
+        result = await self.recipe_search_repository.search_recipes(params, with_facets=with_facets)
+        total = result.total or 0
+        await self.search_cache_repository.set(
+            cache_key, RecipeSearchPage(total=total, recipe_ids=result.recipe_ids, facets=result.facets)
+        )
+        return FoundRecipes(
+            total=total, recipes=await self._get_recipes_from_search_result(result), facets=result.facets
+        )
+
+    async def _get_recipes_from_search_result(self, result: RecipeSearchResult) -> list[RecipeReadShort]:
+        if self.serve_from_source and all(self._is_complete_document(document) for document in result.documents):
+            return await self._documents_to_recipe_short_schemas(result.documents)
+        return await self._get_recipes_from_database(result.recipe_ids)
 
     async def save_search_query(
         self, query_text: str, user_id: int | None = None, anonymous_user_id: int | None = None
     ) -> SearchQueryRead:
         """
-        Save a search query to the database for history tracking.
+        Save a search query to the search history.
+
+        The query is written to Redis only, a background job persists it to the database in batches.
 
         Args:
             query_text: The search query text
@@ -75,12 +195,34 @@ class SearchService:
             msg = "Either user_id or anonymous_user_id must be provided"
             raise UserIdentityNotProvidedError(msg)
 
-        search_query = await self.search_query_repository.save_search_query(
-            query_text=query_text,
+        entry = SearchHistoryEntry(
+            query=query_text,
             user_id=user_id,
-            anonymous_user_id=anonymous_user_id,
+            anonymous_user_id=None if user_id else anonymous_user_id,
+            searched_at=datetime.now(UTC),
+        )
+        first_searched_at, _ = await asyncio.gather(
+            self.search_history_repository.add(entry),
+            self.search_trends_repository.increment(entry.query, entry.searched_at),
+        )
+        return _to_search_query_read(entry, first_searched_at)
+
+    async def suggest(self, prefix: str, limit: int = 5) -> SearchSuggestions:
+        """
+        Suggest recipes, tags and popular queries for a partially typed search query.
+
+        The search engine and search trends are queried concurrently.
+        """
+        suggestions, popular_queries = await asyncio.gather(
+            self.recipe_search_repository.suggest(prefix, limit),
+            self.search_trends_repository.get_top(limit, prefix=prefix),
         )
-        return SearchQueryRead.model_validate(search_query, from_attributes=True)
+        suggestions.queries = [popular_query.query for popular_query in popular_queries]
+        return suggestions
+
+    async def get_popular_queries(self, limit: int = 10) -> list[PopularSearchQuery]:
+        """Get the most frequent search queries of the recent hours, most popular first."""
+        return await self.search_trends_repository.get_top(limit)
 
     async def get_search_history(
         self, user_id: int | None = None, anonymous_user_id: int | None = None, limit: int = 10, offset: int = 0
@@ -88,6 +230,8 @@ class SearchService:
         """
         Get search history for a user or anonymous user.
 
+        History is served from Redis, it is loaded from the database on the first request after it expired.
+
         Args:
             user_id: ID of authenticated user
             anonymous_user_id: ID of anonymous user
@@ -95,23 +239,48 @@ class SearchService:
             offset: Number of search queries to skip for pagination (default: 0)
 
         Returns:
-            List of search queries ordered by creation date (newest first)
+            List of search queries ordered by the time of the last search (newest first)
 
         Raises:
             UserIdentityNotProvidedError: If neither user_id nor anonymous_user_id is provided
 
         """
+        if not (user_id or anonymous_user_id):
+            msg = "Either user_id or anonymous_user_id must be provided"
+            raise UserIdentityNotProvidedError(msg)
+        if user_id:
+            anonymous_user_id = None
+
+        entries = await self.search_history_repository.get(user_id, anonymous_user_id, limit, offset)
+        if entries is None:
+            await self._load_search_history(user_id, anonymous_user_id)
+            entries = await self.search_history_repository.get(user_id, anonymous_user_id, limit, offset) or []
+
+        return [_to_search_query_read(entry) for entry in entries]
+
+    async def _load_search_history(self, user_id: int | None, anonymous_user_id: int | None) -> None:
         if user_id:
-            search_queries = await self.search_query_repository.get_user_search_history(user_id, limit, offset)
+            search_queries = await self.search_query_repository.get_user_search_history(
+                user_id, self.search_history_size
+            )
         elif anonymous_user_id:
             search_queries = await self.search_query_repository.get_anonymous_search_history(
-                anonymous_user_id, limit, offset
+                anonymous_user_id, self.search_history_size
             )
         else:
-            msg = "Either user_id or anonymous_user_id must be provided"
-            raise UserIdentityNotProvidedError(msg)
+            return
 
-        return [SearchQueryRead.model_validate(query, from_attributes=True) for query in search_queries]
+        entries = [
+            SearchHistoryEntry(
+                query=search_query.query,
+                user_id=user_id,
+                anonymous_user_id=anonymous_user_id,
+                searched_at=search_query.updated_at or search_query.created_at,
+                first_searched_at=search_query.created_at,
+            )
+            for search_query in search_queries
+        ]
+        await self.search_history_repository.fill(user_id, anonymous_user_id, entries)
 
     async def merge_search_queries(self, anonymous_user_id: int, user_id: int) -> None:
         """
@@ -123,3 +292,4 @@ class SearchService:
 
         """
         await self.search_query_repository.merge_search_queries(anonymous_user_id=anonymous_user_id, user_id=user_id)
+        await self.search_history_repository.merge(anonymous_user_id=anonymous_user_id, user_id=user_id)
@@ -1,17 +1,32 @@
+import asyncio
+from concurrent.futures import Executor
+
 from argon2 import PasswordHasher
 from argon2.exceptions import VerificationError
 
 
 class SecurityService:
-    hasher = PasswordHasher()
+    """
+    Password hashing with Argon2.
+
+    Hashing takes tens of milliseconds of CPU, so it runs in a bounded pool instead of the event loop. argon2-cffi
+    releases the GIL while hashing, so threads of the pool hash in parallel with each other and with the loop.
+    """
 
-    @classmethod
-    def verify_password(cls, plain_password: str, hashed_password: str) -> bool:
+    def __init__(self, hasher: PasswordHasher, executor: Executor) -> None:
+        self.hasher = hasher
+        self.executor = executor
+
+    def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
         try:
-            return cls.hasher.verify(hashed_password, plain_password)
+            return self.hasher.verify(hashed_password, plain_password)
         except VerificationError:
             return False
 
-    @classmethod
-    def get_password_hash(cls, password: str) -> str:
-        return cls.hasher.hash(password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._verify_password, plain_password, hashed_password)
+
+    async def get_password_hash(self, password: str) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.hasher.hash, password)
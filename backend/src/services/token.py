@@ -9,10 +9,14 @@ from src.exceptions.auth import (
     InvalidTokenError,
     JWTSignatureExpiredError,
 )
-from src.models.token import RefreshToken
 from src.models.user import User
-from src.repositories.interfaces import RefreshTokenRepositoryProtocol, UserRepositoryProtocol
-from src.schemas.token import Token
+from src.repositories.interfaces import (
+    RefreshTokenRepositoryProtocol,
+    UserRepositoryProtocol,
+    UserSnapshotRepositoryProtocol,
+)
+from src.schemas.token import CachedRefreshToken, Token
+from src.schemas.user import UserSnapshot
 
 
 class TokenService:
@@ -20,9 +24,11 @@ class TokenService:
         self,
         refresh_token_repository: RefreshTokenRepositoryProtocol,
         user_repository: UserRepositoryProtocol,
+        user_snapshot_repository: UserSnapshotRepositoryProtocol,
     ) -> None:
         self.refresh_token_repository = refresh_token_repository
         self.user_repository = user_repository
+        self.user_snapshot_repository = user_snapshot_repository
 
     def create_access_token(self, data: dict, expires_delta: timedelta | None = None) -> str:
         to_encode = data.copy()
@@ -48,6 +54,12 @@ class TokenService:
             raise InvalidJWTError(msg) from None
 
     async def get_current_user(self, token: str | None) -> User:
+        """
+        User of the access token built from the cached snapshot of the user.
+
+        The returned user is not attached to the session and holds only the snapshot fields, services load anything
+        else by its id.
+        """
         if not token:
             msg = "Could not validate credentials: no scheme or token in Authorization header"
             raise InvalidTokenError(msg)
@@ -59,12 +71,18 @@ class TokenService:
             raise InvalidTokenError(msg)
 
         user_id = int(user_id_str)
-        user = await self.user_repository.get(user_id)
-        if not user or not user.is_active:
+        snapshot = await self.user_snapshot_repository.get(user_id)
+        if snapshot is None:
+            user = await self.user_repository.get(user_id)
+            if user:
+                snapshot = UserSnapshot.model_validate(user)
+                await self.user_snapshot_repository.set(snapshot)
+
+        if not snapshot or not snapshot.is_active:
             msg = "Could not validate credentials: user is inactive or user does not exists"
             raise InactiveOrNotExistingUserError(msg)
 
-        return user
+        return User(**snapshot.model_dump())
 
     async def create_tokens(self, user_id: int) -> Token:
         access_token = self.create_access_token(data={"sub": str(user_id)})
@@ -73,12 +91,11 @@ class TokenService:
             expires_delta=timedelta(days=settings.jwt.refresh_token_expire_days),
         )
 
+        expires_at = datetime.now(tz=UTC) + timedelta(days=settings.jwt.refresh_token_expire_days)
         await self.refresh_token_repository.cache_refresh_token(
             token=refresh_token,
-            expires_in=settings.jwt.refresh_token_expire_days * 24 * 60 * 60,
+            cached_token=CachedRefreshToken(user_id=user_id, expires_at=expires_at),
         )
-
-        expires_at = datetime.now(tz=UTC) + timedelta(days=settings.jwt.refresh_token_expire_days)
         await self.refresh_token_repository.create(
             user_id=user_id,
             token=refresh_token,
@@ -95,46 +112,49 @@ class RefreshTokenService:
     def __init__(self, refresh_token_repository: RefreshTokenRepositoryProtocol) -> None:
         self.refresh_token_repository = refresh_token_repository
 
-    async def verify_refresh_token(self, token: str) -> RefreshToken:
-        token_in_cache = await self.refresh_token_repository.get_cached_refresh_token(token)
-        if not token_in_cache:
-            msg = "Invalid refresh token"
-            raise InvalidTokenError(msg)
+    async def verify_refresh_token(self, token: str) -> CachedRefreshToken:
+        cached_token = await self.refresh_token_repository.get_cached_refresh_token(token)
+        if cached_token:
+            return cached_token
 
+        # entries are lost when Redis restarts or evicts keys, tokens stored in Postgres stay valid
         refresh_token = await self.refresh_token_repository.get_by_token(token)
         if not refresh_token:
             msg = "Invalid refresh token"
             raise InvalidTokenError(msg)
 
-        return refresh_token
-
-    async def update_token(self, refresh_token: RefreshToken, new_token: str, new_expires_at: datetime) -> RefreshToken:
-        await self.refresh_token_repository.update(refresh_token, new_token=new_token, new_expires_at=new_expires_at)
-        return refresh_token
+        cached_token = CachedRefreshToken(user_id=refresh_token.user_id, expires_at=refresh_token.expires_at)
+        await self.refresh_token_repository.cache_refresh_token(token, cached_token)
+        return cached_token
 
-    async def deactivate(self, refresh_token: RefreshToken) -> None:
-        await self.refresh_token_repository.deactivate(refresh_token)
+    async def deactivate(self, token: str) -> None:
+        await self.refresh_token_repository.deactivate(token)
+        await self.refresh_token_repository.delete_cached_refresh_token(token)
 
     async def generate_new_refresh_token(self, refresh_token_str: str, token_service: TokenService) -> Token:
-        refresh_token_model = await self.verify_refresh_token(refresh_token_str)
+        cached_token = await self.verify_refresh_token(refresh_token_str)
 
-        access_token = token_service.create_access_token(data={"sub": str(refresh_token_model.user_id)})
+        access_token = token_service.create_access_token(data={"sub": str(cached_token.user_id)})
         new_refresh_token = token_service.create_access_token(
-            data={"sub": str(refresh_token_model.user_id)},
+            data={"sub": str(cached_token.user_id)},
             expires_delta=timedelta(days=settings.jwt.refresh_token_expire_days),
         )
 
         expires_at = datetime.now(tz=UTC) + timedelta(days=settings.jwt.refresh_token_expire_days)
-        await self.update_token(
-            refresh_token=refresh_token_model,
+        rotated = await self.refresh_token_repository.rotate(
+            refresh_token_str,
             new_token=new_refresh_token,
             new_expires_at=expires_at,
         )
-
         await self.refresh_token_repository.delete_cached_refresh_token(refresh_token_str)
+        if not rotated:
+            # the token was used by a concurrent request or deactivated after it was cached
+            msg = "Invalid refresh token"
+            raise InvalidTokenError(msg)
+
         await self.refresh_token_repository.cache_refresh_token(
             token=new_refresh_token,
-            expires_in=settings.jwt.refresh_token_expire_days * 24 * 60 * 60,
+            cached_token=CachedRefreshToken(user_id=cached_token.user_id, expires_at=expires_at),
         )
 
         return Token(
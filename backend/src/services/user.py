@@ -15,6 +15,7 @@ from src.repositories.interfaces import (
     UserAvatarRepositoryProtocol,
     UserProfileRepositoryProtocol,
     UserRepositoryProtocol,
+    UserSnapshotRepositoryProtocol,
 )
 from src.schemas.user import UserProfileUpdate, UserRead
 from src.services.security import SecurityService
@@ -27,11 +28,15 @@ class UserService:
         user_profile_repository: UserProfileRepositoryProtocol,
         banned_email_repository: BannedEmailRepositoryProtocol,
         user_avatar_repository: UserAvatarRepositoryProtocol,
+        user_snapshot_repository: UserSnapshotRepositoryProtocol,
+        security_service: SecurityService,
     ) -> None:
         self.user_repository = user_repository
         self.user_profile_repository = user_profile_repository
         self.banned_email_repository = banned_email_repository
         self.user_avatar_repository = user_avatar_repository
+        self.user_snapshot_repository = user_snapshot_repository
+        self.security_service = security_service
 
     async def get(self, user_id: int) -> UserRead:
         user = await self.user_repository.get_with_profile(user_id)
@@ -106,7 +111,7 @@ class UserService:
             msg = "User not found"
             raise UserNotFoundError(msg)
 
-        if not SecurityService.verify_password(password, user.hashed_password):
+        if not await self.security_service.verify_password(password, user.hashed_password):
             msg = "Incorrect email/username or password"
             raise IncorrectCredentialsError(msg)
 
@@ -159,8 +164,17 @@ class UserService:
         user = cast("User", await self.user_repository.get_with_profile(user_id))
         return await self._to_user_model(user)
 
+    async def forget_snapshot(self, user_id: int) -> None:
+        """
+        Drop the cached snapshot of the user, so the next request loads the user again.
+
+        Called once the change is committed, otherwise a concurrent request could cache the old row again.
+        """
+        await self.user_snapshot_repository.invalidate(user_id)
+
     async def _to_user_model(self, user: User) -> UserRead:
         model = UserRead.model_validate(user, from_attributes=True)
         if model.profile and model.profile.avatar_url:
-            model.profile.avatar_url = await self.user_avatar_repository.get_avatar_presigned_url(user.id)
+            # the profile already holds the object key of the avatar, so it is signed without querying it again
+            model.profile.avatar_url = await self.user_avatar_repository.get_avatar_file_url(model.profile.avatar_url)
         return UserRead.model_validate(model, from_attributes=True)
@@ -0,0 +1,37 @@
+import io
+
+from PIL import Image
+
+# signatures of image formats accepted from users, WebP is a RIFF container with its own tag at offset 8
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def detect_image_type(header: bytes) -> str | None:
+    """Content type of the image by the magic bytes at the start of the file, `None` for unsupported files."""
+    for signature, content_type in _IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return content_type
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def downscale_image(content: bytes, max_side: int) -> bytes:
+    """
+    Shrink the image so that neither side exceeds `max_side`, keeping its format.
+
+    Images which already fit are returned as is. CPU bound, so it is meant to run in a thread.
+    """
+    with Image.open(io.BytesIO(content)) as image:
+        if max(image.size) <= max_side:
+            return content
+        image_format = image.format
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, format=image_format)
+        return buffer.getvalue()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import io
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING
+
+from PIL import Image, ImageOps
+
+from src.schemas.recipe import RecipeImageVariant
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from src.repositories.interfaces import RecipeImageRepositoryProtocol
+    from src.schemas.recipe import RecipeReadShort
+
+
+def image_derivative_path(image_path: str, width: int) -> str:
+    """Path of the resized WebP copy stored next to the original, e.g. `recipes/1/main_640.webp`."""
+    path = PurePosixPath(image_path)
+    return str(path.with_name(f"{path.stem}_{width}.webp"))
+
+
+def is_recipe_image_path(image_path: str, recipe_id: int, *, instruction: bool = False) -> bool:
+    """
+    Whether the path is under the prefix of keys issued for the recipe images, or its instruction images.
+
+    Paths are sent by clients, so only keys under this prefix are ever read, resized or deleted for the recipe.
+    """
+    prefix = f"recipes/{recipe_id}/instructions/" if instruction else f"recipes/{recipe_id}/"
+    if not image_path.startswith(prefix):
+        return False
+    return all(part not in {"", ".", ".."} for part in image_path.removeprefix(prefix).split("/"))
+
+
+def make_webp_derivatives(content: bytes, widths: Sequence[int], quality: int = 80) -> dict[int, bytes]:
+    """
+    Resize the image to every width narrower than the original and encode the copies as WebP.
+
+    CPU bound, so it is meant to run in a thread: Pillow releases the GIL while resizing and encoding.
+    """
+    with Image.open(io.BytesIO(content)) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in {"RGB", "RGBA"}:
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+        derivatives = {}
+        for width in sorted(set(widths)):
+            # images are never upscaled, clients fall back to the original for wider slots
+            if width >= image.width:
+                break
+            height = max(1, round(image.height * width / image.width))
+            buffer = io.BytesIO()
+            image.resize((width, height), Image.Resampling.LANCZOS).save(buffer, format="WEBP", quality=quality)
+            derivatives[width] = buffer.getvalue()
+        return derivatives
+
+
+async def set_recipe_image_urls(
+    recipe_image_repository: RecipeImageRepositoryProtocol,
+    schemas: Sequence[RecipeReadShort],
+    images: Sequence[tuple[str | None, Sequence[int] | None]],
+) -> None:
+    """Sign original images and their resized copies of all recipes in one batch, `images` are (path, widths) pairs."""
+    paths: list[str | None] = []
+    for image_path, image_widths in images:
+        paths.append(image_path)
+        if image_path:
+            paths.extend(image_derivative_path(image_path, width) for width in image_widths or ())
+
+    urls = iter(await recipe_image_repository.get_image_urls(paths))
+    for schema, (image_path, image_widths) in zip(schemas, images, strict=True):
+        image_url = next(urls)
+        if not image_path:
+            continue
+        schema.image_url = image_url
+        schema.image_variants = [
+            RecipeImageVariant(width=width, url=url) for width, url in zip(image_widths or (), urls, strict=False)
+        ]
@@ -0,0 +1,14 @@
+from typing import Any
+
+from src.models.recipe import Recipe
+from src.schemas.recipe import RecipeRead
+
+
+def serialize_recipe_for_search(recipe: Recipe) -> dict[str, Any]:
+    """Serialize recipe loaded with ingredients, tags and impressions count into search index data."""
+    recipe_data = RecipeRead.model_validate(recipe, from_attributes=True).model_dump(
+        exclude={"updated_at", "instructions", "image_url", "image_variants", "is_on_favorites"}
+    )
+    recipe_data["image_path"] = recipe.image_path
+    recipe_data["image_widths"] = recipe.image_widths
+    return recipe_data
@@ -0,0 +1,88 @@
+"""
+Warm search caches up with the most frequent historical queries.
+
+Queries searched most often during the recent days are executed through the search service the way the search
+endpoint runs them, so result pages land in the search cache and Elasticsearch loads the data they touch.
+Only a few queries run at a time with a pause after each one, so warming does not compete with user traffic.
+
+Usage: python -m src.warmup [--queries 100] [--days 7] [--concurrency 2] [--pause 0.1]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+
+from dishka import AsyncContainer
+from elasticsearch import AsyncElasticsearch
+from elasticsearch.dsl import async_connections
+
+from src.core.config import settings
+from src.core.di import container
+from src.repositories.interfaces import SearchQueryRepositoryProtocol
+from src.schemas.recipe import RecipeSearchQuery
+from src.services.search import SearchService
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_search(
+    app_container: AsyncContainer, queries: int, days: int, concurrency: int, pause_seconds: float = 0.1
+) -> int:
+    """Execute the first result page of frequent queries, return the number of warmed queries."""
+    async with app_container() as request_container:
+        search_query_repository = await request_container.get(SearchQueryRepositoryProtocol)
+        frequent_queries = await search_query_repository.get_frequent_queries(
+            since=datetime.now(UTC) - timedelta(days=days), limit=queries
+        )
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def warm_up_query(query: str) -> bool:
+        async with semaphore:
+            try:
+                # every query gets its own session, so loaded recipes do not pile up in the identity map
+                async with app_container() as request_container:
+                    search_service = await request_container.get(SearchService)
+                    await search_service.search(RecipeSearchQuery(query=query))
+            except Exception:
+                logger.exception("Failed to warm up search query %r", query)
+                return False
+            finally:
+                await asyncio.sleep(pause_seconds)
+            return True
+
+    started = time.perf_counter()
+    warmed = sum(await asyncio.gather(*(warm_up_query(query) for query in frequent_queries)))
+    logger.info(
+        "Warmed up %s of %s search queries in %.1fs", warmed, len(frequent_queries), time.perf_counter() - started
+    )
+    return warmed
+
+
+def parse_args() -> argparse.Namespace:
+    config = settings.elasticsearch
+    parser = argparse.ArgumentParser(description="Warm search caches up with frequent historical queries")
+    parser.add_argument("--queries", type=int, default=config.search_warmup_queries, help="number of queries to run")
+    parser.add_argument("--days", type=int, default=config.search_warmup_days, help="take queries of the last days")
+    parser.add_argument(
+        "--concurrency", type=int, default=config.search_warmup_concurrency, help="queries running at the same time"
+    )
+    parser.add_argument("--pause", type=float, default=0.1, help="seconds to wait after each query")
+    return parser.parse_args()
+
+
+async def run() -> None:
+    args = parse_args()
+    try:
+        es_client = await container.get(AsyncElasticsearch)
+        async_connections.add_connection("default", es_client)
+        await warm_up_search(container, args.queries, args.days, args.concurrency, args.pause)
+    finally:
+        await container.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(run())
@@ -0,0 +1,58 @@
+"""
+Recipe image processing worker.
+
+Consumes uploaded recipe images, stores their resized WebP copies next to the originals and records the widths,
+so list views can serve images sized for the slot instead of the full original.
+Resizing runs in threads, several images are processed at a time.
+
+Run with `faststream run src.workers.image_processor:app`.
+"""
+
+import logging
+
+from dishka.integrations.faststream import FromDishka, inject, setup_dishka
+from faststream.asgi import AsgiFastStream, make_ping_asgi
+from faststream.nats import NatsBroker, PullSub
+
+from src.adapters.image_processing import RECIPE_IMAGES_SUBJECT, image_processing_stream
+from src.core.config import settings
+from src.core.di import container
+from src.db.uow import SQLAlchemyUnitOfWork
+from src.schemas.image_processing import RecipeImageProcessingMessage
+from src.services.recipe_image import RecipeImageService
+
+logger = logging.getLogger(__name__)
+
+broker = NatsBroker(servers=[settings.nats.url])
+
+
+@broker.subscriber(
+    RECIPE_IMAGES_SUBJECT,
+    stream=image_processing_stream,
+    durable="image-processor",
+    pull_sub=PullSub(batch_size=settings.image_processing.max_workers),
+    max_workers=settings.image_processing.max_workers,
+)
+@inject
+async def process_recipe_image_task(
+    message: RecipeImageProcessingMessage,
+    recipe_image_service: FromDishka[RecipeImageService],
+    uow: FromDishka[SQLAlchemyUnitOfWork],
+) -> None:
+    async with uow:
+        widths = await recipe_image_service.generate_image_variants(message.recipe_id, message.image_path)
+        await uow.commit()
+
+    if widths is None:
+        logger.info("Skipped image %s of recipe %s", message.image_path, message.recipe_id)
+    else:
+        logger.info("Stored %s resized copies of recipe %s image", len(widths), message.recipe_id)
+
+
+app = AsgiFastStream(
+    broker,
+    asgi_routes=[
+        ("/health", make_ping_asgi(broker, timeout=5.0)),
+    ],
+)
+setup_dishka(container, app=app)
@@ -0,0 +1,178 @@
+"""
+Periodic background jobs.
+
+Every job runs in its own loop and gets the application container to open request scopes from,
+a failed run is logged and retried after the job interval.
+
+Run with `python -m src.workers.jobs`.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from dishka import AsyncContainer
+from sqlalchemy.exc import IntegrityError
+
+from src.core.config import settings
+from src.core.di import container
+from src.db.uow import SQLAlchemyUnitOfWork
+from src.repositories.interfaces import (
+    AnonymousUserCacheRepositoryProtocol,
+    AnonymousUserRepositoryProtocol,
+    RefreshTokenRepositoryProtocol,
+    SearchHistoryRepositoryProtocol,
+    SearchQueryRepositoryProtocol,
+)
+from src.schemas.search_query import SearchHistoryEntry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class PeriodicJob:
+    name: str
+    func: Callable[[AsyncContainer], Awaitable[None]]
+    interval_seconds: float
+
+
+async def _save_search_queries(request_container: AsyncContainer, entries: list[SearchHistoryEntry]) -> None:
+    search_query_repository = await request_container.get(SearchQueryRepositoryProtocol)
+    uow = await request_container.get(SQLAlchemyUnitOfWork)
+    async with uow:
+        await search_query_repository.save_search_queries(entries)
+        await uow.commit()
+
+
+async def _save_search_queries_one_by_one(
+    app_container: AsyncContainer,
+    search_history_repository: SearchHistoryRepositoryProtocol,
+    entries: list[SearchHistoryEntry],
+) -> None:
+    # the user or anonymous user of a query might be deleted already, such queries are dropped
+    dropped = 0
+    for saved, entry in enumerate(entries):
+        try:
+            async with app_container() as request_container:
+                await _save_search_queries(request_container, [entry])
+        except IntegrityError:
+            dropped += 1
+        except Exception:
+            # entries are already popped from Redis, the ones not saved yet are put back for the next run
+            await search_history_repository.requeue(entries[saved:])
+            raise
+    if dropped:
+        logger.warning("Dropped %s search queries of deleted users", dropped)
+
+
+async def flush_search_history(app_container: AsyncContainer) -> None:
+    """Persist search queries queued in Redis to the database in batches until the queue is empty."""
+    batch_size = settings.search_history.flush_batch_size
+    async with app_container() as request_container:
+        search_history_repository = await request_container.get(SearchHistoryRepositoryProtocol)
+
+        while entries := await search_history_repository.pop_pending(batch_size):
+            try:
+                # every batch gets its own session, so a failed batch does not affect the following ones
+                async with app_container() as batch_container:
+                    await _save_search_queries(batch_container, entries)
+            except IntegrityError:
+                await _save_search_queries_one_by_one(app_container, search_history_repository, entries)
+            except Exception:
+                await search_history_repository.requeue(entries)
+                raise
+            logger.info("Saved %s search queries", len(entries))
+
+            if len(entries) < batch_size:
+                return
+
+
+async def _delete_in_batches(
+    app_container: AsyncContainer, delete_batch: Callable[[AsyncContainer, int], Awaitable[int]]
+) -> int:
+    """
+    Run `delete_batch` until it deletes less than a batch.
+
+    Every batch gets its own request scope and commits on its own to keep locks short.
+    """
+    batch_size = settings.cleanup.batch_size
+    deleted = 0
+    while True:
+        async with app_container() as request_container:
+            batch_deleted = await delete_batch(request_container, batch_size)
+        deleted += batch_deleted
+        if batch_deleted < batch_size:
+            return deleted
+        await asyncio.sleep(settings.cleanup.batch_pause_seconds)
+
+
+async def _delete_expired_refresh_tokens(request_container: AsyncContainer, limit: int) -> int:
+    refresh_token_repository = await request_container.get(RefreshTokenRepositoryProtocol)
+    uow = await request_container.get(SQLAlchemyUnitOfWork)
+    async with uow:
+        deleted = await refresh_token_repository.delete_expired(limit)
+        await uow.commit()
+    return deleted
+
+
+async def _delete_inactive_anonymous_users(request_container: AsyncContainer, limit: int) -> int:
+    anonymous_user_repository = await request_container.get(AnonymousUserRepositoryProtocol)
+    anonymous_user_cache_repository = await request_container.get(AnonymousUserCacheRepositoryProtocol)
+    uow = await request_container.get(SQLAlchemyUnitOfWork)
+    inactive_since = datetime.now(UTC) - timedelta(days=settings.cleanup.anonymous_user_inactive_days)
+    async with uow:
+        cookie_ids = await anonymous_user_repository.delete_inactive(inactive_since, limit)
+        await uow.commit()
+    # requests with a cached deleted user would fail on foreign keys, the cache is dropped after the commit,
+    # so a concurrent request can not cache the user again from the not yet committed row
+    await asyncio.gather(*(anonymous_user_cache_repository.invalidate(cookie_id) for cookie_id in cookie_ids))
+    return len(cookie_ids)
+
+
+async def delete_stale_data(app_container: AsyncContainer) -> None:
+    """
+    Delete expired and deactivated refresh tokens and anonymous users inactive for the configured number of days.
+
+    Impressions, search queries and consents of anonymous users are deleted along with them.
+    """
+    deleted_tokens = await _delete_in_batches(app_container, _delete_expired_refresh_tokens)
+    deleted_anonymous_users = await _delete_in_batches(app_container, _delete_inactive_anonymous_users)
+    logger.info("Deleted %s refresh tokens and %s anonymous users", deleted_tokens, deleted_anonymous_users)
+
+
+JOBS = [
+    PeriodicJob(
+        name="flush_search_history",
+        func=flush_search_history,
+        interval_seconds=settings.search_history.flush_interval_seconds,
+    ),
+    PeriodicJob(
+        name="delete_stale_data",
+        func=delete_stale_data,
+        interval_seconds=settings.cleanup.interval_seconds,
+    ),
+]
+
+
+async def run_periodically(job: PeriodicJob) -> None:
+    while True:
+        try:
+            await job.func(container)
+        except Exception:
+            logger.exception("Job %s failed", job.name)
+        await asyncio.sleep(job.interval_seconds)
+
+
+async def main() -> None:
+    logger.info("Starting jobs: %s", ", ".join(job.name for job in JOBS))
+    try:
+        await asyncio.gather(*(run_periodically(job) for job in JOBS))
+    finally:
+        await container.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(main())
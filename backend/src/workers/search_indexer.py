@@ -0,0 +1,62 @@
+"""
+Search indexing worker.
+
+Consumes queued recipe index writes in batches and applies them with the Elasticsearch bulk API.
+Operations that still fail after retries are moved to the dead letter subject for inspection.
+
+Run with `faststream run src.workers.search_indexer:app`.
+"""
+
+import logging
+
+from dishka.integrations.faststream import FromDishka, inject, setup_dishka
+from faststream.asgi import AsgiFastStream, make_ping_asgi
+from faststream.nats import NatsBroker, PullSub
+
+from src.adapters.search.indexing import (
+    RECIPES_DEAD_LETTER_SUBJECT,
+    RECIPES_INDEXING_SUBJECT,
+    search_indexing_stream,
+)
+from src.core.config import settings
+from src.core.di import container
+from src.repositories.interfaces import RecipeSearchRepositoryProtocol
+from src.schemas.search_indexing import RecipeIndexingMessage
+
+logger = logging.getLogger(__name__)
+
+broker = NatsBroker(servers=[settings.nats.url])
+dead_letter_publisher = broker.publisher(RECIPES_DEAD_LETTER_SUBJECT, stream=search_indexing_stream)
+
+
+@broker.subscriber(
+    RECIPES_INDEXING_SUBJECT,
+    stream=search_indexing_stream,
+    durable="search-indexer",
+    pull_sub=PullSub(
+        batch_size=settings.elasticsearch.indexing_batch_size,
+        timeout=settings.elasticsearch.indexing_batch_timeout,
+        batch=True,
+    ),
+)
+@inject
+async def index_recipes_task(
+    messages: list[RecipeIndexingMessage],
+    recipe_search_repository: FromDishka[RecipeSearchRepositoryProtocol],
+) -> None:
+    failed = await recipe_search_repository.bulk_write(
+        messages, max_retries=settings.elasticsearch.indexing_max_retries
+    )
+    for message in failed:
+        await dead_letter_publisher.publish(message.model_dump(mode="json"))
+
+    logger.info("Applied %s search index operations, %s dead lettered", len(messages) - len(failed), len(failed))
+
+
+app = AsgiFastStream(
+    broker,
+    asgi_routes=[
+        ("/health", make_ping_asgi(broker, timeout=5.0)),
+    ],
+)
+setup_dishka(container, app=app)
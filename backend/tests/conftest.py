@@ -2,6 +2,12 @@ import logging
 
 import pytest
 from elasticsearch import AsyncElasticsearch
+from redis.asyncio import Redis
+
+from src.repositories.anonymous_user_cache import LocalAnonymousUserCache
+from src.repositories.interfaces import SearchCacheRepositoryProtocol
+from src.repositories.rate_limit import LocalRateLimitBlocks
+from src.repositories.user_snapshot import LocalUserSnapshotCache
 
 logger = logging.getLogger(__name__)
 
@@ -35,5 +41,25 @@ async def cleanup_elasticsearch_indices(test_dishka_container):
                         )
                 except Exception:
                     logger.exception("Failed to clean Elasticsearch index %s", index_pattern)
+
+            search_cache_repository = await request_container.get(SearchCacheRepositoryProtocol)
+            await search_cache_repository.invalidate()
+
+            # ids restart in every test, so search history, user snapshots and cached anonymous users would leak into
+            # the next test, all tests come from one address, so rate limits are reset as well
+            redis: Redis = await request_container.get(Redis)
+            (await request_container.get(LocalUserSnapshotCache)).clear()
+            (await request_container.get(LocalAnonymousUserCache)).clear()
+            (await request_container.get(LocalRateLimitBlocks)).clear()
+            for pattern in (
+                "search_history:*",
+                "search_trends:*",
+                "user_snapshot:*",
+                "anonymous_user:*",
+                "rate_limit:*",
+            ):
+                keys = [key async for key in redis.scan_iter(match=pattern)]
+                if keys:
+                    await redis.delete(*keys)
     except Exception:
         logger.exception("Failed to get Elasticsearch client for cleanup")
@@ -65,6 +65,24 @@ class TestRecipeCreation:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
         assert response.json()["error_key"] == "invalid_token"
 
+    async def test_create_recipe_foreign_image_path_rejected(
+        self, api_client: AsyncClient, auth_headers: dict[str, str]
+    ):
+        recipe_data = {
+            "title": "Test Recipe",
+            "short_description": "Test description",
+            "difficulty": "EASY",
+            "cook_time_minutes": 30,
+            "ingredients": [{"name": "Test", "quantity": "1 piece"}],
+            "tags": [{"name": "test"}],
+            "image_path": "avatars/1.png",
+        }
+
+        response = await api_client.post("/v1/recipes/", json=recipe_data, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["error_key"] == "invalid_image_path"
+
     @pytest.mark.parametrize(
         ("field", "value"),
         [
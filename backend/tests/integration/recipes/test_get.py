@@ -1,7 +1,17 @@
+import io
+
 import pytest
 from dirty_equals import IsDatetime, IsInt, IsStr, IsUrl
+from dishka import AsyncContainer
 from fastapi import status
 from httpx import AsyncClient
+from PIL import Image
+
+from src.adapters.storage import S3Storage
+from src.db.uow import SQLAlchemyUnitOfWork
+from src.repositories.interfaces import RecipeRepositoryProtocol
+from src.services.recipe_image import RecipeImageService
+from tests.fixtures.recipes import RecipeFabricProtocol
 
 pytestmark = pytest.mark.asyncio(loop_scope="session")
 
@@ -99,3 +109,58 @@ class TestRecipeRetrieval:
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
         assert response.json()["error_key"] == "validation_error"
+
+
+class TestRecipeImageVariants:
+    async def test_get_recipes_list_returns_resized_image_variants(
+        self,
+        api_client: AsyncClient,
+        auth_headers: dict[str, str],
+        recipe_fabric: RecipeFabricProtocol,
+        test_dishka_container: AsyncContainer,
+    ):
+        recipe = await recipe_fabric(auth_headers=auth_headers, title="Layered Tiramisu")
+        image = io.BytesIO()
+        Image.new("RGB", (1000, 750), color="brown").save(image, format="PNG")
+
+        async with test_dishka_container() as request_container:
+            recipe_repository = await request_container.get(RecipeRepositoryProtocol)
+            recipe_model = await recipe_repository.get_by_id(recipe["id"])
+            assert recipe_model
+            assert recipe_model.image_path
+            image_path = recipe_model.image_path
+            s3_storage = await request_container.get(S3Storage)
+            await s3_storage.upload_file("images", image_path, "image/png", image.getvalue())
+            recipe_image_service = await request_container.get(RecipeImageService)
+            uow = await request_container.get(SQLAlchemyUnitOfWork)
+            async with uow:
+                widths = await recipe_image_service.generate_image_variants(recipe["id"], image_path)
+                await uow.commit()
+
+        assert widths == [320, 640]
+        response = await api_client.get("/v1/recipes/")
+
+        assert response.status_code == status.HTTP_200_OK
+        [listed_recipe] = [item for item in response.json() if item["id"] == recipe["id"]]
+        assert [variant["width"] for variant in listed_recipe["image_variants"]] == widths
+        assert all(variant["url"] == IsUrl(any_http_url=True) for variant in listed_recipe["image_variants"])
+
+    async def test_image_outside_of_recipe_images_is_not_resized(
+        self, auth_headers: dict[str, str], recipe_fabric: RecipeFabricProtocol, test_dishka_container: AsyncContainer
+    ):
+        recipe = await recipe_fabric(auth_headers=auth_headers, title="Foreign Image Pie")
+        image = io.BytesIO()
+        Image.new("RGB", (1000, 750), color="brown").save(image, format="PNG")
+        foreign_image_path = "avatars/foreign.png"
+
+        async with test_dishka_container() as request_container:
+            s3_storage = await request_container.get(S3Storage)
+            await s3_storage.upload_file("images", foreign_image_path, "image/png", image.getvalue())
+            recipe_image_service = await request_container.get(RecipeImageService)
+            uow = await request_container.get(SQLAlchemyUnitOfWork)
+            async with uow:
+                widths = await recipe_image_service.generate_image_variants(recipe["id"], foreign_image_path)
+                await uow.commit()
+
+            assert widths is None
+            assert await s3_storage.download_file("images", "avatars/foreign_320.webp") is None
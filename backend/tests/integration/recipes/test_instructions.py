@@ -1,4 +1,5 @@
 import pytest
+from dirty_equals import IsStr
 from fastapi import status
 from httpx import AsyncClient
 
@@ -33,6 +34,9 @@ class TestRecipeInstructionsUploadUrls:
             assert upload_url["step_number"] == steps[i]
             assert "url" in upload_url
             assert "fields" in upload_url
+            assert upload_url["fields"]["key"] == IsStr(
+                regex=rf"^recipes/{recipe_id}/instructions/{steps[i]}/step-[0-9a-f]{{16}}\.png$"
+            )
 
     async def test_get_upload_instructions_urls_without_auth(self, api_client: AsyncClient, test_recipe: dict):
         recipe_id = test_recipe["id"]
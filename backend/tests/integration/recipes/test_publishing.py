@@ -17,14 +17,13 @@ class TestRecipePublishing:
             "ingredients": [{"name": "Test", "quantity": "1 piece"}],
             "tags": [{"name": "test"}],
             "instructions": [{"step_number": 1, "description": "Test instruction"}],
-            "image_path": "images/recipes/test/main.jpg",
         }
 
         create_response = await api_client.post("/v1/recipes/", json=recipe_data, headers=auth_headers)
         assert create_response.status_code == status.HTTP_201_CREATED
         recipe_id = create_response.json()["id"]
 
-        update_data = {"is_published": True}
+        update_data = {"image_path": f"recipes/{recipe_id}/main-test.jpg", "is_published": True}
 
         response = await api_client.patch(f"/v1/recipes/{recipe_id}", json=update_data, headers=auth_headers)
 
@@ -41,15 +40,14 @@ class TestRecipePublishing:
             "difficulty": "EASY",
             "cook_time_minutes": 30,
             "ingredients": [{"name": "Test", "quantity": "1 piece"}],
-            "tags": [{"name": "test"}],
-            "image_path": "images/recipes/test/main.jpg",
+            "instructions": [{"step_number": 1, "description": "Test instruction"}],
         }
 
         create_response = await api_client.post("/v1/recipes/", json=recipe_data, headers=auth_headers)
         assert create_response.status_code == status.HTTP_201_CREATED
         recipe_id = create_response.json()["id"]
 
-        update_data = {"is_published": True}
+        update_data = {"image_path": f"recipes/{recipe_id}/main-test.jpg", "is_published": True}
 
         response = await api_client.patch(f"/v1/recipes/{recipe_id}", json=update_data, headers=auth_headers)
 
@@ -1,7 +1,12 @@
 import pytest
+from dishka import AsyncContainer
 from fastapi import status
 from httpx import AsyncClient
 
+from src.repositories.interfaces import SearchCacheRepositoryProtocol
+from src.schemas.recipe import RecipeSearchQuery
+from src.warmup import warm_up_search
+from src.workers.jobs import flush_search_history
 from tests.fixtures.recipes import RecipeFabricProtocol
 
 pytestmark = pytest.mark.asyncio(loop_scope="session")
@@ -346,3 +351,231 @@ class TestRecipeSearch:
         assert isinstance(history, list)
         assert len(history) == 1  # Exactly one search query saved
         assert history[0]["query"] == "Test Recipe Search"
+
+    async def test_search_recipes_returns_short_recipe_fields(
+        self, api_client: AsyncClient, auth_headers: dict[str, str], recipe_fabric: RecipeFabricProtocol
+    ):
+        recipe = await recipe_fabric(auth_headers=auth_headers, title="Mushroom Risotto", cook_time_minutes=45)
+
+        response = await api_client.get("/v1/recipes/search", params={"query": "Risotto"})
+
+        assert response.status_code == status.HTTP_200_OK
+        recipes = response.json()
+        assert len(recipes) == 1
+        assert recipes[0]["id"] == recipe["id"]
+        assert recipes[0]["slug"] == recipe["slug"]
+        assert recipes[0]["cook_time_minutes"] == recipe["cook_time_minutes"]
+        assert recipes[0]["image_url"] is not None
+        assert recipes[0]["is_on_favorites"] is False
+
+    async def test_search_recipes_reuses_signed_image_urls(
+        self, api_client: AsyncClient, auth_headers: dict[str, str], recipe_fabric: RecipeFabricProtocol
+    ):
+        await recipe_fabric(auth_headers=auth_headers, title="Pumpkin Risotto")
+
+        first_response = await api_client.get("/v1/recipes/search", params={"query": "Risotto"})
+        second_response = await api_client.get("/v1/recipes/search", params={"query": "Pumpkin Risotto"})
+
+        first_image_url = first_response.json()[0]["image_url"]
+        assert first_image_url is not None
+        assert second_response.json()[0]["image_url"] == first_image_url
+
+    async def test_search_recipes_marks_favorites_for_authenticated_user(
+        self, api_client: AsyncClient, auth_headers: dict[str, str], recipe_fabric: RecipeFabricProtocol
+    ):
+        favorite_recipe = await recipe_fabric(auth_headers=auth_headers, title="Favorite Pancakes")
+        await recipe_fabric(auth_headers=auth_headers, title="Ordinary Pancakes")
+        favorite_response = await api_client.post(
+            "/v1/favorite-recipes", json={"recipe_id": favorite_recipe["id"]}, headers=auth_headers
+        )
+        assert favorite_response.status_code == status.HTTP_200_OK
+
+        response = await api_client.get("/v1/recipes/search", params={"query": "Pancakes"}, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        recipes = response.json()
+        assert len(recipes) == 2  # noqa: PLR2004
+        favorites = {recipe["id"]: recipe["is_on_favorites"] for recipe in recipes}
+        assert favorites[favorite_recipe["id"]] is True
+        assert list(favorites.values()).count(True) == 1
+
+    async def test_search_recipes_excludes_deleted_and_unpublished_recipes(
+        self, api_client: AsyncClient, auth_headers: dict[str, str], recipe_fabric: RecipeFabricProtocol
+    ):
+        deleted_recipe = await recipe_fabric(auth_headers=auth_headers, title="Deleted Lasagna")
+        unpublished_recipe = await recipe_fabric(auth_headers=auth_headers, title="Unpublished Lasagna")
+        kept_recipe = await recipe_fabric(auth_headers=auth_headers, title="Kept Lasagna")
+
+        delete_response = await api_client.delete(f"/v1/recipes/{deleted_recipe['id']}", headers=auth_headers)
+        assert delete_response.status_code == status.HTTP_204_NO_CONTENT
+        unpublish_response = await api_client.patch(
+            f"/v1/recipes/{unpublished_recipe['id']}", json={"is_published": False}, headers=auth_headers
+        )
+        assert unpublish_response.status_code == status.HTTP_200_OK
+
+        response = await api_client.get("/v1/recipes/search", params={"query": "Lasagna"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [recipe["id"] for recipe in response.json()] == [kept_recipe["id"]]
+
+    async def test_search_recipes_cached_page_reflects_unpublished_recipe(
+        self, api_client: AsyncClient, auth_headers: dict[str, str], recipe_fabric: RecipeFabricProtocol
+    ):
+        recipe = await recipe_fabric(auth_headers=auth_headers, title="Cached Goulash")
+        other_recipe = await recipe_fabric(auth_headers=auth_headers, title="Another Goulash")
+        params = {"query": "goulash"}
+
+        first_response = await api_client.get("/v1/recipes/search", params=params)
+        cached_response = await api_client.get("/v1/recipes/search", params={"query": "  GOULASH "})
+
+        assert first_response.status_code == status.HTTP_200_OK
+        assert [found["id"] for found in cached_response.json()] == [found["id"] for found in first_response.json()]
+        assert cached_response.headers["X-Total-Count"] == "2"
+
+        unpublish_response = await api_client.patch(
+            f"/v1/recipes/{recipe['id']}", json={"is_published": False}, headers=auth_headers
+        )
+        assert unpublish_response.status_code == status.HTTP_200_OK
+
+        response = await api_client.get("/v1/recipes/search", params=params)
+
+        assert [found["id"] for found in response.json()] == [other_recipe["id"]]
+        assert response.headers["X-Total-Count"] == "1"
+
+    async def test_search_recipes_cursor_pagination(
+        self, api_client: AsyncClient, auth_headers: dict[str, str], recipe_fabric: RecipeFabricProtocol
+    ):
+        recipes = [
+            await recipe_fabric(auth_headers=auth_headers, title="Cursor Dumplings"),
+            await recipe_fabric(auth_headers=auth_headers, title="Cursor Dumplings With Cherries"),
+            await recipe_fabric(auth_headers=auth_headers, title="Cursor Dumplings With Potatoes"),
+        ]
+        params = {"query": "Dumplings", "use_cursor": True, "limit": 2, "sort_by": "-created_at"}
+
+        first_response = await api_client.get("/v1/recipes/search", params=params)
+
+        assert first_response.status_code == status.HTTP_200_OK
+        assert first_response.headers["X-Total-Count"] == "3"
+        assert "X-Next-Cursor" in first_response.headers
+        assert len(first_response.json()) == 2  # noqa: PLR2004
+
+        next_response = await api_client.get(
+            "/v1/recipes/search", params={**params, "cursor": first_response.headers["X-Next-Cursor"]}
+        )
+
+        assert next_response.status_code == status.HTTP_200_OK
+        assert "X-Next-Cursor" not in next_response.headers
+        found_ids = [recipe["id"] for recipe in first_response.json() + next_response.json()]
+        assert found_ids == [recipe["id"] for recipe in reversed(recipes)]
+
+    async def test_search_recipes_malformed_cursor(self, api_client: AsyncClient):
+        response = await api_client.get("/v1/recipes/search", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["error_key"] == "invalid_search_cursor"
+
+    async def test_search_recipes_with_facets(
+        self, api_client: AsyncClient, auth_headers: dict[str, str], recipe_fabric: RecipeFabricProtocol
+    ):
+        await recipe_fabric(
+            auth_headers=auth_headers, title="Quick Borscht", cook_time_minutes=10, tags=[{"name": "Soup Night"}]
+        )
+        await recipe_fabric(
+            auth_headers=auth_headers,
+            title="Slow Borscht",
+            difficulty="HARD",
+            cook_time_minutes=90,
+            tags=[{"name": "Soup Night"}, {"name": "Weekend"}],
+        )
+
+        response = await api_client.get("/v1/recipes/search/faceted", params={"query": "Borscht"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["X-Total-Count"] == "2"
+        body = response.json()
+        assert len(body["recipes"]) == 2  # noqa: PLR2004
+        facets = body["facets"]
+        assert {bucket["key"]: bucket["count"] for bucket in facets["tags"]} == {"Soup Night": 2, "Weekend": 1}
+        assert {bucket["key"]: bucket["count"] for bucket in facets["difficulty"]} == {"EASY": 1, "HARD": 1}
+        cook_time_counts = {bucket["key"]: bucket["count"] for bucket in facets["cook_time"]}
+        assert cook_time_counts == {"0-15": 1, "16-30": 0, "31-60": 0, "61+": 1}
+
+    async def test_search_suggestions(
+        self,
+        api_client: AsyncClient,
+        auth_headers: dict[str, str],
+        recipe_fabric: RecipeFabricProtocol,
+    ):
+        recipe = await recipe_fabric(
+            auth_headers=auth_headers, title="Blueberry Muffins", tags=[{"name": "Blueberry Season"}]
+        )
+        await recipe_fabric(auth_headers=auth_headers, title="Banana Bread", tags=[{"name": "Baking"}])
+        save_response = await api_client.post(
+            "/v1/recipes/search/history", json={"query": "Blueberry pie"}, headers=auth_headers
+        )
+        assert save_response.status_code == status.HTTP_201_CREATED
+
+        response = await api_client.get("/v1/recipes/search/suggestions", params={"query": "blueb"})
+
+        assert response.status_code == status.HTTP_200_OK
+        suggestions = response.json()
+        assert [found["id"] for found in suggestions["recipes"]] == [recipe["id"]]
+        assert suggestions["tags"] == ["Blueberry Season"]
+        assert suggestions["queries"] == ["blueberry pie"]
+
+    async def test_search_recipes_by_tag_matches_whole_tag_ignoring_case(
+        self, api_client: AsyncClient, auth_headers: dict[str, str], recipe_fabric: RecipeFabricProtocol
+    ):
+        recipe = await recipe_fabric(auth_headers=auth_headers, title="Mushroom Soup", tags=[{"name": "Soup Night"}])
+        await recipe_fabric(auth_headers=auth_headers, title="Midnight Snack", tags=[{"name": "Night"}])
+
+        response = await api_client.get("/v1/recipes/search", params={"tags": "SOUP NIGHT"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [found["id"] for found in response.json()] == [recipe["id"]]
+
+    async def test_search_recipes_by_include_ingredients_min_match(
+        self, api_client: AsyncClient, auth_headers: dict[str, str], recipe_fabric: RecipeFabricProtocol
+    ):
+        recipe = await recipe_fabric(
+            auth_headers=auth_headers,
+            title="Caprese Salad",
+            ingredients=[{"name": "Помидоры", "quantity": "2 pieces"}, {"name": "mozzarella", "quantity": "100g"}],
+        )
+        await recipe_fabric(
+            auth_headers=auth_headers, title="Plain Toast", ingredients=[{"name": "bread", "quantity": "1 slice"}]
+        )
+
+        params = {
+            "include_ingredients": ["томаты", "Mozzarella", "basil"],
+            "include_ingredients_min_match": 2,
+        }
+        response = await api_client.get("/v1/recipes/search", params=params)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [found["id"] for found in response.json()] == [recipe["id"]]
+
+    async def test_search_warmup_caches_frequent_queries(
+        self,
+        api_client: AsyncClient,
+        auth_headers: dict[str, str],
+        recipe_fabric: RecipeFabricProtocol,
+        test_dishka_container: AsyncContainer,
+    ):
+        recipe = await recipe_fabric(auth_headers=auth_headers, title="Warm Borscht")
+        save_response = await api_client.post(
+            "/v1/recipes/search/history", json={"query": "Borscht"}, headers=auth_headers
+        )
+        assert save_response.status_code == status.HTTP_201_CREATED
+        await flush_search_history(test_dishka_container)
+
+        warmed = await warm_up_search(test_dishka_container, queries=10, days=1, concurrency=1, pause_seconds=0)
+
+        assert warmed == 1
+        async with test_dishka_container() as request_container:
+            search_cache_repository = await request_container.get(SearchCacheRepositoryProtocol)
+            cached_page = await search_cache_repository.get(
+                await search_cache_repository.build_key(RecipeSearchQuery(query="borscht"))
+            )
+        assert cached_page is not None
+        assert cached_page.recipe_ids == [recipe["id"]]
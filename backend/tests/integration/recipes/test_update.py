@@ -1,10 +1,14 @@
 import pytest
 from dirty_equals import IsDatetime
+from dishka import AsyncContainer
 from faker import Faker
 from fastapi import status
 from freezegun import freeze_time
 from httpx import AsyncClient
 
+from src.adapters.storage import S3Storage
+from tests.fixtures.recipes import RecipeFabricProtocol
+
 fake = Faker()
 
 pytestmark = pytest.mark.asyncio(loop_scope="session")
@@ -171,3 +175,60 @@ class TestRecipeUpdate:
 
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
         assert response.json()["error_key"] == "validation_error"
+
+
+class TestRecipeImagePaths:
+    @pytest.mark.parametrize(
+        ("image_path", "is_instruction"),
+        [
+            ("avatars/1.png", False),
+            ("recipes/{other_recipe_id}/main-test.png", False),
+            ("recipes/{recipe_id}/../{other_recipe_id}/main-test.png", False),
+            ("recipes/{recipe_id}/main-test.png", True),
+        ],
+        ids=["other_prefix", "other_recipe", "path_traversal", "instruction_outside_instructions"],
+    )
+    async def test_update_recipe_foreign_image_path_rejected(
+        self,
+        api_client: AsyncClient,
+        auth_headers: dict[str, str],
+        test_recipe: dict,
+        image_path: str,
+        *,
+        is_instruction: bool,
+    ):
+        recipe_id = test_recipe["id"]
+        image_path = image_path.format(recipe_id=recipe_id, other_recipe_id=recipe_id + 1)
+        if is_instruction:
+            update_data = {"instructions": [{"step_number": 1, "description": "Boil", "image_path": image_path}]}
+        else:
+            update_data = {"image_path": image_path}
+
+        response = await api_client.patch(f"/v1/recipes/{recipe_id}", json=update_data, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["error_key"] == "invalid_image_path"
+
+    async def test_replaced_image_is_deleted_after_update(
+        self,
+        api_client: AsyncClient,
+        auth_headers: dict[str, str],
+        recipe_fabric: RecipeFabricProtocol,
+        test_dishka_container: AsyncContainer,
+    ):
+        recipe = await recipe_fabric(auth_headers=auth_headers, title="Replaced Image Pie")
+        old_image_path = f"recipes/{recipe['id']}/main-old.png"
+        new_image_path = f"recipes/{recipe['id']}/main-new.png"
+        s3_storage = await test_dishka_container.get(S3Storage)
+        await s3_storage.upload_file("images", old_image_path, "image/png", b"old image")
+        response = await api_client.patch(
+            f"/v1/recipes/{recipe['id']}", json={"image_path": old_image_path}, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await api_client.patch(
+            f"/v1/recipes/{recipe['id']}", json={"image_path": new_image_path}, headers=auth_headers
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert await s3_storage.download_file("images", old_image_path) is None
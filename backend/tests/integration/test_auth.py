@@ -1,16 +1,25 @@
 from datetime import UTC
+from typing import Any
 
 import pytest
 from dirty_equals import IsNow, IsPositiveInt
+from dishka import AsyncContainer
 from faker import Faker
 from fastapi import status
 from freezegun import freeze_time
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from src.core.config import RateLimitConfig
+from src.repositories.interfaces import RefreshTokenRepositoryProtocol
 
 pytestmark = pytest.mark.asyncio(loop_scope="session")
 
 fake = Faker()
 
+# address of nginx in docker compose, the only proxy whose X-Forwarded-For the backend trusts
+NGINX_ADDRESS = "172.28.0.10"
+
 
 class TestAuthRegisterIntegration:
     async def test_register_success(self, api_client: AsyncClient):
@@ -452,6 +461,43 @@ class TestAuthLoginIntegration:
             assert second_last_login != first_last_login
 
 
+class TestAuthRateLimitIntegration:
+    async def test_login_rate_limited_by_address(
+        self, api_client: AsyncClient, registered_user: dict, test_dishka_container: AsyncContainer
+    ):
+        rule = (await test_dishka_container.get(RateLimitConfig)).rules["login"]
+        login_data = {"email": registered_user["email"], "password": "WrongPass123!"}
+
+        for _ in range(rule.limit):
+            response = await api_client.post("/v1/auth/login", json=login_data)
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        response = await api_client.post("/v1/auth/login", json=login_data)
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.json()["error_key"] == "rate_limit_exceeded"
+        assert 0 < int(response.headers["Retry-After"]) <= rule.window_seconds
+
+    async def test_login_rate_limit_ignores_spoofed_forwarded_for(
+        self, test_app: Any, registered_user: dict, test_dishka_container: AsyncContainer
+    ):
+        rule = (await test_dishka_container.get(RateLimitConfig)).rules["login"]
+        login_data = {"email": registered_user["email"], "password": "WrongPass123!"}
+        proxied_app = ProxyHeadersMiddleware(test_app, trusted_hosts=NGINX_ADDRESS)
+
+        async with AsyncClient(transport=ASGITransport(app=proxied_app), base_url="http://test-backend") as client:
+            for _ in range(rule.limit):
+                response = await client.post(
+                    "/v1/auth/login", json=login_data, headers={"X-Forwarded-For": fake.ipv4()}
+                )
+                assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+            response = await client.post("/v1/auth/login", json=login_data, headers={"X-Forwarded-For": fake.ipv4()})
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.json()["error_key"] == "rate_limit_exceeded"
+
+
 class TestAuthRefreshIntegration:
     async def test_refresh_token_success(self, api_client: AsyncClient, registered_user: dict):
         with freeze_time() as frozen_time:
@@ -475,6 +521,29 @@ class TestAuthRefreshIntegration:
             assert data["access_token"] != tokens["access_token"]
             assert data["refresh_token"] != tokens["refresh_token"]
 
+    async def test_refresh_token_falls_back_to_database_and_is_single_use(
+        self, api_client: AsyncClient, registered_user: dict, test_dishka_container: AsyncContainer
+    ):
+        with freeze_time() as frozen_time:
+            login_data = {
+                "email": registered_user["email"],
+                "password": "TestPass123!",
+            }
+            login_response = await api_client.post("/v1/auth/login", json=login_data)
+            refresh_token = login_response.json()["refresh_token"]
+
+            async with test_dishka_container() as request_container:
+                refresh_token_repository = await request_container.get(RefreshTokenRepositoryProtocol)
+                await refresh_token_repository.delete_cached_refresh_token(refresh_token)
+
+            frozen_time.tick(delta=1)
+
+            response = await api_client.post("/v1/auth/refresh", json={"refresh_token": refresh_token})
+            assert response.status_code == status.HTTP_200_OK
+
+            response = await api_client.post("/v1/auth/refresh", json={"refresh_token": refresh_token})
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
     async def test_refresh_token_invalid_token(self, api_client: AsyncClient):
         response = await api_client.post("/v1/auth/refresh", json={"refresh_token": "invalid_token"})
 
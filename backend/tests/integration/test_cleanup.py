@@ -0,0 +1,66 @@
+import os
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from dishka import AsyncContainer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.anonymous_user import AnonymousUser
+from src.models.search_query import SearchQuery
+from src.models.token import RefreshToken
+from src.repositories.interfaces import AnonymousUserCacheRepositoryProtocol
+from src.schemas.anonymous_user import AnonymousUserRead
+from src.workers.jobs import delete_stale_data
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+class TestDeleteStaleData:
+    async def test_delete_stale_data(
+        self, test_session: AsyncSession, test_dishka_container: AsyncContainer, registered_user: dict
+    ):
+        now = datetime.now(UTC)
+        long_ago = now - timedelta(days=365)
+
+        expired_token = RefreshToken(user_id=registered_user["id"], token_hash=os.urandom(32), expires_at=long_ago)
+        active_token = RefreshToken(
+            user_id=registered_user["id"], token_hash=os.urandom(32), expires_at=now + timedelta(days=1)
+        )
+        inactive_user = AnonymousUser(created_at=long_ago, updated_at=long_ago)
+        active_user = AnonymousUser(created_at=long_ago, updated_at=long_ago)
+        test_session.add_all([expired_token, active_token, inactive_user, active_user])
+        await test_session.flush()
+        test_session.add_all(
+            [
+                SearchQuery(
+                    anonymous_user_id=inactive_user.id, query="pasta", created_at=long_ago, updated_at=long_ago
+                ),
+                SearchQuery(anonymous_user_id=active_user.id, query="pasta", created_at=long_ago, updated_at=now),
+            ]
+        )
+        await test_session.commit()
+        async with test_dishka_container() as request_container:
+            anonymous_user_cache_repository = await request_container.get(AnonymousUserCacheRepositoryProtocol)
+            for anonymous_user in (inactive_user, active_user):
+                await anonymous_user_cache_repository.set(
+                    anonymous_user.cookie_id, AnonymousUserRead.model_validate(anonymous_user)
+                )
+
+        await delete_stale_data(test_dishka_container)
+
+        token_ids = set(await test_session.scalars(select(RefreshToken.id)))
+        assert expired_token.id not in token_ids
+        assert active_token.id in token_ids
+
+        anonymous_user_ids = set(await test_session.scalars(select(AnonymousUser.id)))
+        assert inactive_user.id not in anonymous_user_ids
+        assert active_user.id in anonymous_user_ids
+        async with test_dishka_container() as request_container:
+            anonymous_user_cache_repository = await request_container.get(AnonymousUserCacheRepositoryProtocol)
+            assert await anonymous_user_cache_repository.get(inactive_user.cookie_id) is None
+            assert await anonymous_user_cache_repository.get(active_user.cookie_id) is not None
+
+        query_user_ids = set(await test_session.scalars(select(SearchQuery.anonymous_user_id)))
+        assert inactive_user.id not in query_user_ids
+        assert active_user.id in query_user_ids
@@ -0,0 +1,51 @@
+import uuid
+
+import pytest
+from dishka import AsyncContainer
+from fastapi import status
+from httpx import AsyncClient
+from redis.asyncio import Redis
+
+from src.repositories.anonymous_user_cache import LocalAnonymousUserCache
+from src.schemas.anonymous_user import CachedAnonymousUser
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+class TestAnonymousUserCache:
+    async def test_anonymous_user_is_cached_until_consent_revoked(
+        self, api_client: AsyncClient, test_dishka_container: AsyncContainer
+    ):
+        consent_response = await api_client.post("/v1/consent", json={"is_analytics_allowed": True})
+        assert consent_response.status_code == status.HTTP_201_CREATED
+        cookie_id = api_client.cookies["anonymous_id"]
+
+        response = await api_client.get("/v1/consent/me")
+        assert response.status_code == status.HTTP_200_OK
+
+        redis = await test_dishka_container.get(Redis)
+        cached = await redis.get(f"anonymous_user:{cookie_id}")
+        assert cached is not None
+        assert str(CachedAnonymousUser.model_validate_json(cached).anonymous_user.cookie_id) == cookie_id
+        # other processes could delete the user, so found users are cached only in Redis
+        assert (await test_dishka_container.get(LocalAnonymousUserCache)).get(uuid.UUID(cookie_id)) is None
+
+        revoke_response = await api_client.delete("/v1/consent/revoke")
+        assert revoke_response.status_code == status.HTTP_204_NO_CONTENT
+        assert await redis.get(f"anonymous_user:{cookie_id}") is None
+
+    async def test_unknown_cookie_is_cached(self, api_client: AsyncClient, test_dishka_container: AsyncContainer):
+        cookie_id = str(uuid.uuid4())
+        api_client.cookies.set("anonymous_id", cookie_id)
+        api_client.cookies.set("analytics_allowed", "True")
+
+        for _ in range(2):
+            response = await api_client.get("/v1/consent/me")
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+            assert response.json()["error_key"] == "anonymous_user_not_found"
+
+        redis = await test_dishka_container.get(Redis)
+        cached = await redis.get(f"anonymous_user:{cookie_id}")
+        assert cached is not None
+        assert CachedAnonymousUser.model_validate_json(cached).anonymous_user is None
+        assert (await test_dishka_container.get(LocalAnonymousUserCache)).get(uuid.UUID(cookie_id)) is not None
@@ -154,6 +154,7 @@ class TestDislikedRecipesIntegration:
             "difficulty": test_recipe["difficulty"],
             "cook_time_minutes": test_recipe["cook_time_minutes"],
             "image_url": IsUrl(any_http_url=True),
+            "image_variants": [],
             "impressions_count": 0,
             "is_on_favorites": False,
             "slug": IsStr(regex=r"^test-recipe-[0-9]-[a-f0-9]{8}$"),
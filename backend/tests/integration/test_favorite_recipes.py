@@ -36,6 +36,7 @@ class TestFavoriteRecipesIntegration:
             "difficulty": test_recipe["difficulty"],
             "cook_time_minutes": test_recipe["cook_time_minutes"],
             "image_url": IsUrl(any_http_url=True),
+            "image_variants": [],
             "impressions_count": 1,
             "is_on_favorites": True,
             "slug": IsStr(regex=r"^test-recipe-[0-9]-[a-f0-9]{8}$"),
@@ -113,6 +114,7 @@ class TestFavoriteRecipesIntegration:
             "difficulty": test_recipe["difficulty"],
             "cook_time_minutes": test_recipe["cook_time_minutes"],
             "image_url": IsUrl(any_http_url=True),
+            "image_variants": [],
             "impressions_count": test_recipe["impressions_count"],
             "is_on_favorites": True,
             "slug": IsStr(regex=r"^test-recipe-[0-9]-[a-f0-9]{8}$"),
@@ -1,8 +1,15 @@
+from datetime import UTC, datetime
+
 import pytest
-from dirty_equals import IsUUID
+from dirty_equals import IsPositiveInt, IsUUID
+from dishka import AsyncContainer
 from faker import Faker
 from fastapi import status
+from freezegun import freeze_time
 from httpx import AsyncClient
+from redis.asyncio import Redis
+
+from src.workers.jobs import flush_search_history
 
 fake = Faker()
 
@@ -162,6 +169,31 @@ class TestSearchHistory:
 
         assert second_response.status_code == status.HTTP_201_CREATED
 
+    async def test_search_history_keeps_first_and_last_search_time(
+        self, api_client: AsyncClient, auth_headers: dict[str, str], test_dishka_container: AsyncContainer
+    ):
+        query_data = {"query": "repeated_query"}
+        with freeze_time(datetime.now(UTC).replace(microsecond=0)) as frozen_time:
+            first_response = await api_client.post("/v1/recipes/search/history", json=query_data, headers=auth_headers)
+            frozen_time.tick(delta=60)
+            second_response = await api_client.post("/v1/recipes/search/history", json=query_data, headers=auth_headers)
+
+        first_query = first_response.json()
+        second_query = second_response.json()
+        assert first_query["id"] == IsPositiveInt()
+        assert second_query["id"] == first_query["id"]
+        assert second_query["created_at"] == first_query["created_at"]
+        assert second_query["updated_at"] > first_query["updated_at"]
+
+        await flush_search_history(test_dishka_container)
+        redis = await test_dishka_container.get(Redis)
+        keys = [key async for key in redis.scan_iter(match="search_history:user:*")]
+        await redis.delete(*keys)
+
+        response = await api_client.get("/v1/recipes/search/history", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [second_query]
+
     async def test_search_history_ordering(self, api_client: AsyncClient, auth_headers: dict[str, str]):
         search_queries = ["first_query", "second_query", "third_query"]
 
@@ -211,3 +243,32 @@ class TestSearchHistory:
         assert "user1_unique_query" not in user2_queries
         assert "user2_unique_query" in user2_queries
         assert "user2_unique_query" not in user1_queries
+
+    async def test_search_history_loaded_from_database_after_flush(
+        self, api_client: AsyncClient, auth_headers: dict[str, str], test_dishka_container: AsyncContainer
+    ):
+        search_queries = ["persisted_first_query", "persisted_second_query"]
+
+        for query in search_queries:
+            response = await api_client.post("/v1/recipes/search/history", json={"query": query}, headers=auth_headers)
+            assert response.status_code == status.HTTP_201_CREATED
+
+        await flush_search_history(test_dishka_container)
+
+        redis = await test_dishka_container.get(Redis)
+        keys = [key async for key in redis.scan_iter(match="search_history:user:*")]
+        await redis.delete(*keys)
+
+        response = await api_client.get("/v1/recipes/search/history", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["query"] for item in response.json()] == search_queries[::-1]
+
+    async def test_get_popular_search_queries(self, api_client: AsyncClient, auth_headers: dict[str, str]):
+        for query in ["Pumpkin soup", "pumpkin  SOUP", "lasagna"]:
+            response = await api_client.post("/v1/recipes/search/history", json={"query": query}, headers=auth_headers)
+            assert response.status_code == status.HTTP_201_CREATED
+
+        response = await api_client.get("/v1/recipes/search/popular", params={"limit": 1})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [{"query": "pumpkin soup", "count": 2}]
@@ -0,0 +1,105 @@
+from http import HTTPStatus
+from typing import Any
+
+import pytest
+from dishka import AsyncContainer
+from elasticsearch import AsyncElasticsearch
+from faststream.nats import TestNatsBroker
+
+from src.adapters.search.indexes import RECIPE_ALIAS
+from src.adapters.search.indexing import RECIPES_INDEXING_SUBJECT
+from src.enums.search_indexing_action import SearchIndexingActionEnum
+from src.repositories.interfaces import RecipeSearchRepositoryProtocol
+from src.schemas.search_indexing import RecipeIndexingMessage
+from src.workers.search_indexer import broker, dead_letter_publisher
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+def _index_message(recipe_id: int, version: int, **document: Any) -> RecipeIndexingMessage:
+    return RecipeIndexingMessage(
+        action=SearchIndexingActionEnum.INDEX,
+        recipe_id=recipe_id,
+        version=version,
+        document={"id": recipe_id, "is_published": True, **document},
+    )
+
+
+async def _get_document(es_client: AsyncElasticsearch, recipe_id: int) -> dict | None:
+    response = await es_client.options(ignore_status=HTTPStatus.NOT_FOUND).get(index=RECIPE_ALIAS, id=str(recipe_id))
+    return response["_source"] if response["found"] else None
+
+
+@pytest.mark.usefixtures("api_client")
+class TestSearchIndexer:
+    async def test_bulk_write_applies_latest_operation_of_each_recipe(self, test_dishka_container: AsyncContainer):
+        async with test_dishka_container() as request_container:
+            recipe_search_repository = await request_container.get(RecipeSearchRepositoryProtocol)
+            es_client = await request_container.get(AsyncElasticsearch)
+
+            failed = await recipe_search_repository.bulk_write(
+                [
+                    _index_message(1001, version=2, title="Pasta Carbonara"),
+                    _index_message(1001, version=1, title="Pasta"),
+                    _index_message(1002, version=1, title="Chicken Curry"),
+                    _index_message(1003, version=1, title="Chocolate Cake"),
+                    RecipeIndexingMessage(action=SearchIndexingActionEnum.DELETE, recipe_id=1003, version=2),
+                    # deleting a document that is not indexed is a no-op
+                    RecipeIndexingMessage(action=SearchIndexingActionEnum.DELETE, recipe_id=1004, version=1),
+                ]
+            )
+            await es_client.indices.refresh(index=RECIPE_ALIAS)
+
+            assert failed == []
+            assert (await _get_document(es_client, 1001))["title"] == "Pasta Carbonara"
+            assert (await _get_document(es_client, 1002))["title"] == "Chicken Curry"
+            assert await _get_document(es_client, 1003) is None
+            assert await _get_document(es_client, 1004) is None
+
+    async def test_bulk_write_skips_version_conflicts(self, test_dishka_container: AsyncContainer, test_recipe: dict):
+        async with test_dishka_container() as request_container:
+            recipe_search_repository = await request_container.get(RecipeSearchRepositoryProtocol)
+            es_client = await request_container.get(AsyncElasticsearch)
+
+            # queued writes built before the recipe got published with a direct write
+            for stale_message in (
+                _index_message(test_recipe["id"], version=1, title="Stale title"),
+                RecipeIndexingMessage(action=SearchIndexingActionEnum.DELETE, recipe_id=test_recipe["id"], version=1),
+            ):
+                assert await recipe_search_repository.bulk_write([stale_message]) == []
+            await es_client.indices.refresh(index=RECIPE_ALIAS)
+
+            assert (await _get_document(es_client, test_recipe["id"]))["title"] == test_recipe["title"]
+
+    async def test_bulk_write_returns_failed_operations(self, test_dishka_container: AsyncContainer):
+        async with test_dishka_container() as request_container:
+            recipe_search_repository = await request_container.get(RecipeSearchRepositoryProtocol)
+            es_client = await request_container.get(AsyncElasticsearch)
+
+            malformed_message = _index_message(1011, version=1, title="Pasta", cook_time_minutes="half an hour")
+            failed = await recipe_search_repository.bulk_write(
+                [malformed_message, _index_message(1012, version=1, title="Chicken Curry")]
+            )
+            await es_client.indices.refresh(index=RECIPE_ALIAS)
+
+            assert failed == [malformed_message]
+            assert await _get_document(es_client, 1011) is None
+            assert (await _get_document(es_client, 1012))["title"] == "Chicken Curry"
+
+    async def test_worker_dead_letters_failed_operations(self, monkeypatch: pytest.MonkeyPatch):
+        dead_letters = []
+
+        async def publish_dead_letter(message: dict, *args: Any, **kwargs: Any) -> None:
+            dead_letters.append(message)
+
+        # the test broker does not route publishers bound to a JetStream stream
+        monkeypatch.setattr(dead_letter_publisher, "publish", publish_dead_letter)
+        malformed_message = _index_message(1021, version=1, title="Pasta", cook_time_minutes="half an hour")
+
+        async with TestNatsBroker(broker) as test_broker:
+            await test_broker.publish(
+                _index_message(1022, version=1, title="Chicken Curry").model_dump(mode="json"), RECIPES_INDEXING_SUBJECT
+            )
+            await test_broker.publish(malformed_message.model_dump(mode="json"), RECIPES_INDEXING_SUBJECT)
+
+        assert [RecipeIndexingMessage.model_validate(message) for message in dead_letters] == [malformed_message]
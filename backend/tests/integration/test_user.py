@@ -1,17 +1,29 @@
+import io
 from datetime import UTC
 
 import pytest
 from dirty_equals import IsNow, IsPositiveInt, IsUrl
+from dishka import AsyncContainer
 from faker import Faker
 from fastapi import status
 from freezegun import freeze_time
 from httpx import AsyncClient
+from PIL import Image
+
+from src.adapters.storage import S3Storage
+from src.repositories.interfaces import UserAvatarRepositoryProtocol
 
 pytestmark = pytest.mark.asyncio(loop_scope="session")
 
 fake = Faker()
 
 
+async def _get_avatar_path(container: AsyncContainer, user_id: int) -> str | None:
+    async with container() as request_container:
+        user_avatar_repository = await request_container.get(UserAvatarRepositoryProtocol)
+        return await user_avatar_repository.get_avatar_url(user_id)
+
+
 class TestUserMeGetIntegration:
     async def test_get_current_user_success(self, api_client: AsyncClient, registered_user: dict):
         login_data = {
@@ -270,6 +282,26 @@ class TestUserMeUpdateIntegration:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+class TestUserRoleUpdateIntegration:
+    async def test_role_change_applies_to_issued_access_tokens(
+        self,
+        api_client: AsyncClient,
+        registered_user: dict,
+        auth_headers: dict[str, str],
+        superuser_auth_headers: dict[str, str],
+    ):
+        response = await api_client.get("/v1/recipe-reports", headers=auth_headers)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        response = await api_client.patch(
+            f"/v1/users/{registered_user['id']}/role", json={"role": "admin"}, headers=superuser_auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await api_client.get("/v1/recipe-reports", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+
+
 class TestUserAvatarUpdateIntegration:
     async def test_update_avatar_success(self, api_client: AsyncClient, registered_user: dict):
         login_data = {
@@ -280,8 +312,9 @@ class TestUserAvatarUpdateIntegration:
         tokens = login_response.json()
         auth_header = {"Authorization": f"Bearer {tokens['access_token']}"}
 
-        image_content = b"fake_image_content"
-        files = {"image": ("test.jpg", image_content, "image/jpeg")}
+        image = io.BytesIO()
+        Image.new("RGB", (64, 64)).save(image, format="JPEG")
+        files = {"image": ("test.jpg", image.getvalue(), "image/jpeg")}
 
         response = await api_client.patch("/v1/users/me/avatar", files=files, headers=auth_header)
 
@@ -290,6 +323,53 @@ class TestUserAvatarUpdateIntegration:
         assert "avatar_url" in data
         assert data["avatar_url"] == IsUrl()
 
+    async def test_update_avatar_url_changes_only_with_content(self, api_client: AsyncClient, registered_user: dict):
+        login_data = {
+            "email": registered_user["email"],
+            "password": "TestPass123!",
+        }
+        login_response = await api_client.post("/v1/auth/login", json=login_data)
+        tokens = login_response.json()
+        auth_header = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+        avatar_urls = []
+        for color in ("red", "red", "blue"):
+            image = io.BytesIO()
+            Image.new("RGB", (64, 64), color=color).save(image, format="PNG")
+            files = {"image": ("test.png", image.getvalue(), "image/png")}
+            response = await api_client.patch("/v1/users/me/avatar", files=files, headers=auth_header)
+            assert response.status_code == status.HTTP_200_OK
+            avatar_urls.append(response.json()["avatar_url"])
+
+        assert avatar_urls[0] == avatar_urls[1]
+        assert avatar_urls[1].split("?")[0] != avatar_urls[2].split("?")[0]
+
+    async def test_replaced_and_deleted_avatars_are_removed_from_storage(
+        self,
+        api_client: AsyncClient,
+        auth_headers: dict[str, str],
+        registered_user: dict,
+        test_dishka_container: AsyncContainer,
+    ):
+        s3_storage = await test_dishka_container.get(S3Storage)
+        avatar_paths = []
+        for color in ("red", "blue"):
+            image = io.BytesIO()
+            Image.new("RGB", (64, 64), color=color).save(image, format="PNG")
+            files = {"image": ("test.png", image.getvalue(), "image/png")}
+            response = await api_client.patch("/v1/users/me/avatar", files=files, headers=auth_headers)
+            assert response.status_code == status.HTTP_200_OK
+            avatar_paths.append(await _get_avatar_path(test_dishka_container, registered_user["id"]))
+
+        assert await s3_storage.download_file("images", avatar_paths[0]) is None
+        assert await s3_storage.download_file("images", avatar_paths[1]) is not None
+
+        response = await api_client.delete("/v1/users/me/avatar", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert await _get_avatar_path(test_dishka_container, registered_user["id"]) is None
+        assert await s3_storage.download_file("images", avatar_paths[1]) is None
+
     async def test_update_avatar_unauthorized(self, api_client: AsyncClient):
         image_content = b"fake_image_content"
         files = {"image": ("test.jpg", image_content, "image/jpeg")}
@@ -364,13 +444,29 @@ class TestUserAvatarUpdateIntegration:
         tokens = login_response.json()
         auth_header = {"Authorization": f"Bearer {tokens['access_token']}"}
 
-        large_image_content = b"x" * (10 * 1024 * 1024)  # 10MB
+        large_image_content = b"\xff\xd8\xff" + b"x" * (10 * 1024 * 1024)  # 10MB
         files = {"image": ("large_test.jpg", large_image_content, "image/jpeg")}
 
         response = await api_client.patch("/v1/users/me/avatar", files=files, headers=auth_header)
 
         assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
 
+    async def test_update_avatar_content_not_matching_image_type(self, api_client: AsyncClient, registered_user: dict):
+        login_data = {
+            "email": registered_user["email"],
+            "password": "TestPass123!",
+        }
+        login_response = await api_client.post("/v1/auth/login", json=login_data)
+        tokens = login_response.json()
+        auth_header = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+        files = {"image": ("test.jpg", b"<html><script>alert(1)</script></html>", "image/jpeg")}
+
+        response = await api_client.patch("/v1/users/me/avatar", files=files, headers=auth_header)
+
+        assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+        assert response.json()["error_key"] == "wrong_image_format"
+
 
 class TestUserUpdateTimestampIntegration:
     async def test_updated_at_changes_only_on_real_updates(self, api_client: AsyncClient, registered_user: dict):